@@ -2,10 +2,21 @@
 Tavla AI oyuncu stratejileri
 """
 import random
+import time
 from typing import List, Dict, Tuple, Optional
 from abc import ABC, abstractmethod
 
-from game_logic import TavlaGame, Move, Player, Board
+import rules
+from game_logic import TavlaGame, Move, Player, Position
+
+try:
+    from eval_cache import EvaluationCache, position_key
+except ImportError:
+    EvaluationCache = None
+
+
+class SearchTimeout(Exception):
+    """Arama için ayrılan süre doldu"""
 
 
 class AIStrategy(ABC):
@@ -102,142 +113,100 @@ class GreedyAI(AIStrategy):
 class AdvancedAI(AIStrategy):
     """Gelişmiş strateji - pozisyon değerlendirmesi ve lookahead"""
     
-    def __init__(self, depth: int = 2):
+    def __init__(self, depth: int = 2, cache: Optional['EvaluationCache'] = None):
         self.depth = depth
+        self.cache = cache  # Opsiyonel kalıcı değerlendirme önbelleği
+        self.deadline: Optional[float] = None  # Arama süresi sınırı (time.time() cinsinden)
     
     def choose_move(self, game: TavlaGame) -> Optional[Move]:
-        moves = game.get_valid_moves()
+        # Arama oyunun kopyası olan değiştirilemez pozisyon üzerinde yapılır;
+        # game nesnesi hiç değiştirilmez
+        position = game.get_position()
+        moves = rules.legal_moves(position, game.moves_left)
         if not moves:
             return None
         
         best_move = None
         best_score = float('-inf')
         
-        for move in moves:
-            # Hamleyi simüle et
-            score = self._minimax(game, move, self.depth, True)
-            if score > best_score:
-                best_score = score
-                best_move = move
+        try:
+            for move in moves:
+                # Hamleyi simüle et
+                score = self._minimax(position, move, self.depth, True)
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+        except SearchTimeout:
+            # Süre doldu: o ana kadarki en iyi hamle, hiç yoksa açgözlü seçim
+            if best_move is None:
+                best_move = GreedyAI().choose_move(game)
+        
+        if self.cache:
+            self.cache.flush()
         
         return best_move
     
-    def _minimax(self, game: TavlaGame, move: Move, depth: int, maximizing: bool) -> float:
+    def _minimax(self, position: Position, move: Move, depth: int, maximizing: bool) -> float:
         """Minimax algoritması ile hamle değerlendirmesi"""
         if depth == 0:
-            return self._evaluate_position(game)
+            return self._evaluate_position(position)
         
         # Hamleyi simüle et
-        original_board = self._copy_board(game.board)
-        original_moves = game.moves_left[:]
+        new_position = rules.apply(position, move)
         
-        if not game.make_move(move):
-            return float('-inf') if maximizing else float('inf')
-        
-        if game.winner:
-            score = 1000 if game.winner == game.current_player else -1000
-        else:
-            # Tüm olası zar kombinasyonlarını değerlendir
-            score = self._evaluate_dice_outcomes(game, depth - 1, not maximizing)
+        winner = rules.winner(new_position)
+        if winner is not None:
+            return 1000 if winner == position.color else -1000
         
-        # Geri al
-        game.board = original_board
-        game.moves_left = original_moves
+        # Tüm olası zar kombinasyonlarını değerlendir
+        return self._evaluate_dice_outcomes(new_position, depth - 1, not maximizing)
+    
+    def _evaluate_dice_outcomes(self, position: Position, depth: int, maximizing: bool) -> float:
+        """Olası zar sonuçlarını değerlendir (önbellek varsa önce ona bakar)"""
+        if self.cache is None:
+            return self._compute_dice_outcomes(position, depth, maximizing)
         
+        key = position_key(position, maximizing)
+        score = self.cache.get(key, depth)
+        if score is None:
+            score = self._compute_dice_outcomes(position, depth, maximizing)
+            self.cache.put(key, depth, score)
         return score
     
-    def _evaluate_dice_outcomes(self, game: TavlaGame, depth: int, maximizing: bool) -> float:
-        """Olası zar sonuçlarını değerlendir"""
+    def _compute_dice_outcomes(self, position: Position, depth: int, maximizing: bool) -> float:
+        """Tüm zar sonuçlarının ortalama skorunu hesapla"""
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
+        
         total_score = 0.0
         outcomes = 0
         
         # Tüm zar kombinasyonları (1,1) ile (6,6) arası
         for d1 in range(1, 7):
             for d2 in range(1, 7):
-                # Zar sonucunu simüle et
-                old_dice = game.dice_values
-                old_moves = game.moves_left[:]
-                
-                game.dice_values = [d1, d2]
-                if d1 == d2:
-                    game.moves_left = [d1] * 4
-                else:
-                    game.moves_left = [d1, d2]
+                dice = [d1] * 4 if d1 == d2 else [d1, d2]
                 
                 # Bu zar sonucu için en iyi hamleyi bul
-                possible_moves = game.get_valid_moves()
+                possible_moves = rules.legal_moves(position, dice)
                 if possible_moves:
                     best_move_score = float('-inf') if maximizing else float('inf')
                     for possible_move in possible_moves:
-                        score = self._minimax(game, possible_move, depth, maximizing)
+                        score = self._minimax(position, possible_move, depth, maximizing)
                         if maximizing:
                             best_move_score = max(best_move_score, score)
                         else:
                             best_move_score = min(best_move_score, score)
                     total_score += best_move_score
                 else:
-                    total_score += self._evaluate_position(game)
+                    total_score += self._evaluate_position(position)
                 
                 outcomes += 1
-                
-                # Geri al
-                game.dice_values = old_dice
-                game.moves_left = old_moves
         
         return total_score / outcomes if outcomes > 0 else 0.0
     
-    def _evaluate_position(self, game: TavlaGame) -> float:
+    def _evaluate_position(self, position: Position) -> float:
         """Pozisyonu değerlendir"""
-        score = 0.0
-        player = game.current_player
-        opponent = Player.BLACK if player == Player.WHITE else Player.WHITE
-        
-        # Evdeki pul sayısı
-        score += game.board.get_home_count(player) * 10
-        score -= game.board.get_home_count(opponent) * 10
-        
-        # Bar'daki pul sayısı (negatif)
-        score -= game.board.get_bar_count(player) * 20
-        score += game.board.get_bar_count(opponent) * 20
-        
-        # Pul dağılımı ve güvenlik
-        for point in range(24):
-            if game.board.has_pieces_on_point(point, player):
-                count = game.board.get_piece_count(point, player)
-                # Güvenli haneler (2+ pul)
-                if count >= 2:
-                    score += 5
-                # Tek pul (risk)
-                elif count == 1:
-                    score -= 2
-                
-                # İlerleme puanı
-                if player == Player.WHITE:
-                    score += point * 0.5
-                else:
-                    score += (23 - point) * 0.5
-            
-            if game.board.has_pieces_on_point(point, opponent):
-                count = game.board.get_piece_count(point, opponent)
-                if count == 1:  # Vurulabilir pul
-                    score += 3
-        
-        # Pul toplama yeteneği
-        if game.board.can_bear_off(player):
-            score += 15
-        if game.board.can_bear_off(opponent):
-            score -= 15
-        
-        return score
-    
-    def _copy_board(self, board: Board) -> Board:
-        """Tahtayı kopyala"""
-        new_board = Board()
-        # Point objelerini kopyala
-        for i in range(28):
-            new_board.points[i].count = board.points[i].count
-            new_board.points[i].owner = board.points[i].owner
-        return new_board
+        return rules.evaluate(position)
     
     def get_name(self) -> str:
         return f"Advanced AI (depth {self.depth})"
@@ -258,7 +227,6 @@ class AIPlayer:
         if game.current_player != self.player_color:
             return None
         
-        import time
         start_time = time.time()
         
         move = self.strategy.choose_move(game)
@@ -321,11 +289,11 @@ def create_medium_ai() -> AIPlayer:
     return AIPlayer(GreedyAI())
 
 
-def create_hard_ai() -> AIPlayer:
+def create_hard_ai(cache: Optional['EvaluationCache'] = None) -> AIPlayer:
     """Zor AI - Gelişmiş strateji"""
-    return AIPlayer(AdvancedAI(depth=2))
+    return AIPlayer(AdvancedAI(depth=2, cache=cache))
 
 
-def create_expert_ai() -> AIPlayer:
+def create_expert_ai(cache: Optional['EvaluationCache'] = None) -> AIPlayer:
     """Uzman AI - Daha derin analiz"""
-    return AIPlayer(AdvancedAI(depth=3))
+    return AIPlayer(AdvancedAI(depth=3, cache=cache))
@@ -0,0 +1,210 @@
+"""
+Sunucu tarafı AI - bot hamlelerini sınırlı bir işlem havuzunda hesaplamak için
+
+Botun turu ana işlemde zar atılarak başlar; turun tüm hamleleri
+plan_turn ile ayrı bir işlemde, değiştirilemez kernel pozisyonu üzerinde
+hesaplanır. Sonuçlar sunucunun periyodik görevi tarafından poll ile
+alınır, böylece uzun süren uzman aramaları event loop'u veya diğer odaları
+bekletmez.
+
+Sınırlar:
+    AI_WORKERS      - havuzdaki işlem sayısı
+    AI_MAX_PENDING  - bekleyen iş sınırı; aşılırsa tur doğrudan açgözlü AI ile oynanır
+    AI_MOVE_TIMEOUT - tur başına süre; arama bu sürenin içinde en iyi sonucu
+                      döndürür, sonuç yine gelmezse açgözlü AI'ya düşülür
+
+Arama yapan seviyeler (hard, expert) pozisyon değerlendirmelerini
+eval_cache.EvaluationCache ile saklar. Her işçi işlem önbelleği ilk
+ihtiyacında kendisi açar (SQLite bağlantıları işlemler arası taşınmaz);
+dosya TAVLA_EVAL_CACHE ile değiştirilir, boş bırakılırsa önbellek kapanır.
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import rules
+from game_logic import TavlaGame, GameState, Move, Position
+from ai_player import (
+    AIPlayer, GreedyAI, create_easy_ai, create_medium_ai, create_hard_ai, create_expert_ai
+)
+
+try:
+    from eval_cache import EvaluationCache
+except ImportError:
+    EvaluationCache = None
+
+AI_LEVELS = {
+    'easy': create_easy_ai,
+    'medium': create_medium_ai,
+    'hard': create_hard_ai,
+    'expert': create_expert_ai,
+}
+
+AI_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+AI_MAX_PENDING = AI_WORKERS * 4
+AI_MOVE_TIMEOUT = 2.0     # Bot turu için en uzun süre (sn)
+AI_SEARCH_SHARE = 0.8     # Sürenin aramaya ayrılan kısmı (kalanı sonuç iletimi için)
+AI_POLL_INTERVAL = 0.05   # Tamamlanan işlerin kontrol aralığı (sn)
+CACHED_LEVELS = ('hard', 'expert')  # Değerlendirme önbelleği kullanan seviyeler
+EVAL_CACHE_PATH = os.environ.get('TAVLA_EVAL_CACHE', os.path.join('cache', 'evals.db'))
+
+_ai_players: Dict[str, AIPlayer] = {}  # İşçi işlem başına seviye -> AI
+_eval_cache: Optional['EvaluationCache'] = None  # İşçi işlem başına önbellek
+
+
+def _worker_eval_cache() -> Optional['EvaluationCache']:
+    """İşçi işlemin değerlendirme önbelleği (ilk çağrıda açılır; kapalıysa None)"""
+    global _eval_cache
+    if _eval_cache is None and EVAL_CACHE_PATH and EvaluationCache is not None:
+        try:
+            _eval_cache = EvaluationCache(EVAL_CACHE_PATH)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Değerlendirme önbelleği açılamadı: {e}")
+    return _eval_cache
+
+
+def _play_turn(ai: AIPlayer, position: Position, dice: List[int]) -> List[Move]:
+    """Pozisyondan başlayarak turun hamlelerini AI ile seç"""
+    game = TavlaGame()
+    game.board.load_position(position)
+    game.current_player = rules.player_of(position.color)
+    game.moves_left = list(dice)
+    game.game_state = GameState.SELECTING_PIECE
+    ai.player_color = game.current_player
+
+    moves = []
+    while game.moves_left and game.winner is None:
+        move = ai.choose_move(game)
+        if move is None or not game.make_move(move):
+            break
+        moves.append(move)
+    return moves
+
+
+def plan_turn(level: str, position: Position, dice: List[int], deadline: float) -> List[Move]:
+    """Bot turunun hamleleri (işçi işlemde çalışır)"""
+    ai = _ai_players.get(level)
+    if ai is None:
+        if level in CACHED_LEVELS:
+            ai = AI_LEVELS[level](cache=_worker_eval_cache())
+        else:
+            ai = AI_LEVELS[level]()
+        _ai_players[level] = ai
+
+    # Arama yapan stratejiler süre dolunca en iyi sonucu döndürüp işçiyi boşaltır
+    if hasattr(ai.strategy, 'deadline'):
+        ai.strategy.deadline = deadline
+    return _play_turn(ai, position, dice)
+
+
+def greedy_turn(position: Position, dice: List[int]) -> List[Move]:
+    """Süre dolduğunda veya havuz doluyken kullanılan hızlı yedek"""
+    return _play_turn(AIPlayer(GreedyAI()), position, dice)
+
+
+@dataclass
+class AIJob:
+    room_id: str
+    state_seq: int  # İş gönderildiğindeki oda durumu (eski sonuçları ayıklamak için)
+    position: Position
+    dice: List[int]
+    deadline: float
+    future: Optional[Future] = None
+    moves: Optional[List[Move]] = None
+
+
+class AIService:
+    """Bot turlarını işlem havuzunda hesaplayan servis (thread-safe)"""
+
+    def __init__(self, workers: int = AI_WORKERS, timeout: float = AI_MOVE_TIMEOUT,
+                 max_pending: int = AI_MAX_PENDING):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: List[AIJob] = []
+        self._lock = threading.Lock()
+
+        self.completed = 0
+        self.timeouts = 0
+        self.fallbacks = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Havuz ilk AI oyununda açılır; bot kullanılmayan sunucuda işlem oluşmaz
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def submit(self, room_id: str, level: str, position: Position,
+               dice: List[int], state_seq: int):
+        """Bot turunu hesaplamaya gönder"""
+        job = AIJob(room_id=room_id, state_seq=state_seq, position=position,
+                    dice=list(dice), deadline=time.time() + self.timeout)
+
+        with self._lock:
+            if len(self._jobs) >= self.max_pending:
+                # Havuz dolu: kuyruğu büyütmek yerine turu hemen açgözlü oyna
+                job.moves = greedy_turn(position, job.dice)
+                self.fallbacks += 1
+            else:
+                search_deadline = time.time() + self.timeout * AI_SEARCH_SHARE
+                job.future = self._get_executor().submit(plan_turn, level, position,
+                                                         job.dice, search_deadline)
+            self._jobs.append(job)
+
+    def poll(self, now: Optional[float] = None) -> List[AIJob]:
+        """Tamamlanan (veya süresi dolan) işleri döndür"""
+        if now is None:
+            now = time.time()
+
+        ready = []
+        with self._lock:
+            pending = []
+            for job in self._jobs:
+                if job.moves is None and job.future.done():
+                    try:
+                        job.moves = job.future.result()
+                        self.completed += 1
+                    except Exception as e:
+                        print(f"❌ AI hatası: {e}")
+                        job.moves = greedy_turn(job.position, job.dice)
+                        self.fallbacks += 1
+                elif job.moves is None and now >= job.deadline:
+                    # Çalışan işlem iptal edilemez; sonucu yok sayılır
+                    job.future.cancel()
+                    job.moves = greedy_turn(job.position, job.dice)
+                    self.timeouts += 1
+
+                if job.moves is None:
+                    pending.append(job)
+                else:
+                    ready.append(job)
+            self._jobs = pending
+        return ready
+
+    @property
+    def queue_depth(self) -> int:
+        """Bekleyen bot turu sayısı"""
+        return len(self._jobs)
+
+    def get_stats(self) -> dict:
+        return {
+            'queue_depth': self.queue_depth,
+            'workers': self.workers,
+            'completed': self.completed,
+            'timeouts': self.timeouts,
+            'fallbacks': self.fallbacks
+        }
+
+    def shutdown(self, wait: bool = False):
+        """Havuzu kapat; wait ile işçi işlemlerin çıkması beklenir
+
+        Havuzu açan işlem de bir multiprocessing alt işlemiyse (küme shard'ı)
+        wait=True verilmelidir; aksi halde çıkışta işçiler beklenirken takılır.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,241 @@
+"""
+Tavla Multiplayer Sunucu - asyncio (python-socketio AsyncServer + aiohttp)
+
+multiplayer_server.py ile aynı olayları (find_game, ready, roll_dice,
+make_move, submit_play, spectate, resync, set_wire_format, get_rooms) sunar; fakat her
+bağlantı için bir thread yerine tek bir event loop kullanır. Boşta bekleyen on binlerce bağlantı tek
+işlemde taşınabilir.
+
+Kurulum:
+    pip install python-socketio aiohttp
+"""
+import asyncio
+import sys
+from collections import deque
+from typing import Optional
+
+try:
+    import socketio
+    from aiohttp import web
+except ImportError as e:
+    print(f"❌ Eksik modül: {e}")
+    print("Lütfen şu komutu çalıştırın:")
+    print("pip install python-socketio aiohttp")
+    sys.exit(1)
+
+from game_backend import default_backend
+from journal import JOURNAL_DIR
+from lobby import STATS_TTL, parse_lobby_query
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from server_core import GameServer, Transport, render_index_page
+
+
+class AsyncioTransport(Transport):
+    """python-socketio AsyncServer üzerinden olay gönderimi
+
+    Çekirdek senkron çalışır; gönderimler sıraya alınır ve tek bir görev
+    tarafından sırayla (FIFO) gönderilir. Böylece oda katılımı ile ardından
+    gelen oda yayını arasındaki sıra korunur.
+    """
+
+    name = "asyncio"
+
+    def __init__(self, sio: socketio.AsyncServer):
+        self.sio = sio
+        self._ops = deque()
+        self._flush_task = None
+
+    def _push(self, op):
+        self._ops.append(op)
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_event_loop().create_task(self._flush())
+
+    async def _flush(self):
+        try:
+            while self._ops:
+                kind, args = self._ops.popleft()
+                try:
+                    if kind == 'emit':
+                        event, data, to, skip_sid = args
+                        await self.sio.emit(event, data, to=to, skip_sid=skip_sid)
+                    elif kind == 'enter':
+                        await self.sio.enter_room(*args)
+                    elif kind == 'leave':
+                        await self.sio.leave_room(*args)
+                except Exception as e:
+                    print(f"❌ Gönderim hatası: {e}")
+        finally:
+            self._flush_task = None
+
+    def emit(self, event, data=None, to=None, skip_sid=None):
+        self._push(('emit', (event, data, to, skip_sid)))
+
+    def enter_room(self, sid, room):
+        self._push(('enter', (sid, room)))
+
+    def leave_room(self, sid, room):
+        self._push(('leave', (sid, room)))
+
+    def call_periodically(self, interval, callback):
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"❌ Arka plan görevi hatası: {e}")
+
+        self.sio.start_background_task(loop)
+
+    def backlog(self, sid):
+        # Engine.IO'nun socket başına gönderim kuyruğu
+        socket = self.sio.eio.sockets.get(self.sio.manager.eio_sid_from_sid(sid, '/'))
+        return socket.queue.qsize() if socket is not None else 0
+
+
+sio = socketio.AsyncServer(
+    async_mode='aiohttp',
+    cors_allowed_origins='*',
+    logger=False,
+    engineio_logger=False
+)
+app = web.Application()
+sio.attach(app)
+
+# Başlatıcıda (__main__) kurulur: tek işlemde GameServer, küme modunda ClusterGateway
+server: Optional[GameServer] = None
+
+
+async def index(request):
+    return web.Response(text=render_index_page(server, 'asyncio (aiohttp)'),
+                        content_type='text/html')
+
+def cached_json(request, body, etag, max_age=0):
+    """ETag'li JSON yanıtı; istemcide aynı sürüm varsa 304"""
+    headers = {
+        'ETag': etag,
+        'Cache-Control': f'max-age={max_age}' if max_age else 'no-cache'
+    }
+    if etag in request.headers.get('If-None-Match', ''):
+        return web.Response(status=304, headers=headers)
+    return web.Response(text=body, content_type='application/json', headers=headers)
+
+async def stats(request):
+    body, etag = server.get_stats_json()
+    return cached_json(request, body, etag, int(STATS_TTL))
+
+async def metrics(request):
+    return web.Response(body=server.get_metrics().encode('utf-8'),
+                        headers={'Content-Type': METRICS_CONTENT_TYPE})
+
+async def rooms_info(request):
+    # Sayfalı lobi: /rooms?state=waiting&offset=0&limit=50
+    body, etag = server.get_lobby_page(*parse_lobby_query(request.query))
+    return cached_json(request, body, etag)
+
+async def room_state(request):
+    state = server.get_room_state(request.match_info['room_id'])
+    if state is None:
+        return web.json_response({'error': 'Oda bulunamadı'}, status=404)
+    return web.Response(text=state, content_type='application/json')
+
+async def start_background_tasks(app):
+    server.start_background_tasks()
+
+app.on_startup.append(start_background_tasks)
+app.router.add_get('/', index)
+app.router.add_get('/stats', stats)
+app.router.add_get('/metrics', metrics)
+app.router.add_get('/rooms', rooms_info)
+app.router.add_get('/rooms/{room_id}', room_state)
+
+
+@sio.event
+async def connect(sid, environ):
+    server.on_connect(sid)
+
+@sio.event
+async def disconnect(sid, *args):
+    server.on_disconnect(sid)
+
+@sio.on('find_game')
+async def on_find_game(sid, data=None):
+    server.on_find_game(sid, data or {})
+
+@sio.on('ready')
+async def on_ready(sid, *args):
+    server.on_ready(sid)
+
+@sio.on('roll_dice')
+async def on_roll_dice(sid, *args):
+    server.on_roll_dice(sid)
+
+@sio.on('make_move')
+async def on_make_move(sid, data=None):
+    server.on_make_move(sid, data or {})
+
+@sio.on('submit_play')
+async def on_submit_play(sid, data=None):
+    server.on_submit_play(sid, data or {})
+
+@sio.on('spectate')
+async def on_spectate(sid, data=None):
+    server.on_spectate(sid, data or {})
+
+@sio.on('resync')
+async def on_resync(sid, *args):
+    server.on_resync(sid)
+
+@sio.on('resume')
+async def on_resume(sid, data=None):
+    server.on_resume(sid, data or {})
+
+@sio.on('set_wire_format')
+async def on_set_wire_format(sid, data=None):
+    server.on_set_wire_format(sid, data or {})
+
+@sio.on('get_rooms')
+async def on_get_rooms(sid, data=None):
+    server.on_get_rooms(sid, data or {})
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    shard_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    if shard_count > 1:
+        # Küme modu: odalar shard işlemlerinde, bu işlem ağ geçidi
+        from cluster import ClusterGateway, start_shards, stop_shards
+        backend = default_backend()
+        manager, mq, registry, shard_processes = start_shards(shard_count, backend)
+        server = ClusterGateway(AsyncioTransport(sio), shard_count, mq, registry, backend)
+    else:
+        server = GameServer(AsyncioTransport(sio), journal_dir=JOURNAL_DIR)
+
+    print("🚀 Tavla Multiplayer Sunucu (asyncio) başlatılıyor...")
+    print("📋 Özellikler:")
+    print("   ✅ asyncio + aiohttp (bağlantı başına thread yok)")
+    print("   ✅ python-socketio AsyncServer")
+    if shard_count > 1:
+        print(f"   ✅ Küme modu: {shard_count} shard işlemi")
+    if server.backend.full_rules:
+        print("   ✅ Tam oyun mantığı")
+    else:
+        print("   ⚠️ Basit oyun mantığı")
+
+    print("\n🌐 Sunucu adresleri:")
+    print(f"   Ana sayfa: http://localhost:{port}")
+    print(f"   İstatistikler: http://localhost:{port}/stats")
+    print(f"   Metrikler: http://localhost:{port}/metrics")
+    print(f"   Odalar: http://localhost:{port}/rooms")
+
+    print("\n🛑 Durdurmak için: Ctrl+C")
+
+    try:
+        web.run_app(app, host='0.0.0.0', port=port, print=None)
+    except KeyboardInterrupt:
+        print("\n🛑 Sunucu kullanıcı tarafından durduruldu")
+    finally:
+        if shard_count > 1:
+            stop_shards(server, shard_processes)
+            manager.shutdown()
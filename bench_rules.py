@@ -0,0 +1,59 @@
+"""
+Kural çekirdeği için başsız (headless) performans ölçümü
+
+Rastgele hamlelerle kendi kendine oyunlar oynatır; hamle üretimi, hamle
+uygulama ve pozisyon değerlendirme hızını ölçer. Derlenmiş (mypyc) ve saf
+Python sürümlerini karşılaştırmak için kullanılır.
+
+Kullanım:
+    python bench_rules.py [oyun_sayısı]
+"""
+import random
+import sys
+import time
+
+import rules
+
+
+def play_random_game(rng: random.Random) -> int:
+    """Rastgele bir oyun oynat, yapılan hamle sayısını döndür"""
+    position = rules.initial_position()
+    moves_made = 0
+
+    while rules.winner(position) is None:
+        d1, d2 = rng.randint(1, 6), rng.randint(1, 6)
+        dice = [d1] * 4 if d1 == d2 else [d1, d2]
+
+        while dice:
+            moves = rules.legal_moves(position, dice)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            position = rules.apply(position, move)
+            rules.evaluate(position)
+            dice.remove(move.dice_value)
+            moves_made += 1
+            if rules.winner(position) is not None:
+                break
+
+        position = rules.with_color(position, rules.opponent_of(position.color))
+
+    return moves_made
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(2025)
+
+    print(f"⚙️ Kural çekirdeği: {'derlenmiş (mypyc)' if rules.COMPILED else 'saf Python'}")
+
+    start = time.perf_counter()
+    total_moves = sum(play_random_game(rng) for _ in range(games))
+    elapsed = time.perf_counter() - start
+
+    print(f"🎲 {games} oyun, {total_moves} hamle, {elapsed:.2f} sn")
+    print(f"📊 {games / elapsed:.1f} oyun/sn, {total_moves / elapsed:.0f} hamle/sn")
+
+
+if __name__ == '__main__':
+    main()
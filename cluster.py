@@ -0,0 +1,454 @@
+"""
+Küme modu - odaları birden fazla işleme (shard) dağıtıp tüm çekirdekleri kullanmak için
+
+Yapı:
+    Ağ geçidi (ClusterGateway): tüm Socket.IO bağlantılarını tutar, eşleştirmeyi
+        yapar ve her olayı odanın sahibi olan shard'a mesaj kuyruğu ile iletir.
+    Shard işlemleri (run_shard): her biri kendi GameServer'ını çalıştırır ve
+        sadece crc32(room_id) % shard_sayısı == shard_id olan odalara sahiptir.
+        Gönderimleri (emit, oda katılımı) QueueTransport ile ağ geçidine döner.
+
+Kayıt defteri (room_registry.py) ve mesaj kuyruğu (message_queue.py)
+değiştirilebilir; varsayılan işlemler arası uygulama multiprocessing.Manager
+kullanır. Manager çağrıları bloklayan RPC'lerdir; ağ geçidi bunları event
+loop'ta değil, kendi gönderme ve alma thread'lerinde yapar.
+
+Kullanım:
+    python async_server.py 5000 4    # 4 shard işlemi
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, List, Optional
+
+from journal import JOURNAL_DIR
+from lobby import LobbyIndex, CachedJSON, LOBBY_PAGE_SIZE, parse_lobby_query
+from matchmaking import Matchmaker, DEFAULT_BUCKET
+from metrics import MetricsRegistry, render as render_metrics
+from message_queue import (
+    GATEWAY_CHANNEL, MessageQueue, ManagerMessageQueue, shard_channel, cluster_channels
+)
+from room_registry import RoomRegistry, ManagerRoomRegistry, shard_for
+from rate_limit import RateLimiter
+from game_backend import GameBackend, default_backend
+from server_core import GameServer, Transport, rate_limited
+from wire_format import WIRE_JSON, WIRE_FORMATS
+
+PUMP_INTERVAL = 0.01      # Ağ geçidinin shard gönderimlerini boşaltma aralığı (sn)
+PUMP_BATCH = 1000         # Bir boşaltmada işlenen en fazla mesaj
+SUMMARY_INTERVAL = 1.0    # Shard'ların oda özetlerini yayınlama aralığı (sn)
+SHUTDOWN_TIMEOUT = 5.0    # Durdurulan shard'ın kapanması için beklenen süre (sn)
+RECEIVE_TIMEOUT = 0.1     # Ağ geçidi alma thread'inin kuyrukta en uzun bekleme süresi (sn)
+JOIN_EVENTS = ('find_game', 'spectate')  # Ağ geçidinin oda bağı kurup ilettiği olaylar
+
+
+class QueueTransport(Transport):
+    """Shard tarafı: gönderimleri ağ geçidi kanalına yazar"""
+
+    name = "cluster"
+
+    def __init__(self, mq: MessageQueue):
+        self.mq = mq
+
+    def emit(self, event, data=None, to=None, skip_sid=None):
+        self.mq.put(GATEWAY_CHANNEL, ('emit', (event, data, to, skip_sid)))
+
+    def enter_room(self, sid, room):
+        self.mq.put(GATEWAY_CHANNEL, ('enter', (sid, room)))
+
+    def leave_room(self, sid, room):
+        self.mq.put(GATEWAY_CHANNEL, ('leave', (sid, room)))
+
+    def call_periodically(self, interval, callback):
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"❌ Arka plan görevi hatası: {e}")
+
+        threading.Thread(target=loop, daemon=True).start()
+
+
+class QueueMatchmaker(Matchmaker):
+    """Shard tarafı: eşleştirme kuyruğu ağ geçidindedir, değişiklikler oraya iletilir"""
+
+    def __init__(self, mq: MessageQueue, rating_band: int = 200):
+        super().__init__(rating_band)
+        self.mq = mq
+
+    def add(self, room_id, bucket=DEFAULT_BUCKET):
+        self.mq.put(GATEWAY_CHANNEL, ('match_add', (room_id, bucket)))
+
+    def discard(self, room_id):
+        self.mq.put(GATEWAY_CHANNEL, ('match_discard', (room_id,)))
+
+    def pop(self, bucket=DEFAULT_BUCKET):
+        # Oda seçimi ağ geçidinde yapılır (bkz. ClusterGateway.on_find_game)
+        return None
+
+
+def run_shard(shard_id: int, shard_count: int, mq: MessageQueue, registry: RoomRegistry,
+              backend: GameBackend):
+    """Shard işleminin ana döngüsü"""
+    transport = QueueTransport(mq)
+    # Her shard kendi kayıt dizinine yazar (dizin başına tek yazıcı)
+    journal_dir = os.path.join(JOURNAL_DIR, f'shard-{shard_id}') if JOURNAL_DIR else None
+    server = GameServer(transport, shard_id=shard_id, shard_count=shard_count,
+                        journal_dir=journal_dir, backend=backend)
+    server.matchmaker = QueueMatchmaker(mq)
+    server.start_background_tasks()
+
+    def publish_summary():
+        registry.publish_rooms(shard_id, {
+            'stats': server.get_stats(),
+            'rooms': server.lobby.rooms(),
+            'lobby_version': server.lobby.version,
+            'metrics': server.metrics.snapshot()
+        })
+
+    transport.call_periodically(SUMMARY_INTERVAL, publish_summary)
+    print(f"🧩 Shard {shard_id + 1}/{shard_count} hazır")
+
+    channel = shard_channel(shard_id)
+    try:
+        while True:
+            message = mq.get(channel)
+            if message is None:
+                break  # Durdurma mesajı
+
+            event, sid, args = message
+            try:
+                getattr(server, f'on_{event}')(sid, *args)
+            except Exception as e:
+                print(f"❌ Shard {shard_id} olay hatası ({event}): {e}")
+    except (KeyboardInterrupt, EOFError, OSError):
+        pass  # Ctrl+C veya ağ geçidi / Manager kapandı
+    finally:
+        # Alt işlemlerde atexit çalışmaz; AI havuzu ve kayıt burada kapatılır
+        if server.ai_service is not None:
+            server.ai_service.shutdown(wait=True)
+        if server.journal is not None:
+            server.journal.close()
+
+
+def start_shards(shard_count: int, backend: GameBackend):
+    """Manager, kuyruk, kayıt defteri ve shard işlemlerini başlat"""
+    manager = multiprocessing.Manager()
+    mq = ManagerMessageQueue(manager, cluster_channels(shard_count))
+    registry = ManagerRoomRegistry(manager)
+
+    processes = []
+    for shard_id in range(shard_count):
+        # daemon değil: shard'ın AI işlem havuzu alt işlem açabilmeli;
+        # kapanışta stop_shards ile durdurulur
+        process = multiprocessing.Process(
+            target=run_shard, args=(shard_id, shard_count, mq, registry, backend),
+            name=f'tavla-shard-{shard_id}'
+        )
+        process.start()
+        processes.append(process)
+
+    return manager, mq, registry, processes
+
+
+def stop_shards(gateway: 'ClusterGateway', processes, timeout: float = SHUTDOWN_TIMEOUT):
+    """Shard'lara durdurma mesajı gönder, kapanmalarını bekle; kapanmayanı sonlandır"""
+    try:
+        gateway.stop()
+    except (EOFError, OSError):
+        pass  # Manager zaten kapandı (Ctrl+C tüm işlem grubuna gider)
+
+    deadline = time.time() + timeout
+    for process in processes:
+        process.join(max(0.0, deadline - time.time()))
+        if process.is_alive():
+            print(f"⚠️ {process.name} kapanmadı, sonlandırılıyor")
+            process.terminate()
+            process.join()
+
+
+class ClusterGateway:
+    """Ağ geçidi: bağlantıları tutar, eşleştirir ve olayları odanın shard'ına iletir
+
+    GameServer ile aynı on_* ve HTTP arayüzünü sunar; sunucu giriş noktaları
+    ikisini aynı şekilde kullanır.
+
+    Olay işleyicileri event loop'ta çalışır ve Manager'a hiç gitmez: socket ->
+    oda eşlemesi yerelde tutulur, shard'lara gidenler sıraya (outbox) yazılıp
+    gönderme thread'ince iletilir, shard'lardan gelenler alma thread'ince
+    yerel kuyruğa (inbox) alınıp pump ile loop'ta uygulanır.
+    """
+
+    def __init__(self, transport: Transport, shard_count: int,
+                 mq: MessageQueue, registry: RoomRegistry,
+                 backend: Optional[GameBackend] = None):
+        self.transport = transport
+        self.backend = backend or default_backend()  # Shard'ların kullandığı oyun kuralları
+        self.shard_count = shard_count
+        self.mq = mq
+        self.registry = registry
+        self.rooms_by_sid: Dict[str, str] = {}  # Yönlendirme için yerel eşleme (kayıt defterine de yazılır)
+        self._outbox: queue.SimpleQueue = queue.SimpleQueue()  # (tür, argümanlar); None = dur
+        self._inbox: deque = deque()  # Shard'lardan alınan, pump'ı bekleyen mesajlar
+        self._summaries: List[dict] = []  # Shard özetlerinin son kopyası (alma thread'i yeniler)
+        self._stopped = threading.Event()
+        self._sender: Optional[threading.Thread] = None
+        self.matchmaker = Matchmaker()
+        self.wire_formats = {}  # Henüz odada olmayan socket'lerin seçtiği biçim
+        self.start_time = time.time()
+        self.lobby = LobbyIndex()  # Shard özetlerinden kurulur
+        self._lobby_versions = None
+        self.stats_cache = CachedJSON(self.get_stats)
+
+        # Bağlantılar ağ geçidinde sayılır; diğer metrikler shard özetlerinden gelir
+        self.metrics = MetricsRegistry()
+        self.connections = self.metrics.gauge('tavla_connections', 'Açık Socket.IO bağlantıları')
+        # Olay seli shard'lara iletilmeden burada elenir
+        self.rate_limiter = RateLimiter()
+        self.throttled_events = self.metrics.counter(
+            'tavla_throttled_events_total', 'Hız sınırı nedeniyle düşürülen olaylar', ('event',))
+
+    # --- Yönlendirme ---
+
+    def route(self, shard_id: int, event: str, sid: str, *args):
+        """Olayı shard'a iletilmek üzere sıraya al (bloklamaz)"""
+        self._outbox.put(('route', (shard_channel(shard_id), (event, sid, args))))
+
+    def room_of(self, sid: str) -> Optional[str]:
+        return self.rooms_by_sid.get(sid)
+
+    def bind(self, sid: str, room_id: str):
+        self.rooms_by_sid[sid] = room_id
+        self._outbox.put(('bind', (sid, room_id)))
+
+    def unbind(self, sid: str):
+        if self.rooms_by_sid.pop(sid, None) is not None:
+            self._outbox.put(('unbind', (sid,)))
+
+    def shard_of(self, sid: str) -> int:
+        """Socket'in olaylarını işleyen shard (odası yoksa sid'e göre)"""
+        room_id = self.room_of(sid)
+        return shard_for(room_id if room_id else sid, self.shard_count)
+
+    def forward(self, event: str, sid: str, *args):
+        self.route(self.shard_of(sid), event, sid, *args)
+
+    def join_room(self, sid: str, room_id: str, event: str, *args):
+        """Socket'i odaya bağla ve olayı odanın shard'ına ilet"""
+        self.bind(sid, room_id)
+        shard_id = shard_for(room_id, self.shard_count)
+
+        # Odaya girmeden önce seçilen tel biçimini shard'a taşı
+        wire_format = self.wire_formats.pop(sid, WIRE_JSON)
+        if wire_format != WIRE_JSON:
+            self.route(shard_id, 'set_wire_format', sid, {'format': wire_format})
+        self.route(shard_id, event, sid, *args)
+
+    def _send_loop(self):
+        """Gönderme thread'i: sıradaki iletimleri ve kayıt defteri yazımlarını yap"""
+        while True:
+            op = self._outbox.get()
+            if op is None:
+                return
+            kind, args = op
+            try:
+                if kind == 'route':
+                    self.mq.put(*args)
+                elif kind == 'bind':
+                    self.registry.bind(*args)
+                elif kind == 'unbind':
+                    self.registry.unbind(*args)
+            except (EOFError, OSError) as e:
+                print(f"❌ Shard iletim hatası: {e}")
+                return  # Manager kapandı
+
+    def _receive_loop(self):
+        """Alma thread'i: shard gönderimlerini ve özetlerini yerele al"""
+        next_summary = 0.0
+        while not self._stopped.is_set():
+            try:
+                message = self.mq.get(GATEWAY_CHANNEL, timeout=RECEIVE_TIMEOUT)
+                if message is not None:
+                    self._inbox.append(message)
+                if time.time() >= next_summary:
+                    self._summaries = self.registry.shard_summaries()
+                    next_summary = time.time() + SUMMARY_INTERVAL
+            except (EOFError, OSError):
+                return  # Manager kapandı
+
+    def pump(self):
+        """Shard'lardan alınan gönderimleri uygula (event loop'ta; Manager'a gitmez)"""
+        for _ in range(PUMP_BATCH):
+            try:
+                kind, args = self._inbox.popleft()
+            except IndexError:
+                return
+
+            if kind == 'emit':
+                if args[0] == 'resume_failed' or (
+                        args[0] == 'error' and (args[1] or {}).get('event') in JOIN_EVENTS):
+                    # Oturum veya oda shard'da bulunamadı; socket'in oda bağını geri al
+                    self.unbind(args[2])
+                self.transport.emit(*args)
+            elif kind == 'enter':
+                self.transport.enter_room(*args)
+            elif kind == 'leave':
+                self.transport.leave_room(*args)
+            elif kind == 'match_add':
+                self.matchmaker.add(*args)
+            elif kind == 'match_discard':
+                self.matchmaker.discard(*args)
+
+    def start_background_tasks(self):
+        self._sender = threading.Thread(target=self._send_loop, name='tavla-gateway-send',
+                                        daemon=True)
+        self._sender.start()
+        threading.Thread(target=self._receive_loop, name='tavla-gateway-receive',
+                         daemon=True).start()
+        self.transport.call_periodically(PUMP_INTERVAL, self.pump)
+
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """Sıradakileri iletip shard işlemlerine durdurma mesajı gönder"""
+        self._stopped.set()
+        for shard_id in range(self.shard_count):
+            self._outbox.put(('route', (shard_channel(shard_id), None)))
+        self._outbox.put(None)
+        if self._sender is not None:
+            self._sender.join(timeout)
+        else:
+            self._send_loop()  # Thread başlatılmadıysa burada boşalt
+
+    # --- HTTP verileri (shard özetlerinden, en fazla SUMMARY_INTERVAL eski) ---
+
+    def get_stats(self) -> dict:
+        summaries = self._summaries
+        return {
+            'players': sum(s['stats']['players'] for s in summaries),
+            'rooms': sum(s['stats']['rooms'] for s in summaries),
+            'uptime': time.time() - self.start_time,
+            'game_logic_available': all(s['stats']['game_logic_available'] for s in summaries),
+            'game_backend': self.backend.name,
+            'backend': f"{self.transport.name} + {self.shard_count} shard",
+            'ai_queue_depth': sum((s['stats'].get('ai') or {}).get('queue_depth', 0) for s in summaries),
+            'shards': self.shard_count,
+            'timestamp': time.time()
+        }
+
+    def get_metrics(self) -> str:
+        snapshots = [s['metrics'] for s in self._summaries]
+        return render_metrics([self.metrics.snapshot()] + snapshots)
+
+    def _refresh_lobby(self):
+        """Herhangi bir shard'ın lobisi değiştiyse dizini yeniden eşitle"""
+        summaries = self._summaries
+        versions = tuple(s['lobby_version'] for s in summaries)
+        if versions != self._lobby_versions:
+            self.lobby.replace([room for s in summaries for room in s['rooms']])
+            self._lobby_versions = versions
+
+    def get_stats_json(self):
+        return self.stats_cache.get()
+
+    def get_rooms_info(self) -> dict:
+        self._refresh_lobby()
+        rooms_data = self.lobby.rooms()
+        return {'rooms': rooms_data, 'total': len(rooms_data)}
+
+    def get_lobby_page(self, state=None, offset: int = 0, limit: int = LOBBY_PAGE_SIZE):
+        self._refresh_lobby()
+        return self.lobby.page_json(state, offset, limit)
+
+    def get_room_state(self, room_id: str):
+        # Oda durumu sahibi olan shard'dadır; HTTP yoklaması küme modunda desteklenmez
+        return None
+
+    # --- Socket.IO olayları ---
+
+    def on_connect(self, sid: str):
+        self.connections.inc()
+        self.forward('connect', sid)
+
+    def on_disconnect(self, sid: str):
+        self.connections.dec()
+        if self.room_of(sid) is not None:
+            self.forward('disconnect', sid)
+            self.unbind(sid)
+        self.wire_formats.pop(sid, None)
+        self.rate_limiter.remove(sid)
+
+    @rate_limited('find_game')
+    def on_find_game(self, sid: str, data: dict):
+        if self.room_of(sid) is not None:
+            self.forward('find_game', sid, data)
+            return
+
+        # Bekleyen oda varsa onun shard'ına, yoksa yeni bir odayla gönder;
+        # AI odaları eşleştirmeye girmez
+        room_id = None
+        if data.get('ai_level') is None:
+            room_id = self.matchmaker.pop(self.matchmaker.bucket_for(data.get('rating')))
+        room_id = room_id or str(uuid.uuid4())[:8].upper()
+        self.join_room(sid, room_id, 'find_game', data, room_id)
+
+    @rate_limited('ready')
+    def on_ready(self, sid: str):
+        self.forward('ready', sid)
+
+    @rate_limited('roll_dice')
+    def on_roll_dice(self, sid: str):
+        self.forward('roll_dice', sid)
+
+    @rate_limited('make_move')
+    def on_make_move(self, sid: str, data: dict):
+        self.forward('make_move', sid, data)
+
+    @rate_limited('submit_play')
+    def on_submit_play(self, sid: str, data: dict):
+        self.forward('submit_play', sid, data)
+
+    @rate_limited('spectate')
+    def on_spectate(self, sid: str, data: dict):
+        room_id = data.get('room_id')
+        if self.room_of(sid) is None and isinstance(room_id, str):
+            self.join_room(sid, room_id, 'spectate', data)
+        else:
+            self.forward('spectate', sid, data)
+
+    @rate_limited('resync')
+    def on_resync(self, sid: str):
+        self.forward('resync', sid)
+
+    @rate_limited('resume')
+    def on_resume(self, sid: str, data: dict):
+        # Yeni socket'in odası yok; oturum istemcinin bildirdiği odanın shard'ında
+        room_id = data.get('room_id')
+        if self.room_of(sid) is None and isinstance(room_id, str):
+            self.join_room(sid, room_id, 'resume', data)
+        else:
+            self.forward('resume', sid, data)
+
+    @rate_limited('set_wire_format')
+    def on_set_wire_format(self, sid: str, data: dict):
+        if self.room_of(sid) is not None:
+            self.forward('set_wire_format', sid, data)
+            return
+
+        wire_format = data.get('format', WIRE_JSON)
+        if wire_format not in WIRE_FORMATS:
+            self.transport.emit('error', {'message': 'Desteklenmeyen tel biçimi!'}, to=sid)
+            return
+
+        self.wire_formats[sid] = wire_format
+        self.transport.emit('wire_format_set', {'format': wire_format}, to=sid)
+
+    @rate_limited('get_rooms')
+    def on_get_rooms(self, sid: str, data=None):
+        self._refresh_lobby()
+        state, offset, limit = parse_lobby_query(data or {})
+        self.transport.emit('rooms_list', self.lobby.page(state, offset, limit), to=sid)
@@ -0,0 +1,227 @@
+"""
+AI pozisyon değerlendirmeleri için kalıcı (disk üzerinde) önbellek
+
+SQLite WAL modunda çalışır; böylece birden fazla sunucu işlemi aynı dosyayı
+eşzamanlı okuyabilir. Anahtar: pozisyon özeti + arama derinliği.
+"""
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from rules import Position
+
+
+def position_key(position: Position, maximizing: bool = True) -> bytes:
+    """Pozisyonu deterministik bir bayt dizisine çevir (işlemler arası sabit)"""
+    side = position.color | (2 if maximizing else 0)
+    return struct.pack('28bB', *position.points, side)
+
+
+class EvaluationCache:
+    """Pozisyon değerlendirme önbelleği (bellek + SQLite)
+
+    - Okumalar önce bellekteki sıcak tablodan, sonra diskten yapılır
+    - Yazmalar toplu halde (flush) diske aktarılır
+    - Kayıt sayısı max_entries ile sınırlıdır; en eski kullanılanlar silinir
+    """
+
+    def __init__(self, path: str, max_entries: int = 500_000,
+                 memory_entries: int = 100_000, flush_every: int = 1000,
+                 warmup: bool = True):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.flush_every = flush_every
+
+        self._local = threading.local()
+        # Sıra = kullanım sırası (LRU): en son kullanılan sonda
+        self._memory: 'OrderedDict[Tuple[bytes, int], float]' = OrderedDict()
+        self._pending: Dict[Tuple[bytes, int], float] = {}
+        self._touched: Dict[Tuple[bytes, int], int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+        self._warmup_thread = None
+        if warmup:
+            self._warmup_thread = threading.Thread(target=self._warmup, daemon=True)
+            self._warmup_thread.start()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Thread başına ayrı bağlantı (sqlite3 bağlantıları paylaşılmaz)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS evals ('
+            ' key BLOB NOT NULL,'
+            ' depth INTEGER NOT NULL,'
+            ' score REAL NOT NULL,'
+            ' last_used INTEGER NOT NULL,'
+            ' PRIMARY KEY (key, depth)'
+            ') WITHOUT ROWID'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS evals_last_used ON evals(last_used)')
+        conn.commit()
+
+    def _warmup(self):
+        """Arka planda en son kullanılan kayıtları belleğe yükle"""
+        try:
+            conn = self._connection()
+            rows = conn.execute(
+                'SELECT key, depth, score FROM evals ORDER BY last_used DESC LIMIT ?',
+                (self.memory_entries,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Önbellek ısınma hatası: {e}")
+            return
+
+        # Isınma sürerken kullanılanlar daha yeni sayılır; yüklenenler başa eklenir
+        with self._lock:
+            for key, depth, score in rows:
+                cache_key = (bytes(key), depth)
+                if cache_key not in self._memory:
+                    self._memory[cache_key] = score
+                    self._memory.move_to_end(cache_key, last=False)
+
+    def get(self, key: bytes, depth: int) -> Optional[float]:
+        """Önbellekteki skoru döndür (yoksa None)"""
+        cache_key = (key, depth)
+        with self._lock:
+            score = self._memory.get(cache_key)
+            if score is not None:
+                self._memory.move_to_end(cache_key)
+            else:
+                score = self._pending.get(cache_key)
+            if score is not None:
+                self._hit(cache_key)
+                return score
+
+        # Disk okuması kilit dışında; paylaşılan durum yine kilit altında güncellenir
+        row = self._connection().execute(
+            'SELECT score FROM evals WHERE key = ? AND depth = ?', (key, depth)
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            score = row[0]
+            self._remember_locked(cache_key, score)
+            self._hit(cache_key)
+        return score
+
+    def _hit(self, cache_key: Tuple[bytes, int]):
+        """İsabeti say ve kullanım zamanını işaretle (kilit alınmış olmalı)"""
+        self.hits += 1
+        self._touched[cache_key] = int(time.time())
+
+    def put(self, key: bytes, depth: int, score: float):
+        """Skoru kaydet (diske toplu yazılır)"""
+        cache_key = (key, depth)
+        self._remember(cache_key, score)
+        with self._lock:
+            self._pending[cache_key] = score
+            should_flush = len(self._pending) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def _remember(self, cache_key: Tuple[bytes, int], score: float):
+        """Bellek tablosuna ekle, dolarsa en uzun süredir kullanılmayan yarısını at"""
+        with self._lock:
+            self._remember_locked(cache_key, score)
+
+    def _remember_locked(self, cache_key: Tuple[bytes, int], score: float):
+        if len(self._memory) >= self.memory_entries:
+            for _ in range(self.memory_entries // 2):
+                self._memory.popitem(last=False)
+        self._memory[cache_key] = score
+        self._memory.move_to_end(cache_key)
+
+    def flush(self):
+        """Bekleyen yazmaları ve kullanım zamanlarını diske aktar"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+
+        if not pending and not touched:
+            return
+
+        now = int(time.time())
+        conn = self._connection()
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO evals (key, depth, score, last_used) VALUES (?, ?, ?, ?)',
+                    [(key, depth, score, now) for (key, depth), score in pending.items()]
+                )
+                conn.executemany(
+                    'UPDATE evals SET last_used = ? WHERE key = ? AND depth = ?',
+                    [(used, key, depth) for (key, depth), used in touched.items()
+                     if (key, depth) not in pending]
+                )
+            self._evict(conn)
+        except sqlite3.OperationalError as e:
+            # Başka bir işlem yazıyorsa kayıtlar bir sonraki flush'a kalır
+            print(f"⚠️ Önbellek yazılamadı: {e}")
+            with self._lock:
+                for cache_key, score in pending.items():
+                    self._pending.setdefault(cache_key, score)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Sınır aşıldıysa en uzun süre kullanılmayan kayıtları sil"""
+        total = conn.execute('SELECT COUNT(*) FROM evals').fetchone()[0]
+        excess = total - self.max_entries
+        if excess <= 0:
+            return
+        # Her seferinde biraz fazla sil ki eviction her flush'ta çalışmasın
+        excess += self.max_entries // 10
+        with conn:
+            conn.execute(
+                'DELETE FROM evals WHERE (key, depth) IN '
+                '(SELECT key, depth FROM evals ORDER BY last_used LIMIT ?)',
+                (excess,)
+            )
+
+    def wait_warmup(self, timeout: Optional[float] = None):
+        """Isınma tamamlanana kadar bekle"""
+        if self._warmup_thread:
+            self._warmup_thread.join(timeout)
+
+    def close(self):
+        """Kalan yazmaları aktar ve bağlantıyı kapat"""
+        self.flush()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def get_info(self) -> Dict:
+        """Önbellek istatistiklerini döndür"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            memory_entries, pending_writes = len(self._memory), len(self._pending)
+        lookups = hits + misses
+        return {
+            'path': self.path,
+            'memory_entries': memory_entries,
+            'pending_writes': pending_writes,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': (hits / lookups * 100) if lookups > 0 else 0.0
+        }
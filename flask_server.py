@@ -0,0 +1,161 @@
+"""
+Flask-SocketIO (threading) taşıma katmanı - sunucu giriş noktalarının ortak kurulumu
+
+create_app verilen oyun arka ucuyla bir GameServer kurar; HTTP uçlarını
+(/, /stats, /metrics, /rooms) ve Socket.IO olaylarını ona bağlar.
+multiplayer_server.py (tam oyun) ve simple_test_server.py (basit mod) bu
+modülün üzerindeki ince başlatıcılardır; asyncio karşılığı async_server.py'dir.
+"""
+from typing import Optional, Tuple
+
+from flask import Flask, Response, request
+from flask_socketio import SocketIO
+
+from game_backend import GameBackend
+from journal import JOURNAL_DIR
+from lobby import STATS_TTL, parse_lobby_query
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from server_core import GameServer, Transport, render_index_page
+
+
+class FlaskSocketIOTransport(Transport):
+    """Flask-SocketIO üzerinden olay gönderimi (bağlantı başına bir thread)"""
+
+    name = "threading"
+
+    def __init__(self, socketio: SocketIO):
+        self.socketio = socketio
+
+    def emit(self, event, data=None, to=None, skip_sid=None):
+        self.socketio.emit(event, data, to=to, skip_sid=skip_sid)
+
+    def enter_room(self, sid, room):
+        self.socketio.server.enter_room(sid, room, namespace='/')
+
+    def leave_room(self, sid, room):
+        self.socketio.server.leave_room(sid, room, namespace='/')
+
+    def call_periodically(self, interval, callback):
+        def loop():
+            while True:
+                self.socketio.sleep(interval)
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"❌ Arka plan görevi hatası: {e}")
+
+        self.socketio.start_background_task(loop)
+
+    def backlog(self, sid):
+        # Engine.IO'nun socket başına gönderim kuyruğu
+        server = self.socketio.server
+        socket = server.eio.sockets.get(server.manager.eio_sid_from_sid(sid, '/'))
+        return socket.queue.qsize() if socket is not None else 0
+
+
+def cached_json(body, etag, max_age=0):
+    """ETag'li JSON yanıtı; istemcide aynı sürüm varsa 304"""
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag.strip('"'))
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def create_app(backend: Optional[GameBackend] = None,
+               secret_key: str = 'tavla_secret_key_2025',
+               label: str = 'Threading (Python 3.12+ uyumlu)',
+               journal_dir: Optional[str] = JOURNAL_DIR) -> Tuple[Flask, SocketIO, GameServer]:
+    """Flask uygulaması, SocketIO ve olaylar bağlanmış GameServer"""
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = secret_key
+
+    # Threading backend kullan (Eventlet yerine)
+    socketio = SocketIO(
+        app,
+        cors_allowed_origins="*",
+        async_mode='threading',  # Eventlet yerine threading
+        logger=False,
+        engineio_logger=False
+    )
+
+    server = GameServer(FlaskSocketIOTransport(socketio), journal_dir=journal_dir,
+                        backend=backend)
+
+    @app.route('/')
+    def index():
+        return render_index_page(server, label)
+
+    @app.route('/stats')
+    def stats():
+        body, etag = server.get_stats_json()
+        return cached_json(body, etag, int(STATS_TTL))
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(server.get_metrics(), content_type=METRICS_CONTENT_TYPE)
+
+    @app.route('/rooms')
+    def rooms_info():
+        # Sayfalı lobi: /rooms?state=waiting&offset=0&limit=50
+        body, etag = server.get_lobby_page(*parse_lobby_query(request.args))
+        return cached_json(body, etag)
+
+    @app.route('/rooms/<room_id>')
+    def room_state(room_id):
+        state = server.get_room_state(room_id)
+        if state is None:
+            return {'error': 'Oda bulunamadı'}, 404
+        return Response(state, mimetype='application/json')
+
+    @socketio.on('connect')
+    def on_connect():
+        server.on_connect(request.sid)
+
+    @socketio.on('disconnect')
+    def on_disconnect():
+        server.on_disconnect(request.sid)
+
+    @socketio.on('find_game')
+    def on_find_game(data):
+        server.on_find_game(request.sid, data or {})
+
+    @socketio.on('ready')
+    def on_ready():
+        server.on_ready(request.sid)
+
+    @socketio.on('roll_dice')
+    def on_roll_dice():
+        server.on_roll_dice(request.sid)
+
+    @socketio.on('make_move')
+    def on_make_move(data):
+        server.on_make_move(request.sid, data or {})
+
+    @socketio.on('submit_play')
+    def on_submit_play(data):
+        server.on_submit_play(request.sid, data or {})
+
+    @socketio.on('spectate')
+    def on_spectate(data):
+        server.on_spectate(request.sid, data or {})
+
+    @socketio.on('resync')
+    def on_resync():
+        server.on_resync(request.sid)
+
+    @socketio.on('resume')
+    def on_resume(data):
+        server.on_resume(request.sid, data or {})
+
+    @socketio.on('set_wire_format')
+    def on_set_wire_format(data):
+        server.on_set_wire_format(request.sid, data or {})
+
+    @socketio.on('get_rooms')
+    def on_get_rooms(data=None):
+        server.on_get_rooms(request.sid, data or {})
+
+    return app, socketio, server
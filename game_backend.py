@@ -0,0 +1,352 @@
+"""
+Oyun arka uçları - sunucu çekirdeğinin oyun kurallarından bağımsız kalması için
+
+GameServer odaları, eşleştirmeyi, durum yayınını ve kaydı yönetir; oyunun
+kendisini (tahta, zar, hamle doğrulama, tur geçişi) bir GameBackend'e
+bırakır. İki arka uç vardır:
+
+    TavlaBackend   game_logic.TavlaGame ve rules ile tam oyun
+    SimpleBackend  game_logic olmadan çalışan basit mod (sadece zar; hamleler
+                   doğrulanmadan yayınlanır)
+
+Kullanıcı hatalarında (sıra değil, geçersiz biçim) ValueError mesajı
+istemciye olduğu gibi gönderilir.
+
+Varsayılan arka uç TAVLA_BACKEND ortam değişkeniyle seçilir ('tavla' veya
+'simple'); verilmezse oyun mantığı yüklüyse tam oyun kullanılır.
+"""
+import copy
+import os
+import random
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+# Oyun mantığını import et
+try:
+    import rules
+    from game_logic import TavlaGame, Player, GameState, Move
+    GAME_LOGIC_AVAILABLE = True
+    print("✅ Oyun mantığı modülleri yüklendi")
+except ImportError as e:
+    GAME_LOGIC_AVAILABLE = False
+    print(f"⚠️ Oyun mantığı bulunamadı: {e}")
+    print("Sunucu basit modda çalışacak")
+
+
+class GameBackend(ABC):
+    """Bir odadaki oyunun kuralları"""
+
+    name = "backend"
+    full_rules = False  # Sunucu tarafı hamle doğrulaması ve tur yönetimi (AI bunu gerektirir)
+
+    @abstractmethod
+    def new_game(self) -> Any:
+        """Başlangıç durumunda yeni oyun"""
+
+    @abstractmethod
+    def roles(self) -> Tuple[Any, Any]:
+        """(ilk oyuncu, ikinci oyuncu) rolleri"""
+
+    def role_value(self, role) -> str:
+        """Rolün olay verisindeki adı ('beyaz' / 'siyah')"""
+        return getattr(role, 'value', role)
+
+    @abstractmethod
+    def role_from_value(self, value: str) -> Any:
+        """role_value'nun tersi (kayıttan kurtarma)"""
+
+    @abstractmethod
+    def serialize(self, game) -> dict:
+        """İstemcilere gönderilen durum (yeni sözlük; oyunla paylaşılmaz)"""
+
+    @abstractmethod
+    def deserialize(self, state: dict) -> Any:
+        """serialize çıktısından oyunu kur"""
+
+    @abstractmethod
+    def replay(self, game, kind: str, data: Any):
+        """Kayıttaki oda olayını oyuna uygula (geçersizse ValueError)"""
+
+    @abstractmethod
+    def current_role(self, game) -> Any:
+        """Sırası gelen oyuncunun rolü"""
+
+    @abstractmethod
+    def awaiting_dice(self, game) -> bool:
+        """Sıradaki oyuncu zar mı atacak (yoksa hamle bekleniyor)"""
+
+    @abstractmethod
+    def roll_dice(self, game, role) -> Tuple[int, int]:
+        """Rol için zar at (sırası değilse ValueError)"""
+
+    @abstractmethod
+    def check_turn(self, game, role):
+        """Rol hamle yapabilir mi (değilse ValueError)"""
+
+    @abstractmethod
+    def parse_move(self, data: dict) -> Any:
+        """Olay verisinden hamle (KeyError/TypeError/ValueError)"""
+
+    @abstractmethod
+    def make_move(self, game, move) -> bool:
+        """Tek hamle yap (geçersizse False)"""
+
+    @abstractmethod
+    def apply_play(self, game, moves: List[Any]) -> bool:
+        """Turun hamle dizisini bütün olarak doğrula ve uygula (geçersizse oyun değişmez)"""
+
+    def serialize_move(self, move) -> dict:
+        """Hamleyi olay verisine çevir"""
+        return {
+            'from_point': move.from_point,
+            'to_point': move.to_point,
+            'dice_value': move.dice_value
+        }
+
+    def record_move(self, move) -> list:
+        """Hamlenin kayıttaki biçimi"""
+        return [move.from_point, move.to_point, move.dice_value]
+
+    @abstractmethod
+    def end_turn(self, game, force: bool = False) -> Optional[bool]:
+        """Tur bittiyse sırayı geçir
+
+        Dönüş: tur sürüyorsa None, geçtiyse kalan zarların oynanamadığı
+        (pas) bilgisi
+        """
+
+    @abstractmethod
+    def is_over(self, game) -> bool:
+        """Oyun bitti mi"""
+
+    @abstractmethod
+    def winner(self, game) -> Any:
+        """Kazananın rolü (yoksa None)"""
+
+
+class TavlaBackend(GameBackend):
+    """game_logic.TavlaGame ile tam oyun"""
+
+    name = "tavla"
+    full_rules = True
+
+    def new_game(self):
+        return TavlaGame()
+
+    def roles(self):
+        return Player.WHITE, Player.BLACK
+
+    def role_from_value(self, value):
+        return Player(value)
+
+    def serialize(self, game):
+        board_data = []
+        for i in range(28):  # 24 normal + 2 bar + 2 home
+            point = game.board.points[i]
+            board_data.append({
+                'count': point.count,
+                'owner': point.owner.value if point.owner else None
+            })
+
+        return {
+            'current_player': game.current_player.value,
+            'game_state': game.game_state.value,
+            'dice_values': list(game.dice_values),
+            'moves_left': list(game.moves_left),
+            'move_count': game.move_count,
+            'board': board_data,
+            'winner': game.winner.value if game.winner else None
+        }
+
+    def deserialize(self, state):
+        points = []
+        for point in state['board']:
+            sign = -1 if point['owner'] == Player.BLACK.value else 1
+            points.append(point['count'] * sign)
+
+        game = TavlaGame()
+        game.current_player = Player(state['current_player'])
+        game.board.load_position(rules.Position(tuple(points), rules.color_of(game.current_player)))
+        game.game_state = GameState(state['game_state'])
+        game.dice_values = list(state['dice_values'])
+        game.moves_left = list(state['moves_left'])
+        game.move_count = state['move_count']
+        game.winner = Player(state['winner']) if state['winner'] else None
+        return game
+
+    def replay(self, game, kind, data):
+        if kind == 'dice':
+            if game.game_state != GameState.WAITING_DICE:
+                raise ValueError(f"zar sırası değil: {data}")
+            game.roll_dice(tuple(data))
+        elif kind in ('move', 'play'):
+            moves = [data] if kind == 'move' else data
+            for from_point, to_point, dice_value in moves:
+                if not game.make_move(Move(from_point, to_point, dice_value)):
+                    raise ValueError(f"geçersiz hamle: {data}")
+        elif kind == 'turn':
+            game.end_turn()
+
+    def current_role(self, game):
+        return game.current_player
+
+    def awaiting_dice(self, game):
+        return game.game_state == GameState.WAITING_DICE
+
+    def roll_dice(self, game, role):
+        self.check_turn(game, role)
+        if game.game_state != GameState.WAITING_DICE:
+            raise ValueError('Zar atma sırası değil!')
+        return game.roll_dice()
+
+    def check_turn(self, game, role):
+        if role != game.current_player:
+            raise ValueError('Sizin sıranız değil!')
+
+    def parse_move(self, data):
+        return Move(
+            from_point=int(data['from_point']),
+            to_point=int(data['to_point']),
+            dice_value=int(data['dice_value'])
+        )
+
+    def make_move(self, game, move):
+        return game.make_move(move)
+
+    def apply_play(self, game, moves):
+        if game.game_state == GameState.WAITING_DICE:
+            return False
+        try:
+            rules.apply_play(game.get_position(), game.moves_left, moves)
+        except ValueError:
+            return False
+
+        for move in moves:
+            game.make_move(move)
+        return True
+
+    def end_turn(self, game, force=False):
+        if game.game_state in (GameState.GAME_OVER, GameState.WAITING_DICE):
+            return None
+        if not force and not game.should_end_turn():
+            return None
+
+        passed = bool(game.moves_left)  # Kalan zarlar oynanamadı
+        game.end_turn()
+        return passed
+
+    def is_over(self, game):
+        return game.game_state == GameState.GAME_OVER
+
+    def winner(self, game):
+        return game.winner
+
+
+class SimpleMove:
+    """Basit modda doğrulanmadan kabul edilen hamle"""
+
+    __slots__ = ('from_point', 'to_point', 'dice_value')
+
+    def __init__(self, from_point: int, to_point: int, dice_value: int):
+        self.from_point = from_point
+        self.to_point = to_point
+        self.dice_value = dice_value
+
+    def __str__(self):
+        return f"{self.from_point} -> {self.to_point} (zar: {self.dice_value})"
+
+
+class SimpleBackend(GameBackend):
+    """game_logic olmadan basit mod: zar atılır, hamleler doğrulanmadan yayınlanır
+
+    Sıra tutulmaz, tahta güncellenmez; bağlantı ve oda akışını denemek
+    içindir. Oyun mantığı yüklüyse tahta başlangıç dizilişiyle gösterilir.
+    """
+
+    name = "simple"
+
+    def new_game(self) -> Dict[str, Any]:
+        if GAME_LOGIC_AVAILABLE:
+            # Gerçek başlangıç durumu (tahta dizilişi TavlaGame'den)
+            return TavlaBackend().serialize(TavlaGame())
+        return {
+            'current_player': 'beyaz',
+            'game_state': 'waiting_dice',
+            'dice_values': [0, 0],
+            'moves_left': [],
+            'move_count': 0,
+            'board': [{'count': 0, 'owner': None} for _ in range(28)],
+            'winner': None
+        }
+
+    def roles(self):
+        return 'beyaz', 'siyah'
+
+    def role_from_value(self, value):
+        return value
+
+    def serialize(self, game):
+        # Durum oyunun kendisidir; yayınlanan kopya sonraki farklar için sabit kalmalı
+        return copy.deepcopy(game)
+
+    def deserialize(self, state):
+        return copy.deepcopy(state)
+
+    def replay(self, game, kind, data):
+        if kind == 'dice':
+            game['dice_values'] = list(data)
+        elif kind in ('move', 'play'):
+            game['move_count'] += 1 if kind == 'move' else len(data)
+
+    def current_role(self, game):
+        return game['current_player']
+
+    def awaiting_dice(self, game):
+        return True  # Zar her an atılabilir
+
+    def roll_dice(self, game, role):
+        dice = (random.randint(1, 6), random.randint(1, 6))
+        game['dice_values'] = list(dice)
+        return dice
+
+    def check_turn(self, game, role):
+        pass  # Basit modda sıra tutulmaz
+
+    def parse_move(self, data):
+        return SimpleMove(int(data['from_point']), int(data['to_point']), int(data['dice_value']))
+
+    def make_move(self, game, move):
+        game['move_count'] += 1
+        return True
+
+    def apply_play(self, game, moves):
+        game['move_count'] += len(moves)
+        return True
+
+    def end_turn(self, game, force=False):
+        return None
+
+    def is_over(self, game):
+        return False
+
+    def winner(self, game):
+        return None
+
+
+BACKENDS = {
+    TavlaBackend.name: TavlaBackend,
+    SimpleBackend.name: SimpleBackend,
+}
+GAME_BACKEND = os.environ.get('TAVLA_BACKEND', '')
+
+
+def default_backend(name: str = GAME_BACKEND) -> GameBackend:
+    """İstenen arka uç; verilmezse oyun mantığı yüklüyse tam oyun, değilse basit mod"""
+    if name not in BACKENDS:
+        if name:
+            print(f"⚠️ Bilinmeyen oyun arka ucu: {name}")
+        name = TavlaBackend.name if GAME_LOGIC_AVAILABLE else SimpleBackend.name
+    if name == TavlaBackend.name and not GAME_LOGIC_AVAILABLE:
+        print("⚠️ Oyun mantığı yüklenemedi, basit mod kullanılacak")
+        name = SimpleBackend.name
+    return BACKENDS[name]()
@@ -6,10 +6,8 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict
 
-
-class Player(Enum):
-    WHITE = "beyaz"
-    BLACK = "siyah"
+import rules
+from rules import Player, Move, Position
 
 
 class GameState(Enum):
@@ -73,27 +71,6 @@ class Point:
         return False
 
 
-@dataclass
-class Move:
-    """Bir hamleyi temsil eden sınıf"""
-    from_point: int  # -2: bar, -1: bear_off, 0-23: normal haneler
-    to_point: int    # -2: bar, -1: bear_off, 0-23: normal haneler
-    dice_value: int
-    
-    def __str__(self):
-        from_str = "Bar" if self.from_point == -2 else f"P{self.from_point + 1}"
-        to_str = "Home" if self.to_point == -1 else f"P{self.to_point + 1}"
-        return f"{from_str} -> {to_str} ({self.dice_value})"
-    
-    def __eq__(self, other):
-        """Hamleleri karşılaştır"""
-        if not isinstance(other, Move):
-            return False
-        return (self.from_point == other.from_point and 
-                self.to_point == other.to_point and 
-                self.dice_value == other.dice_value)
-
-
 @dataclass
 class GameStats:
     """Oyun istatistikleri"""
@@ -154,6 +131,31 @@ class Board:
         self.points[5].count = 5
         self.points[5].owner = Player.BLACK    # Hane 19: 5 siyah pul
     
+    def to_position(self, player: Player) -> Position:
+        """Tahtanın değiştirilemez anlık görüntüsünü al (kural çekirdeği için)"""
+        points = []
+        for point in self.points:
+            if point.owner == Player.WHITE:
+                points.append(point.count)
+            elif point.owner == Player.BLACK:
+                points.append(-point.count)
+            else:
+                points.append(0)
+        return Position(tuple(points), rules.color_of(player))
+    
+    def load_position(self, position: Position):
+        """Pozisyonu tahtaya yükle"""
+        for point, value in zip(self.points, position.points):
+            if value > 0:
+                point.count = value
+                point.owner = Player.WHITE
+            elif value < 0:
+                point.count = -value
+                point.owner = Player.BLACK
+            else:
+                point.count = 0
+                point.owner = None
+    
     def get_piece_count(self, point_index: int, player: Player) -> int:
         """Belirtilen hanedeki oyuncu pullarının sayısını döndürür"""
         point = self.points[point_index]
@@ -167,13 +169,11 @@ class Board:
     
     def get_bar_count(self, player: Player) -> int:
         """Bar'daki pul sayısını döndürür"""
-        bar_index = 24 if player == Player.WHITE else 25
-        return self.get_piece_count(bar_index, player)
+        return self.get_piece_count(rules.BAR_INDEX[rules.color_of(player)], player)
     
     def get_home_count(self, player: Player) -> int:
         """Evdeki (toplanan) pul sayısını döndürür"""
-        home_index = 26 if player == Player.WHITE else 27
-        return self.get_piece_count(home_index, player)
+        return self.get_piece_count(rules.HOME_INDEX[rules.color_of(player)], player)
     
     def has_pieces_in_bar(self, player: Player) -> bool:
         """Bar'da pul var mı?"""
@@ -181,34 +181,11 @@ class Board:
     
     def can_bear_off(self, player: Player) -> bool:
         """Pul toplayabilir mi?"""
-        if self.has_pieces_in_bar(player):
-            return False
-        
-        # Ev bölgesindeki haneleri kontrol et
-        home_range = range(18, 24) if player == Player.WHITE else range(0, 6)
-        total_pieces = 0
-        
-        for i in range(24):
-            if self.has_pieces_on_point(i, player):
-                if i not in home_range:
-                    return False
-                total_pieces += self.get_piece_count(i, player)
-        
-        # Evde toplanan pulları da say
-        total_pieces += self.get_home_count(player)
-        return total_pieces == 15
+        return rules.can_bear_off(self.to_position(player), rules.color_of(player))
     
     def get_highest_piece_in_home(self, player: Player) -> int:
         """Ev bölgesindeki en yüksek pulu döndürür"""
-        if player == Player.WHITE:
-            for i in range(23, 17, -1):  # 23'ten 18'e
-                if self.has_pieces_on_point(i, player):
-                    return i
-        else:
-            for i in range(0, 6):  # 0'dan 5'e
-                if self.has_pieces_on_point(i, player):
-                    return i
-        return -1
+        return rules.highest_piece_in_home(self.to_position(player), rules.color_of(player))
     
     def is_point_available(self, point_index: int, player: Player) -> bool:
         """Hane oyuncu için uygun mu?"""
@@ -220,36 +197,12 @@ class Board:
     
     def move_piece(self, from_point: int, to_point: int, player: Player) -> bool:
         """Pul hamlesini gerçekleştir"""
-        # From point'ten pul al
-        if from_point == -2:  # Bar'dan
-            bar_index = 24 if player == Player.WHITE else 25
-            if not self.has_pieces_in_bar(player):
-                return False
-            if not self.points[bar_index].remove_piece():
-                return False
-        else:  # Normal haneden
-            if not self.has_pieces_on_point(from_point, player):
-                return False
-            if not self.points[from_point].remove_piece():
-                return False
-        
-        # To point'e pul koy
-        if to_point == -1:  # Toplama
-            home_index = 26 if player == Player.WHITE else 27
-            self.points[home_index].add_piece(player)
-        else:  # Normal hane
-            target_point = self.points[to_point]
-            
-            # Rakip pul varsa vur
-            if target_point.owner and target_point.owner != player and target_point.is_vulnerable():
-                opponent = target_point.owner
-                opponent_bar = 24 if opponent == Player.WHITE else 25
-                target_point.hit_piece()
-                self.points[opponent_bar].add_piece(opponent)
-            
-            # Kendi pulunu koy
-            target_point.add_piece(player)
+        try:
+            position = rules.apply(self.to_position(player), Move(from_point, to_point, 0))
+        except ValueError:
+            return False
         
+        self.load_position(position)
         return True
 
 
@@ -266,12 +219,12 @@ class TavlaGame:
         self.move_count = 0
         self.stats = GameStats()
     
-    def roll_dice(self) -> Tuple[int, int]:
-        """Zar at"""
+    def roll_dice(self, dice: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+        """Zar at (dice verilirse o zarlar kullanılır, örn. kayıttan tekrar oynatma)"""
         if self.game_state != GameState.WAITING_DICE:
             return self.dice_values
         
-        self.dice_values = [random.randint(1, 6), random.randint(1, 6)]
+        self.dice_values = list(dice) if dice else [random.randint(1, 6), random.randint(1, 6)]
         
         # Çift gelirse 4 hamle
         if self.dice_values[0] == self.dice_values[1]:
@@ -282,73 +235,13 @@ class TavlaGame:
         self.game_state = GameState.SELECTING_PIECE
         return tuple(self.dice_values)
     
+    def get_position(self) -> Position:
+        """Mevcut durumun değiştirilemez anlık görüntüsü"""
+        return self.board.to_position(self.current_player)
+    
     def get_valid_moves(self, from_point: int = None) -> List[Move]:
         """Geçerli hamleleri döndürür"""
-        moves = []
-        
-        # Eğer bar'da pul varsa sadece giriş hamleleri
-        if self.board.has_pieces_in_bar(self.current_player):
-            return self._get_bar_entry_moves()
-        
-        # Belirli bir haneden hamleler
-        if from_point is not None:
-            return self._get_moves_from_point(from_point)
-        
-        # Tüm geçerli hamleler
-        for point in range(24):
-            if self.board.has_pieces_on_point(point, self.current_player):
-                moves.extend(self._get_moves_from_point(point))
-        
-        return moves
-    
-    def _get_bar_entry_moves(self) -> List[Move]:
-        """Bar'dan giriş hamleleri"""
-        moves = []
-        unique_dice = sorted(list(set(self.moves_left)), reverse=True)
-        
-        for dice_val in unique_dice:
-            if self.current_player == Player.WHITE:
-                entry_point = dice_val - 1
-            else:
-                entry_point = 24 - dice_val
-            
-            if self.board.is_point_available(entry_point, self.current_player):
-                moves.append(Move(-2, entry_point, dice_val))
-        
-        return moves
-    
-    def _get_moves_from_point(self, from_point: int) -> List[Move]:
-        """Belirli bir haneden geçerli hamleler"""
-        moves = []
-        
-        if not self.board.has_pieces_on_point(from_point, self.current_player):
-            return moves
-        
-        unique_dice = sorted(list(set(self.moves_left)), reverse=True)
-        
-        for dice_val in unique_dice:
-            # Normal hamle
-            if self.current_player == Player.WHITE:
-                to_point = from_point + dice_val
-            else:
-                to_point = from_point - dice_val
-            
-            # Tahtada kalır mı?
-            if 0 <= to_point <= 23:
-                if self.board.is_point_available(to_point, self.current_player):
-                    moves.append(Move(from_point, to_point, dice_val))
-            
-            # Pul toplama kontrolü
-            elif self.board.can_bear_off(self.current_player):
-                # Tam çıkış
-                if ((self.current_player == Player.WHITE and to_point == 24) or
-                    (self.current_player == Player.BLACK and to_point == -1)):
-                    moves.append(Move(from_point, -1, dice_val))
-                # Aşırı çıkış (en yüksek puldan)
-                elif from_point == self.board.get_highest_piece_in_home(self.current_player):
-                    moves.append(Move(from_point, -1, dice_val))
-        
-        return moves
+        return rules.legal_moves(self.get_position(), self.moves_left, from_point)
     
     def make_move(self, move: Move) -> bool:
         """Hamleyi gerçekleştir - ARTIK OTOMATİK END_TURN YOK"""
@@ -356,22 +249,22 @@ class TavlaGame:
             return False
         
         # Hamleyi kontrol et
-        valid_moves = self.get_valid_moves(move.from_point if move.from_point >= 0 else None)
+        position = self.get_position()
+        valid_moves = rules.legal_moves(position, self.moves_left,
+                                        move.from_point if move.from_point >= 0 else None)
         if move not in valid_moves:
             return False
         
         # Hamleyi yap
-        if self.board.move_piece(move.from_point, move.to_point, self.current_player):
-            self.moves_left.remove(move.dice_value)
-            self.move_count += 1
-            self._check_winner()
-            
-            # Otomatik tur sonu kontrolü KALDIRILDI
-            # Artık sadece hamleyi yapar, tur yönetimi main.py'da
-            
-            return True
+        self.board.load_position(rules.apply(position, move))
+        self.moves_left.remove(move.dice_value)
+        self.move_count += 1
+        self._check_winner()
         
-        return False
+        # Otomatik tur sonu kontrolü KALDIRILDI
+        # Artık sadece hamleyi yapar, tur yönetimi main.py'da
+        
+        return True
     
     def should_end_turn(self) -> bool:
         """Tur bitirmeli mi?"""
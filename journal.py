@@ -0,0 +1,332 @@
+"""
+Oyun kaydı (journal) - oda olaylarını diske yalnızca ekleyerek yazan kayıt defteri
+
+Her oda olayı (başlangıç, zar, hamle, tur geçişi, sonuç) append() ile
+bir kuyruğa bırakılır; olay işleyicileri diske hiç dokunmaz. Arka plandaki
+yazıcı thread'i kuyrukta biriken kayıtları toplu olarak segment dosyasına
+yazar ve fsync'i gruplar (en fazla FSYNC_INTERVAL aralıkla bir kez).
+
+Dosya düzeni (dizin başına tek yazıcı):
+    segment-000001.log   Kayıt çerçeveleri; SEGMENT_SIZE dolunca yenisine geçilir
+    index.log            Her oyunun ilk kaydının yeri: "game_id<TAB>segment<TAB>offset"
+    checkpoints.log      Tamamlanan kontrol noktalarının başlangıç yerleri
+
+Kontrol noktası: 'checkpoint' kaydı, ardından sürmekte olan her oyunun
+'snapshot' kaydı ve 'checkpoint_end'. Kurtarma (recover) son tamamlanmış
+kontrol noktasından itibaren okur; böylece tekrar oynatılacak kayıt
+SNAPSHOT_INTERVAL ile sınırlı kalır.
+
+Çerçeve: <uzunluk:u32><crc32:u32><yük>; yük boşluksuz (kompakt) JSON
+[zaman_ms, game_id, tür, veri, seq]. seq, kaydın ardından yayınlanan
+durumun sıra numarasıdır (oda dışı kayıtlarda yoktur); kurtarılan oda
+sıra numarasına önceki çalışmanın kaldığı yerden devam eder. Yarım
+yazılmış son çerçeve (çökme) CRC ile tespit edilir ve okuma orada durur.
+Her açılışta yeni segment başlatılır.
+
+Kullanım:
+    python journal.py journal/            # Segmentlerin özeti
+    python journal.py journal/ 3FA2C1D0   # Bir oyunun tüm kayıtları
+"""
+import atexit
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from metrics import MetricsRegistry
+
+JOURNAL_DIR = os.environ.get('TAVLA_JOURNAL', 'journal')  # Boş bırakılırsa kayıt kapalı
+SEGMENT_SIZE = 16 * 1024 * 1024  # Segment dosyasının en büyük boyutu (bayt)
+FSYNC_INTERVAL = 0.2             # İki fsync arasındaki en kısa süre (sn)
+WRITE_BATCH = 1024               # Yazıcının tek seferde kuyruktan aldığı en fazla kayıt
+SNAPSHOT_INTERVAL = 30.0         # Kontrol noktaları arası süre (sn)
+
+INDEX_FILE = 'index.log'
+CHECKPOINT_FILE = 'checkpoints.log'
+START = 'start'  # İndekslenen (oyunun ilk) kayıt türü
+SNAPSHOT = 'snapshot'
+CHECKPOINT = 'checkpoint'
+CHECKPOINT_END = 'checkpoint_end'
+CHECKPOINT_ID = '*'  # Kontrol noktası kayıtlarının game_id'si
+FINAL_KINDS = ('end', 'close')  # Oyunu kapatan kayıtlar
+
+_HEADER = struct.Struct('<II')
+
+
+@dataclass
+class JournalRecord:
+    timestamp: float
+    game_id: str
+    kind: str  # start, dice, move, play, turn, end, close, snapshot, checkpoint(_end)
+    data: Any
+    seq: Optional[int] = None  # Kayıttan sonra yayınlanan durumun sıra numarası
+
+
+def encode_record(timestamp: float, game_id: str, kind: str, data: Any,
+                  seq: Optional[int] = None) -> bytes:
+    """Kaydı çerçeveye çevir"""
+    fields = [int(timestamp * 1000), game_id, kind, data]
+    if seq is not None:
+        fields.append(seq)
+    payload = json.dumps(fields, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def segment_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f'segment-{number:06d}.log')
+
+
+def segment_numbers(directory: str) -> List[int]:
+    """Dizindeki segmentlerin numaraları (sıralı)"""
+    if not os.path.isdir(directory):
+        return []
+    numbers = []
+    for name in os.listdir(directory):
+        if name.startswith('segment-') and name.endswith('.log'):
+            try:
+                numbers.append(int(name[8:-4]))
+            except ValueError:
+                pass
+    return sorted(numbers)
+
+
+def read_segment(path: str, offset: int = 0) -> Iterator[Tuple[int, JournalRecord]]:
+    """Segmentteki (offset, kayıt) çiftleri; bozuk/yarım çerçevede durur"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return
+            length, crc = _HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            timestamp, game_id, kind, data, *seq = json.loads(payload)
+            yield offset, JournalRecord(timestamp / 1000, game_id, kind, data,
+                                        seq[0] if seq else None)
+            offset += _HEADER.size + length
+
+
+def iter_records(directory: str, start: Tuple[int, int] = (0, 0)) -> Iterator[JournalRecord]:
+    """Tüm kayıtlar yazılma sırasıyla; start=(segment, offset) konumundan başlar"""
+    first_segment, first_offset = start
+    for number in segment_numbers(directory):
+        if number < first_segment:
+            continue
+        offset = first_offset if number == first_segment else 0
+        for _, record in read_segment(segment_path(directory, number), offset):
+            yield record
+
+
+def load_index(directory: str) -> Dict[str, Tuple[int, int]]:
+    """game_id -> (segment, offset) (oyunun ilk kaydı)"""
+    index: Dict[str, Tuple[int, int]] = {}
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        return index
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) == 3:  # Yarım yazılmış son satır atlanır
+                index[parts[0]] = (int(parts[1]), int(parts[2]))
+    return index
+
+
+def read_game(directory: str, game_id: str,
+              index: Optional[Dict[str, Tuple[int, int]]] = None) -> List[JournalRecord]:
+    """Bir oyunun kayıtları (indeksteki konumdan oyun bitene kadar)"""
+    if index is None:
+        index = load_index(directory)
+    start = index.get(game_id)
+    if start is None:
+        return []
+
+    records = []
+    for record in iter_records(directory, start):
+        if record.game_id != game_id:
+            continue
+        if record.kind == START and records:
+            break  # Aynı kimlikle sonraki oyun
+        records.append(record)
+        if record.kind in FINAL_KINDS:
+            break
+    return records
+
+
+def last_checkpoint(directory: str) -> Optional[Tuple[int, int]]:
+    """Son tamamlanmış kontrol noktasının (segment, offset) yeri"""
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    position = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) == 2:
+                position = (int(parts[0]), int(parts[1]))
+    return position
+
+
+def recover(directory: str) -> Dict[str, List[JournalRecord]]:
+    """Bitmemiş oyunlar: game_id -> [temel kayıt (start/snapshot), sonraki kayıtlar...]
+
+    Son kontrol noktasından okunur; kontrol noktasından önce başlayan her
+    oyunun orada bir snapshot kaydı vardır. Bir oyunun snapshot'ından önceki
+    kayıtları zaten snapshot'ın içindedir ve atlanır.
+    """
+    games: Dict[str, List[JournalRecord]] = {}
+    for record in iter_records(directory, last_checkpoint(directory) or (0, 0)):
+        if record.game_id == CHECKPOINT_ID:
+            continue
+        if record.kind in (START, SNAPSHOT):
+            games[record.game_id] = [record]
+        elif record.kind in FINAL_KINDS:
+            games.pop(record.game_id, None)
+        elif record.game_id in games:
+            games[record.game_id].append(record)
+    return games
+
+
+class Journal:
+    """Arka plan thread'i ile yazan, yalnızca eklenen oyun kaydı"""
+
+    def __init__(self, directory: str = JOURNAL_DIR, segment_size: int = SEGMENT_SIZE,
+                 fsync_interval: float = FSYNC_INTERVAL,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync_interval = fsync_interval
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        numbers = segment_numbers(directory)
+        self._segment = numbers[-1] if numbers else 0
+        self._file = None
+        self._index = open(os.path.join(directory, INDEX_FILE), 'a', encoding='utf-8')
+        self._checkpoints = open(os.path.join(directory, CHECKPOINT_FILE), 'a', encoding='utf-8')
+        self._checkpoint_start: Optional[Tuple[int, int]] = None
+
+        metrics = metrics or MetricsRegistry()
+        self.records_written = metrics.counter('tavla_journal_records_total', 'Diske yazılan kayıt sayısı')
+        self.bytes_written = metrics.counter('tavla_journal_bytes_total', 'Diske yazılan bayt')
+        self.fsyncs = metrics.counter('tavla_journal_fsyncs_total', 'fsync çağrıları')
+        metrics.gauge('tavla_journal_queue_depth', 'Yazılmayı bekleyen kayıtlar', fn=self._queue.qsize)
+
+        self._thread = threading.Thread(target=self._run, name='tavla-journal', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, game_id: str, kind: str, data: Any = None, seq: Optional[int] = None):
+        """Kaydı yazılmak üzere sıraya al (bloklamaz, disk erişimi yok)"""
+        if not self._closed:
+            self._queue.put((time.time(), game_id, kind, data, seq))
+
+    def close(self):
+        """Kuyruktakileri yazıp dosyaları kapat"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    # --- Yazıcı thread'i ---
+
+    def _open_next_segment(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+        self._segment += 1
+        self._file = open(segment_path(self.directory, self._segment), 'ab')
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        for f in (self._index, self._checkpoints):
+            f.flush()
+            os.fsync(f.fileno())
+        self.fsyncs.inc()
+
+    def _write(self, batch: List[tuple]):
+        for timestamp, game_id, kind, data, seq in batch:
+            frame = encode_record(timestamp, game_id, kind, data, seq)
+            if self._file is None or self._file.tell() >= self.segment_size:
+                self._open_next_segment()
+            if kind == START:
+                self._index.write(f'{game_id}\t{self._segment}\t{self._file.tell()}\n')
+            elif kind == CHECKPOINT:
+                self._checkpoint_start = (self._segment, self._file.tell())
+            elif kind == CHECKPOINT_END and self._checkpoint_start is not None:
+                # Kontrol noktası ancak tüm snapshot'lar yazılınca geçerli olur
+                self._checkpoints.write('%d\t%d\n' % self._checkpoint_start)
+                self._checkpoint_start = None
+            self._file.write(frame)
+            self.bytes_written.inc(amount=len(frame))
+        self.records_written.inc(amount=len(batch))
+
+    def _run(self):
+        dirty = False
+        last_sync = 0.0
+        running = True
+        while running:
+            try:
+                item = self._queue.get(timeout=self.fsync_interval if dirty else None)
+            except queue.Empty:
+                item = ()  # Boşta: bekleyen yazımları diske indir
+
+            # Biriken kayıtları tek seferde yaz (grup halinde fsync)
+            batch = [item] if item else []
+            while item is not None and len(batch) < WRITE_BATCH:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    batch.append(item)
+            if item is None:
+                running = False
+
+            try:
+                if batch:
+                    self._write(batch)
+                    dirty = True
+                now = time.monotonic()
+                if dirty and (not running or not batch or now - last_sync >= self.fsync_interval):
+                    self._sync()
+                    dirty = False
+                    last_sync = now
+            except OSError as e:
+                print(f"❌ Oyun kaydı yazılamadı: {e}")
+
+        if self._file is not None:
+            self._file.close()
+        self._index.close()
+        self._checkpoints.close()
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else JOURNAL_DIR
+    if len(sys.argv) > 2:
+        for record in read_game(directory, sys.argv[2]):
+            stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.timestamp))
+            print(f"{stamp} {record.kind:<6} {json.dumps(record.data, ensure_ascii=False)}")
+        return
+
+    counts: Dict[str, int] = {}
+    for record in iter_records(directory):
+        counts[record.kind] = counts.get(record.kind, 0) + 1
+    print(f"📁 {directory}: {len(segment_numbers(directory))} segment, "
+          f"{len(load_index(directory))} oyun")
+    for kind, count in sorted(counts.items()):
+        print(f"   {kind:<6} {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+"""
+Tavla yük testi - binlerce simüle edilmiş Socket.IO istemcisi ile sunucuyu ölçmek için
+
+Her bot tek bir asyncio görevidir ve tam protokolü oynar:
+connect -> find_game -> ready -> roll_dice -> make_move (GreedyAI ile)
+Oyun bitince bağlantıyı kapatıp yeni bağlantıyla tekrar oyun arar. Süre
+dolunca olay gecikmeleri (p50/p99), iş hacmi ve hata oranları raporlanır.
+
+Gecikme: botun gönderdiği olay ile sunucunun o bota ait yanıtı arasındaki
+süre (roll_dice -> dice_rolled, make_move -> move_made, submit_play ->
+play_made, find_game -> joined_room).
+
+Kullanım:
+    python load_test.py --clients 1000 --duration 60
+    python load_test.py --url http://localhost:5000 --clients 200 --binary --batch
+
+Kurulum:
+    pip install "python-socketio[asyncio_client]" aiohttp
+"""
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+try:
+    import socketio
+except ImportError as e:
+    print(f"❌ Eksik modül: {e}")
+    print("Lütfen şu komutu çalıştırın:")
+    print('pip install "python-socketio[asyncio_client]" aiohttp')
+    sys.exit(1)
+
+import rules
+from ai_player import GreedyAI
+from game_logic import TavlaGame, GameState, Move, Player, Position
+from state_delta import apply_delta
+from wire_format import WIRE_BINARY, decode_payload
+
+GAME_TIMEOUT = 300.0  # Tek oyun için en uzun süre (sn); aşılırsa oyun terk edilir
+
+# Gönderilen olay -> botun beklediği yanıt
+RESPONSES = {
+    'find_game': 'joined_room',
+    'roll_dice': 'dice_rolled',
+    'make_move': 'move_made',
+    'submit_play': 'play_made',
+}
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Sıralı olmayan listeden yüzdelik (en yakın sıra yöntemi)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+@dataclass
+class LoadStats:
+    """Tüm botların ortak sayaçları (tek event loop, kilit gerekmez)"""
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    sent: int = 0
+    received: int = 0
+    errors: int = 0
+    error_messages: Dict[str, int] = field(default_factory=dict)
+    connect_failures: int = 0
+    games_started: int = 0
+    games_finished: int = 0
+    games_abandoned: int = 0   # Rakip ayrıldı
+    games_unfinished: int = 0  # Süre dolduğunda sürüyordu
+    resyncs: int = 0
+    throttled: int = 0  # Hız sınırına takılıp yeniden denenen olaylar
+
+    def record(self, event: str, seconds: float):
+        self.latencies.setdefault(event, []).append(seconds)
+
+    def error(self, message: str):
+        self.errors += 1
+        self.error_messages[message] = self.error_messages.get(message, 0) + 1
+
+    def report(self, elapsed: float) -> str:
+        lines = [
+            f"⏱️ Süre: {elapsed:.1f} sn",
+            f"🎮 Oyun: {self.games_started} başladı, {self.games_finished} bitti, "
+            f"{self.games_abandoned} terk edildi, {self.games_unfinished} yarım kaldı "
+            f"({self.games_finished / elapsed:.2f} oyun/sn)",
+            f"📤 Gönderilen olay: {self.sent} ({self.sent / elapsed:.1f}/sn)",
+            f"📥 Alınan olay: {self.received} ({self.received / elapsed:.1f}/sn)",
+            f"❌ Hata: {self.errors} ({self.errors / max(1, self.sent):.2%} gönderimlerin), "
+            f"bağlantı hatası: {self.connect_failures}, resync: {self.resyncs}, "
+            f"hız sınırı: {self.throttled}",
+            "",
+            f"{'olay':<14}{'adet':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+        ]
+        for event, values in sorted(self.latencies.items()):
+            lines.append(
+                f"{event:<14}{len(values):>8}"
+                f"{percentile(values, 50) * 1000:>10.2f}"
+                f"{percentile(values, 99) * 1000:>10.2f}"
+                f"{max(values) * 1000:>10.2f}"
+            )
+        for message, count in sorted(self.error_messages.items(), key=lambda item: -item[1]):
+            lines.append(f"   {count:>6} x {message}")
+        return "\n".join(lines)
+
+
+def load_game(state: dict) -> TavlaGame:
+    """Sunucu durumundan (GameBackend.serialize) hamle seçimi için yerel oyun"""
+    points = []
+    for point in state['board']:
+        sign = -1 if point['owner'] == 'siyah' else 1
+        points.append(point['count'] * sign)
+
+    player = Player(state['current_player'])
+    game = TavlaGame()
+    game.board.load_position(Position(tuple(points), rules.color_of(player)))
+    game.current_player = player
+    game.moves_left = list(state['moves_left'])
+    game.game_state = GameState(state['game_state'])
+    return game
+
+
+class BotClient:
+    """Protokolü baştan sona oynayan başsız istemci"""
+
+    def __init__(self, index: int, url: str, stats: LoadStats,
+                 binary: bool = False, batch: bool = False):
+        self.index = index
+        self.url = url
+        self.stats = stats
+        self.binary = binary
+        self.batch = batch  # Turu tek submit_play mesajıyla gönder
+        self.strategy = GreedyAI()
+        self.games = 0
+        self.sio = None
+
+    def _reset(self):
+        self.username = f"bot_{self.index}_{self.games}"
+        self.color: Optional[str] = None
+        self.state: Optional[dict] = None
+        self.seq: Optional[int] = None
+        self.pending: Dict[str, float] = {}  # Beklenen yanıt -> gönderim zamanı
+        self.last_sent: Dict[str, Optional[dict]] = {}  # Olay -> son gönderilen veri (yeniden deneme)
+        self.done = asyncio.Event()
+
+    async def run(self, deadline: float):
+        """Süre dolana kadar art arda oyun oyna"""
+        while time.monotonic() < deadline:
+            self._reset()
+            sio = self.sio = socketio.AsyncClient(reconnection=False)
+            self._bind(sio)
+            try:
+                await sio.connect(self.url, transports=['websocket'])
+            except Exception:
+                self.stats.connect_failures += 1
+                await asyncio.sleep(1.0)
+                continue
+
+            try:
+                if self.binary:
+                    await self._send(sio, 'set_wire_format', {'format': WIRE_BINARY})
+                await self._send(sio, 'find_game', {'username': self.username})
+                timeout = min(GAME_TIMEOUT, max(0.0, deadline - time.monotonic()))
+                await asyncio.wait_for(self.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                if self.color is not None:
+                    self.stats.games_unfinished += 1
+            finally:
+                self.games += 1
+                await sio.disconnect()
+
+    async def _send(self, sio, event: str, data=None):
+        response = RESPONSES.get(event)
+        if response is not None:
+            self.pending[response] = time.perf_counter()
+        self.last_sent[event] = data
+        self.stats.sent += 1
+        try:
+            if data is None:
+                await sio.emit(event)
+            else:
+                await sio.emit(event, data)
+        except socketio.exceptions.BadNamespaceError:
+            pass  # Bağlantı bu arada kapandı (süre doldu)
+
+    def _answered(self, event: str, data: dict):
+        """Bota ait yanıtsa gecikmeyi kaydet"""
+        if data.get('player', self.username) != self.username:
+            return
+        sent_at = self.pending.pop(event, None)
+        if sent_at is not None:
+            self.stats.record(event, time.perf_counter() - sent_at)
+
+    def _bind(self, sio):
+        @sio.on('*')
+        async def on_event(event, data=None):
+            if sio is not self.sio or not sio.connected:
+                return  # Önceki oyunun bağlantısından geciken olay
+            self.stats.received += 1
+            if isinstance(data, dict):
+                data = decode_payload(data)
+                self._answered(event, data)
+            await self._handle(sio, event, data)
+
+    async def _handle(self, sio, event: str, data):
+        if event == 'joined_room':
+            await self._send(sio, 'ready')
+
+        elif event == 'game_started':
+            self.stats.games_started += 1
+            for player in data['players']:
+                if player['username'] == self.username:
+                    self.color = player['color']
+            self._sync(data['game_state'], data['seq'])
+            await self._act(sio)
+
+        elif event in ('dice_rolled', 'move_made', 'play_made', 'turn_changed'):
+            delta = data['state_delta']
+            if self.seq is None or delta['seq'] != self.seq + 1:
+                if self.seq is None or delta['seq'] > self.seq:
+                    # Fark kaçırıldı; tam durum iste
+                    self.stats.resyncs += 1
+                    await self._send(sio, 'resync')
+                return
+            self._sync(apply_delta(self.state, delta), delta['seq'])
+            await self._act(sio)
+
+        elif event == 'state_snapshot':
+            self._sync(data['game_state'], data['seq'])
+            await self._act(sio)
+
+        elif event == 'game_over':
+            self.stats.games_finished += 1
+            self.done.set()
+
+        elif event in ('opponent_disconnected', 'player_left'):
+            if self.color is not None and not self.done.is_set():
+                self.stats.games_abandoned += 1
+                self.done.set()
+
+        elif event == 'rate_limited':
+            # Olay işlenmedi; beklenen yanıt gelmeyecek, bekleyip aynı olayı tekrar gönder
+            self.stats.throttled += 1
+            retry = data.get('event')
+            if retry in self.last_sent:
+                asyncio.ensure_future(self._retry(sio, retry, data.get('retry_after', 0.25)))
+
+        elif event == 'error':
+            self.stats.error(data.get('message', '?') if isinstance(data, dict) else str(data))
+            # Beklenen yanıt gelmeyecek; durumu yeniden alıp devam et
+            self.pending.clear()
+            if self.state is not None:
+                await self._send(sio, 'resync')
+
+    async def _retry(self, sio, event: str, delay: float):
+        await asyncio.sleep(delay)
+        if sio is self.sio and sio.connected and not self.done.is_set():
+            await self._send(sio, event, self.last_sent[event])
+
+    def _sync(self, state: dict, seq: int):
+        self.state = state
+        self.seq = seq
+
+    async def _act(self, sio):
+        """Sıra bottaysa zar at veya hamle yap"""
+        state = self.state
+        if state is None or state['current_player'] != self.color or state['winner']:
+            return
+        if self.pending:
+            return  # Önceki isteğin yanıtı bekleniyor
+
+        if state['game_state'] == GameState.WAITING_DICE.value:
+            await self._send(sio, 'roll_dice')
+            return
+
+        game = load_game(state)
+        if self.batch:
+            moves = self._plan_turn(game)
+            if moves:
+                await self._send(sio, 'submit_play', {'moves': [self._move_data(m) for m in moves]})
+            return
+
+        move = self.strategy.choose_move(game)
+        if move is not None:
+            await self._send(sio, 'make_move', self._move_data(move))
+
+    def _plan_turn(self, game: TavlaGame) -> List[Move]:
+        moves = []
+        while game.moves_left and game.winner is None:
+            move = self.strategy.choose_move(game)
+            if move is None or not game.make_move(move):
+                break
+            moves.append(move)
+        return moves
+
+    @staticmethod
+    def _move_data(move: Move) -> dict:
+        return {'from_point': move.from_point, 'to_point': move.to_point,
+                'dice_value': move.dice_value}
+
+
+async def run_load(url: str, clients: int, duration: float, ramp: float,
+                   binary: bool, batch: bool) -> LoadStats:
+    stats = LoadStats()
+    start = time.monotonic()
+    deadline = start + duration
+    bots = [BotClient(i, url, stats, binary, batch) for i in range(clients)]
+
+    async def start_bot(bot: BotClient, delay: float):
+        await asyncio.sleep(delay)
+        await bot.run(deadline)
+
+    tasks = [asyncio.create_task(start_bot(bot, ramp * i / clients)) for i, bot in enumerate(bots)]
+
+    # İlerleme raporu
+    while not all(task.done() for task in tasks):
+        await asyncio.sleep(min(5.0, max(0.1, deadline - time.monotonic())))
+        elapsed = time.monotonic() - start
+        print(f"… {elapsed:5.1f} sn: {stats.games_finished} oyun bitti, "
+              f"{stats.sent / elapsed:.0f} olay/sn, {stats.errors} hata")
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tavla sunucusu yük testi")
+    parser.add_argument('--url', default='http://localhost:5000', help='Sunucu adresi')
+    parser.add_argument('--clients', type=int, default=100, help='Eşzamanlı bot sayısı')
+    parser.add_argument('--duration', type=float, default=30.0, help='Test süresi (sn)')
+    parser.add_argument('--ramp', type=float, default=5.0,
+                        help='Botların bağlanmaya başlama süresi (sn); ani yükü önler')
+    parser.add_argument('--binary', action='store_true', help='İkili tel biçimi kullan')
+    parser.add_argument('--batch', action='store_true',
+                        help='Turu tek submit_play ile gönder (make_move yerine)')
+    args = parser.parse_args()
+
+    print(f"🚀 Yük testi: {args.clients} bot, {args.duration:.0f} sn -> {args.url}")
+    start = time.monotonic()
+    stats = asyncio.run(run_load(args.url, args.clients, args.duration, args.ramp,
+                                 args.binary, args.batch))
+    print()
+    print(stats.report(time.monotonic() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Lobi dizini - oda listesini her istekte taramak yerine oda değiştikçe güncellemek için
+
+Sunucu, oda oluşturma / oyuncu katılma-ayrılma / durum geçişi / izleyici
+değişikliği gibi olaylarda odanın özetini dizine yazar. Dizin durumlara
+göre ayrılmış, oluşturulma sırasını koruyan sözlükler tutar; sayfa
+istekleri sadece istenen dilimi okur.
+
+Her değişiklikte sürüm artar. Aynı sürüm için üretilen sayfa JSON metni
+önbellekte tutulur ve ETag ile sunulur; değişmeyen lobiyi yoklayan
+tarayıcılar 304 alır.
+"""
+import json
+import threading
+import time
+import uuid
+from itertools import islice
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+LOBBY_PAGE_SIZE = 50       # Varsayılan sayfa boyutu
+LOBBY_MAX_PAGE_SIZE = 200  # İstemcinin isteyebileceği en büyük sayfa
+LOBBY_PAGE_CACHE = 256     # Sürüm başına önbelleğe alınan en fazla sayfa
+STATS_TTL = 2.0            # /stats yanıtının önbellekte kalma süresi (sn)
+
+
+def parse_lobby_query(args: Mapping) -> Tuple[Optional[str], int, int]:
+    """İstek parametrelerinden (state, offset, limit); hatalı değerler varsayılana döner"""
+    state = args.get('state') or None
+
+    try:
+        offset = max(0, int(args.get('offset', 0)))
+    except (TypeError, ValueError):
+        offset = 0
+
+    try:
+        limit = int(args.get('limit', LOBBY_PAGE_SIZE))
+    except (TypeError, ValueError):
+        limit = LOBBY_PAGE_SIZE
+    limit = min(max(1, limit), LOBBY_MAX_PAGE_SIZE)
+
+    return state, offset, limit
+
+
+class LobbyIndex:
+    """Oda özetlerinin artımlı dizini (thread-safe)"""
+
+    def __init__(self):
+        self._rooms: Dict[str, dict] = {}  # room_id -> özet (oluşturulma sırası)
+        self._by_state: Dict[str, Dict[str, dict]] = {}
+        self._pages: Dict[Tuple, Tuple[str, str]] = {}  # Bu sürümün sayfa önbelleği
+        self._all: Optional[List[dict]] = None
+        self._lock = threading.Lock()
+        self._instance = uuid.uuid4().hex[:8]  # Yeniden başlatmada ETag'ler çakışmasın
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+        self._pages = {}
+        self._all = None
+
+    def _put(self, summary: dict) -> bool:
+        room_id = summary['room_id']
+        old = self._rooms.get(room_id)
+        if old == summary:
+            return False
+        if old is not None and old['state'] != summary['state']:
+            del self._by_state[old['state']][room_id]
+        self._rooms[room_id] = summary
+        self._by_state.setdefault(summary['state'], {})[room_id] = summary
+        return True
+
+    def _pop(self, room_id: str) -> bool:
+        old = self._rooms.pop(room_id, None)
+        if old is None:
+            return False
+        del self._by_state[old['state']][room_id]
+        return True
+
+    def update(self, summary: dict):
+        """Odanın özetini ekle veya güncelle"""
+        with self._lock:
+            if self._put(summary):
+                self._changed()
+
+    def remove(self, room_id: str):
+        with self._lock:
+            if self._pop(room_id):
+                self._changed()
+
+    def replace(self, summaries: List[dict]):
+        """Dizini verilen listeyle eşitle (küme ağ geçidi shard özetlerinden kurar)"""
+        with self._lock:
+            changed = False
+            seen = set()
+            for summary in summaries:
+                seen.add(summary['room_id'])
+                changed |= self._put(summary)
+            for room_id in [r for r in self._rooms if r not in seen]:
+                changed |= self._pop(room_id)
+            if changed:
+                self._changed()
+
+    def rooms(self) -> List[dict]:
+        """Tüm odalar (sürüm başına bir kez kopyalanır)"""
+        with self._lock:
+            if self._all is None:
+                self._all = list(self._rooms.values())
+            return self._all
+
+    def count(self, state: Optional[str] = None) -> int:
+        with self._lock:
+            if state is None:
+                return len(self._rooms)
+            return len(self._by_state.get(state, ()))
+
+    def _page(self, state: Optional[str], offset: int, limit: int) -> dict:
+        rooms = self._rooms if state is None else self._by_state.get(state, {})
+        return {
+            'rooms': list(islice(rooms.values(), offset, offset + limit)),
+            'total': len(rooms),
+            'offset': offset,
+            'limit': limit,
+            'state': state,
+            'version': self.version
+        }
+
+    def page(self, state: Optional[str] = None, offset: int = 0,
+             limit: int = LOBBY_PAGE_SIZE) -> dict:
+        """Durum filtresiyle bir sayfa oda"""
+        with self._lock:
+            return self._page(state, offset, limit)
+
+    def page_json(self, state: Optional[str] = None, offset: int = 0,
+                  limit: int = LOBBY_PAGE_SIZE) -> Tuple[str, str]:
+        """Sayfanın JSON metni ve ETag'i (aynı sürüm için önbellekten)"""
+        key = (state, offset, limit)
+        with self._lock:
+            cached = self._pages.get(key)
+            if cached is not None:
+                return cached
+            page = self._page(state, offset, limit)
+            version = self.version
+
+        body = json.dumps(page)
+        etag = f'"{self._instance}-{version}-{state or "all"}-{offset}-{limit}"'
+        with self._lock:
+            # Bu arada dizin değiştiyse önbelleğe yazma
+            if self.version == version and len(self._pages) < LOBBY_PAGE_CACHE:
+                self._pages[key] = (body, etag)
+        return body, etag
+
+
+class CachedJSON:
+    """Kısa süreli önbelleğe alınmış JSON yanıtı (örn. /stats)"""
+
+    def __init__(self, producer: Callable[[], dict], ttl: float = STATS_TTL):
+        self.producer = producer
+        self.ttl = ttl
+        self._value: Optional[Tuple[str, str]] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Tuple[str, str]:
+        """(JSON metni, ETag)"""
+        now = time.time()
+        with self._lock:
+            if self._value is not None and now < self._expires:
+                return self._value
+
+            body = json.dumps(self.producer())
+            self._value = (body, f'"{hash(body) & 0xffffffff:08x}"')
+            self._expires = now + self.ttl
+            return self._value
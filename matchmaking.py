@@ -0,0 +1,75 @@
+"""
+Eşleştirme kuyruğu - bekleyen odaları O(1) bulmak için
+
+Sunucular find_game isteğinde tüm odaları taramak yerine bu kuyruktan en
+eski bekleyen odayı alır. Kuyruklar "kova" (bucket) anahtarına göre ayrılır;
+varsayılan kova herkese açıktır, rating verilirse oyuncular puan aralığına
+göre ayrı kovalarda eşleştirilir.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+DEFAULT_BUCKET = 0
+MIN_RATING, MAX_RATING = 0, 3000  # İstemcinin bildirdiği rating bu aralığa çekilir
+
+
+class Matchmaker:
+    """Bekleyen odaların kova bazlı FIFO kuyruğu (thread-safe)"""
+
+    def __init__(self, rating_band: int = 200):
+        self.rating_band = rating_band
+        self._queues: Dict[Hashable, "OrderedDict[str, None]"] = {}
+        self._bucket_of: Dict[str, Hashable] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, rating: Optional[int] = None) -> Hashable:
+        """Rating'e göre kova anahtarı
+
+        Rating istemciden gelir: yoksa veya sayı değilse varsayılan kova,
+        aralık dışındaysa sınıra çekilir.
+        """
+        try:
+            rating = int(rating)
+        except (TypeError, ValueError, OverflowError):
+            return DEFAULT_BUCKET
+        rating = min(max(rating, MIN_RATING), MAX_RATING)
+        return ('rating', rating // self.rating_band)
+
+    def add(self, room_id: str, bucket: Hashable = DEFAULT_BUCKET):
+        """Odayı bekleyenler kuyruğunun sonuna ekle"""
+        with self._lock:
+            old_bucket = self._bucket_of.get(room_id)
+            if old_bucket is not None:
+                if old_bucket == bucket:
+                    return
+                self._queues[old_bucket].pop(room_id, None)
+            self._queues.setdefault(bucket, OrderedDict())[room_id] = None
+            self._bucket_of[room_id] = bucket
+
+    def discard(self, room_id: str):
+        """Odayı kuyruktan çıkar (yoksa bir şey yapmaz)"""
+        with self._lock:
+            bucket = self._bucket_of.pop(room_id, None)
+            if bucket is not None:
+                self._queues[bucket].pop(room_id, None)
+
+    def pop(self, bucket: Hashable = DEFAULT_BUCKET) -> Optional[str]:
+        """Kovadaki en eski bekleyen odayı al (yoksa None)"""
+        with self._lock:
+            queue = self._queues.get(bucket)
+            if not queue:
+                return None
+            room_id, _ = queue.popitem(last=False)
+            del self._bucket_of[room_id]
+            return room_id
+
+    def bucket_of(self, room_id: str) -> Optional[Hashable]:
+        """Odanın beklediği kova (kuyrukta değilse None)"""
+        return self._bucket_of.get(room_id)
+
+    def __contains__(self, room_id: str) -> bool:
+        return room_id in self._bucket_of
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
@@ -0,0 +1,57 @@
+"""
+Mesaj kuyruğu - ağ geçidi ile shard işlemleri arasında olay taşımak için
+
+Kanallar isimle ayrılır: her shard'ın gelen olayları "shard:<n>" kanalından,
+shard'ların gönderimleri (emit, oda katılımı, eşleştirme) "gateway"
+kanalından akar.
+
+Uygulama: ManagerMessageQueue - multiprocessing.Manager kuyrukları
+(işlemler arası). Başka bir taşıyıcı (ör. Redis) MessageQueue'dan türetilir.
+"""
+import queue
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Optional
+
+GATEWAY_CHANNEL = 'gateway'
+
+
+def shard_channel(shard_id: int) -> str:
+    """Shard'ın gelen olay kanalı"""
+    return f"shard:{shard_id}"
+
+
+def cluster_channels(shard_count: int) -> list:
+    """Kümedeki tüm kanallar"""
+    return [GATEWAY_CHANNEL] + [shard_channel(i) for i in range(shard_count)]
+
+
+class MessageQueue(ABC):
+    """Kanal bazlı mesaj kuyruğu"""
+
+    @abstractmethod
+    def put(self, channel: str, message: Any):
+        """Kanala mesaj gönder"""
+        pass
+
+    @abstractmethod
+    def get(self, channel: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """Kanaldan mesaj al (timeout dolarsa None; 0 beklemeden döner)"""
+        pass
+
+
+class ManagerMessageQueue(MessageQueue):
+    """multiprocessing.Manager kuyrukları; pickle edilip shard işlemlerine aktarılabilir"""
+
+    def __init__(self, manager, channels: Iterable[str]):
+        self._queues = {channel: manager.Queue() for channel in channels}
+
+    def put(self, channel: str, message: Any):
+        self._queues[channel].put(message)
+
+    def get(self, channel: str, timeout: Optional[float] = None) -> Optional[Any]:
+        try:
+            if timeout == 0:
+                return self._queues[channel].get_nowait()
+            return self._queues[channel].get(timeout=timeout)
+        except queue.Empty:
+            return None
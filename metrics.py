@@ -0,0 +1,226 @@
+"""
+Sunucu metrikleri - sayaçlar, göstergeler ve gecikme histogramları (Prometheus metin biçimi)
+
+Değerler sabit sayıda (STRIPES) kilitli şeride yazılır; şerit thread
+kimliğine göre seçilir, böylece eşzamanlı yazan thread'ler çoğunlukla
+farklı kilitleri alır. Flask-SocketIO threading modunda her olay yeni bir
+thread'de çalışır; şerit sayısı sabit olduğundan bellek thread sayısıyla
+büyümez. Toplama sadece /metrics okunurken yapılır.
+
+Anlık görüntüler (snapshot) düz sözlüklerdir; küme modunda shard'lar
+bunları oda özetleriyle birlikte yayınlar, ağ geçidi toplayıp sunar.
+
+Kullanım:
+    metrics = MetricsRegistry()
+    requests = metrics.counter('tavla_requests_total', 'İstek sayısı', ('event',))
+    requests.inc(('find_game',))
+    render([metrics.snapshot()])  # Prometheus metin biçimi
+"""
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Olay işleme süreleri için varsayılan kova sınırları (sn)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+STRIPES = 16  # Metrik başına kilit şeridi sayısı
+
+Labels = Tuple[str, ...]
+
+
+class _Stripes:
+    """Thread kimliğine göre seçilen, kilitli değer sözlükleri"""
+
+    def __init__(self, merge: Callable[[dict, dict], None]):
+        self._merge = merge
+        self._stripes = [({}, threading.Lock()) for _ in range(STRIPES)]
+
+    def stripe(self) -> Tuple[dict, threading.Lock]:
+        """Çağıran thread'in şeridi (değerler, kilit)"""
+        return self._stripes[threading.get_native_id() % STRIPES]
+
+    def collect(self) -> dict:
+        """Tüm şeritlerin toplamı"""
+        total: dict = {}
+        for values, lock in self._stripes:
+            with lock:
+                self._merge(total, values)
+        return total
+
+
+def _merge_values(total: dict, shard: dict):
+    for labels, value in shard.items():
+        total[labels] = total.get(labels, 0) + value
+
+
+def _merge_buckets(total: dict, shard: dict):
+    for labels, counts in shard.items():
+        current = total.get(labels)
+        if current is None:
+            total[labels] = list(counts)
+        else:
+            for i, count in enumerate(counts):
+                current[i] += count
+
+
+class Counter:
+    """Artan sayaç"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._stripes = _Stripes(_merge_values)
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        values, lock = self._stripes.stripe()
+        with lock:
+            values[labels] = values.get(labels, 0) + amount
+
+    def samples(self) -> dict:
+        return self._stripes.collect()
+
+
+class Gauge(Counter):
+    """Anlık değer; inc/dec ile veya okuma anında çağrılan fonksiyonla
+
+    fn verilirse {etiketler: değer} sözlüğü (veya tek değer) döndürmelidir.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 fn: Optional[Callable[[], object]] = None):
+        super().__init__(name, help_text, labelnames)
+        self.fn = fn
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def samples(self) -> dict:
+        if self.fn is None:
+            return super().samples()
+        value = self.fn()
+        return dict(value) if isinstance(value, dict) else {(): value}
+
+
+class Histogram:
+    """Kovalı dağılım (örn. olay işleme süresi)
+
+    Her etiket için [kova sayıları..., +Inf sayısı, toplam] tutulur.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._stripes = _Stripes(_merge_buckets)
+
+    def observe(self, value: float, labels: Labels = ()):
+        index = bisect_left(self.buckets, value)
+        values, lock = self._stripes.stripe()
+        with lock:
+            counts = values.get(labels)
+            if counts is None:
+                counts = values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self) -> dict:
+        return self._stripes.collect()
+
+
+class MetricsRegistry:
+    """Bir işlemin metrikleri"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+              fn: Optional[Callable[[], object]] = None) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames, fn))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def snapshot(self) -> dict:
+        """Tüm metriklerin anlık değerleri (pickle edilebilir)"""
+        snapshot = {}
+        for name, metric in self._metrics.items():
+            snapshot[name] = {
+                'kind': metric.kind,
+                'help': metric.help,
+                'labelnames': metric.labelnames,
+                'buckets': getattr(metric, 'buckets', None),
+                'samples': metric.samples()
+            }
+        return snapshot
+
+
+def merge_snapshots(snapshots: List[dict]) -> dict:
+    """Birden fazla işlemin anlık görüntülerini topla"""
+    merged: dict = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.get(name)
+            if target is None:
+                merged[name] = dict(family, samples={})
+                target = merged[name]
+            if family['kind'] == 'histogram':
+                _merge_buckets(target['samples'], family['samples'])
+            else:
+                _merge_values(target['samples'], family['samples'])
+    return merged
+
+
+def _format_labels(labelnames: Labels, labels: Labels, extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, labels)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshots: List[dict]) -> str:
+    """Anlık görüntüleri Prometheus metin biçimine çevir"""
+    lines = []
+    for name, family in sorted(merge_snapshots(snapshots).items()):
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        labelnames = family['labelnames']
+
+        for labels, value in sorted(family['samples'].items()):
+            if family['kind'] != 'histogram':
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+
+            # Kovalar Prometheus'ta kümülatiftir
+            cumulative = 0
+            bounds = list(family['buckets']) + ['+Inf']
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(value[-1])}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {cumulative}")
+
+    return '\n'.join(lines) + '\n'
@@ -11,6 +11,8 @@ from enum import Enum
 
 # Mevcut oyun modüllerini import et
 from game_logic import TavlaGame, Player, GameState, Move
+from state_delta import apply_delta
+from wire_format import WIRE_JSON, WIRE_BINARY, decode_payload
 from renderer import GameRenderer, Layout, Colors
 from user_interface import UIManager, InputHandler, NotificationManager
 
@@ -33,10 +35,15 @@ class MultiplayerClient:
         # Oyun verileri
         self.username = ""
         self.room_id = ""
+        self.player_id = None  # Sunucunun verdiği oturum anahtarı (resume için)
         self.player_color = None
         self.opponent_name = ""
         self.game_state_data = None
+        self.state_seq = None  # Sunucudan alınan son durumun sıra numarası
+        self.resync_pending = False
         self.is_my_turn = False
+        self.wire_format = WIRE_JSON
+        self.pending_play = []  # Turun sunucuya henüz işlenmemiş hamleleri (submit_play)
         
         # Socket event'lerini bağla
         self._setup_socket_events()
@@ -79,10 +86,28 @@ class MultiplayerClient:
         @self.socket.event
         def connected(data):
             print(f"Hoş geldiniz: {data['message']}")
+            
+            # Sunucu destekliyorsa durumları ikili biçimde al
+            if WIRE_BINARY in data.get('server_info', {}).get('wire_formats', []):
+                self.socket.emit('set_wire_format', {'format': WIRE_BINARY})
+            
+            # Oyun sırasında bağlantı koptuysa aynı oturuma geri dön
+            if self.player_id and self.game_state_data is not None:
+                self.socket.emit('resume', {
+                    'player_id': self.player_id,
+                    'room_id': self.room_id,
+                    'last_seq': self.state_seq
+                })
+                self.notification_manager.add_game_log("Oyuna geri dönülüyor...", "info")
+        
+        @self.socket.event
+        def wire_format_set(data):
+            self.wire_format = data['format']
         
         @self.socket.event
         def joined_room(data):
             self.room_id = data['room_id']
+            self.player_id = data.get('player_id')
             self.connection_state = ConnectionState.IN_ROOM
             player_count = data['player_count']
             
@@ -105,18 +130,12 @@ class MultiplayerClient:
         
         @self.socket.event
         def game_started(data):
+            data = decode_payload(data)
             self.connection_state = ConnectionState.PLAYING
-            players = data['players']
-            
-            # Kendi rengimi bul
-            for player_data in players:
-                if player_data['username'] == self.username:
-                    self.player_color = Player.WHITE if player_data['color'] == 'beyaz' else Player.BLACK
-                else:
-                    self.opponent_name = player_data['username']
+            self._set_players(data['players'])
             
             # Local game'i sync et
-            self._sync_game_state(data['game_state'])
+            self._sync_game_state(data['game_state'], data.get('seq'))
             
             color_text = "Beyaz" if self.player_color == Player.WHITE else "Siyah"
             self.notification_manager.add_game_log(f"Oyun başladı! Sen {color_text}sın", "success")
@@ -124,28 +143,60 @@ class MultiplayerClient:
         
         @self.socket.event
         def dice_rolled(data):
+            data = decode_payload(data)
             player = data['player']
             dice = data['dice']
             
-            self._sync_game_state(data['game_state'])
+            self._apply_state_delta(data['state_delta'])
             
             if player == self.username:
                 self.notification_manager.add_game_log(f"Sen zar attın: {dice[0]}-{dice[1]}", "dice")
             else:
                 self.notification_manager.add_game_log(f"{player} zar attı: {dice[0]}-{dice[1]}", "dice")
+            
+            self._log_turn_change(data)
         
         @self.socket.event
         def move_made(data):
+            data = decode_payload(data)
             player = data['player']
             move_data = data['move']
             
-            self._sync_game_state(data['game_state'])
+            self._apply_state_delta(data['state_delta'])
             
             move_str = f"P{move_data['from_point']+1} -> P{move_data['to_point']+1}"
             if player == self.username:
                 self.notification_manager.add_game_log(f"Sen: {move_str}", "player_move")
             else:
                 self.notification_manager.add_game_log(f"{player}: {move_str}", "ai_move")
+            
+            self._log_turn_change(data)
+        
+        @self.socket.event
+        def play_made(data):
+            data = decode_payload(data)
+            player = data['player']
+            
+            self._apply_state_delta(data['state_delta'])
+            
+            moves_str = ", ".join(f"P{m['from_point']+1} -> P{m['to_point']+1}" for m in data['moves'])
+            if player == self.username:
+                self.notification_manager.add_game_log(f"Sen: {moves_str}", "player_move")
+            else:
+                self.notification_manager.add_game_log(f"{player}: {moves_str}", "ai_move")
+            
+            self._log_turn_change(data)
+        
+        @self.socket.event
+        def turn_changed(data):
+            data = decode_payload(data)
+            self._apply_state_delta(data['state_delta'])
+            self._log_turn_change(data)
+        
+        @self.socket.event
+        def state_snapshot(data):
+            data = decode_payload(data)
+            self._sync_game_state(data['game_state'], data['seq'])
         
         @self.socket.event
         def game_over(data):
@@ -160,13 +211,78 @@ class MultiplayerClient:
         @self.socket.event
         def error(data):
             print(f"Hata: {data['message']}")
+            if self.pending_play:
+                # Gönderilen tur reddedildi; yerel hamleleri geri al
+                self.pending_play = []
+                self.socket.emit('resync')
             self.notification_manager.add_game_log(f"Hata: {data['message']}", "error")
         
+        @self.socket.event
+        def rate_limited(data):
+            # Sunucu olayı işlemeden düşürdü; gönderilen tur da kaybolmuş olabilir
+            if self.pending_play:
+                self.pending_play = []
+                self.socket.emit('resync')
+            self.notification_manager.add_game_log(data['message'], "warning")
+        
         @self.socket.event
         def opponent_disconnected(data):
             self.notification_manager.add_game_log(data['message'], "warning")
+        
+        @self.socket.event
+        def opponent_reconnected(data):
+            self.notification_manager.add_game_log(f"{data['username']} geri döndü", "info")
+        
+        @self.socket.event
+        def resumed(data):
+            data = decode_payload(data)
+            self.room_id = data['room_id']
+            self._set_players(data['players'])
+            
+            if 'game_state' in data:
+                self._sync_game_state(data['game_state'], data['seq'])
+            else:
+                # Sadece kopukken kaçırılan farklar gelir
+                for delta in data['state_deltas']:
+                    self._apply_state_delta(delta)
+                # Gönderilemeyen yerel hamleler sunucu durumuyla değişir
+                self._sync_game_state(self.game_state_data, self.state_seq)
+            
+            self.connection_state = (ConnectionState.PLAYING if data['room_state'] == 'playing'
+                                     else ConnectionState.IN_ROOM)
+            self.notification_manager.add_game_log("Oyuna geri dönüldü", "success")
+        
+        @self.socket.event
+        def resume_failed(data):
+            # Oyun bu arada kapandı; yeni oyun aranabilir
+            self.player_id = None
+            self.game_state_data = None
+            self.local_game = None
+            self.notification_manager.add_game_log(data['message'], "warning")
+    
+    def _set_players(self, players):
+        """Oyuncu listesinden kendi rengini ve rakibin adını bul"""
+        for player_data in players:
+            if player_data['username'] == self.username:
+                self.player_color = Player.WHITE if player_data['color'] == 'beyaz' else Player.BLACK
+            else:
+                self.opponent_name = player_data['username']
     
-    def _sync_game_state(self, game_state_data):
+    def _log_turn_change(self, data):
+        """Sunucu turu bitirdiyse (zar/hamle olayının içinde) bildir"""
+        next_player = data.get('next_player')
+        if next_player is None:
+            return
+        
+        if data.get('passed'):
+            self.notification_manager.add_game_log("Oynanabilecek hamle yok, pas", "warning")
+        
+        if next_player == self.username:
+            self.notification_manager.add_game_log("Sıra sende", "info")
+        else:
+            self.notification_manager.add_game_log(f"Sıra {next_player}'da", "info")
+    
+    def _sync_game_state(self, game_state_data, seq=None):
         """Sunucudan gelen game state'i local game ile sync et"""
         if not game_state_data:
             return
@@ -186,8 +302,9 @@ class MultiplayerClient:
         # Game state'ini sync et
         self.local_game.current_player = Player.WHITE if game_state_data['current_player'] == 'beyaz' else Player.BLACK
         self.local_game.game_state = GameState(game_state_data['game_state'])
-        self.local_game.dice_values = game_state_data['dice_values']
-        self.local_game.moves_left = game_state_data['moves_left']
+        # Kopyala: yerel hamleler sunucu durumunun önbellekteki listelerini değiştirmesin
+        self.local_game.dice_values = list(game_state_data['dice_values'])
+        self.local_game.moves_left = list(game_state_data['moves_left'])
         self.local_game.move_count = game_state_data['move_count']
         
         if game_state_data['winner']:
@@ -197,6 +314,22 @@ class MultiplayerClient:
         self.is_my_turn = (self.local_game.current_player == self.player_color)
         
         self.game_state_data = game_state_data
+        self.state_seq = seq
+        self.resync_pending = False
+        self.pending_play = []  # Sunucu durumu yerel hamlelerin yerine geçer
+    
+    def _apply_state_delta(self, delta):
+        """Sunucudan gelen durum farkını uygula; sıra atlandıysa tam durum iste"""
+        if self.state_seq is not None and delta['seq'] <= self.state_seq:
+            return  # Eski veya tekrar eden fark
+        
+        if self.game_state_data is None or self.state_seq is None or delta['seq'] != self.state_seq + 1:
+            if not self.resync_pending:
+                self.resync_pending = True
+                self.socket.emit('resync')
+            return
+        
+        self._sync_game_state(apply_delta(self.game_state_data, delta), delta['seq'])
     
     def connect_to_server(self, username: str):
         """Sunucuya bağlan"""
@@ -214,13 +347,16 @@ class MultiplayerClient:
             self.notification_manager.add_game_log(f"Bağlantı hatası: {e}", "error")
             return False
     
-    def find_game(self):
-        """Oyun ara"""
+    def find_game(self, ai_level: Optional[str] = None):
+        """Oyun ara (ai_level verilirse sunucudaki bota karşı)"""
         if self.connection_state != ConnectionState.CONNECTED:
             self.notification_manager.add_game_log("Önce sunucuya bağlanın!", "error")
             return
         
-        self.socket.emit('find_game', {'username': self.username})
+        request = {'username': self.username}
+        if ai_level:
+            request['ai_level'] = ai_level
+        self.socket.emit('find_game', request)
         self.notification_manager.add_game_log("Oyun aranıyor...", "info")
     
     def ready_up(self):
@@ -242,17 +378,30 @@ class MultiplayerClient:
         self.socket.emit('roll_dice')
     
     def make_move(self, move: Move):
-        """Hamle yap"""
+        """Hamle yap
+        
+        Hamleler önce yerel oyunda uygulanır; tur bitince hepsi tek
+        submit_play mesajıyla gönderilir (her pul için ayrı mesaj yerine).
+        """
         if (self.connection_state != ConnectionState.PLAYING or 
             not self.is_my_turn or 
             not self.local_game):
             return
         
-        self.socket.emit('make_move', {
-            'from_point': move.from_point,
-            'to_point': move.to_point,
-            'dice_value': move.dice_value
-        })
+        if not self.local_game.make_move(move):
+            return
+        
+        self.pending_play.append(move)
+        self.local_game.game_state = (GameState.GAME_OVER if self.local_game.winner
+                                      else GameState.SELECTING_PIECE)
+        
+        if self.local_game.winner or self.local_game.should_end_turn():
+            self.socket.emit('submit_play', {
+                'moves': [
+                    {'from_point': m.from_point, 'to_point': m.to_point, 'dice_value': m.dice_value}
+                    for m in self.pending_play
+                ]
+            })
     
     def handle_events(self):
         """Pygame event'lerini işle"""
@@ -272,6 +421,9 @@ class MultiplayerClient:
                 elif event.key == pygame.K_f:  # Find game
                     self.find_game()
                 
+                elif event.key == pygame.K_a:  # AI rakiple oyna
+                    self.find_game(ai_level='medium')
+                
                 elif event.key == pygame.K_r:  # Ready
                     self.ready_up()
                 
@@ -0,0 +1,95 @@
+"""
+Hız sınırı - bağlantı başına jeton kovası (token bucket)
+
+Her bağlantının her olay türü için ayrı bir kovası vardır. Kova saniyede
+`rate` jeton dolar, en fazla `burst` jeton tutar; her olay bir jeton
+harcar. Jeton kalmadıysa olay işlenmeden düşürülür. Böylece tek bir
+istemcinin olay seli (make_move, roll_dice, get_rooms...) oda doğrulaması
+ve durum yayını yapmadan elenir.
+
+Yanıtı beklenen olaylar (TURN_EVENTS) reddedildiğinde istemci her seferinde
+haberdar edilir; diğer olaylar için seri başına tek bildirim gönderilir.
+
+Kilitsizdir: aynı bağlantının eşzamanlı olayları en fazla birkaç jetonluk
+sapma yaratır.
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+# Olay -> (saniyede jeton, kova boyu)
+RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    'find_game': (1, 5),
+    'ready': (2, 5),
+    'roll_dice': (10, 20),
+    'make_move': (20, 40),
+    'submit_play': (10, 20),
+    'spectate': (2, 5),
+    'resync': (2, 5),
+    'resume': (1, 5),
+    'set_wire_format': (1, 5),
+    'get_rooms': (2, 10),
+}
+DEFAULT_LIMIT = (10, 20)  # Listede olmayan olaylar için
+
+# Yanıtı beklenen olaylar: her reddi istemciye bildirilir (retry_after ile),
+# yoksa sırasını bekleyen istemci düşen olayın yanıtını sonsuza dek bekler
+TURN_EVENTS = frozenset({'ready', 'roll_dice', 'make_move', 'submit_play', 'resync', 'resume'})
+
+
+class TokenBucket:
+    """Tek bir (bağlantı, olay) kovası"""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated', 'throttled')
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+        self.throttled = False  # Son olay düşürüldü mü (istemciye bir kez bildirilir)
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.throttled = False
+            return True
+        return False
+
+
+class RateLimiter:
+    """Bağlantı başına olay kovaları"""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.limits = RATE_LIMITS if limits is None else limits
+        self._buckets: Dict[str, Dict[str, TokenBucket]] = {}  # sid -> olay -> kova
+
+    def allow(self, sid: str, event: str, now: Optional[float] = None) -> Tuple[bool, bool]:
+        """(olay işlenebilir mi, bu ret seride ilk mi)"""
+        if now is None:
+            now = time.monotonic()
+
+        buckets = self._buckets.setdefault(sid, {})
+        bucket = buckets.get(event)
+        if bucket is None:
+            rate, burst = self.limits.get(event, DEFAULT_LIMIT)
+            bucket = buckets[event] = TokenBucket(rate, burst, now)
+
+        if bucket.take(now):
+            return True, False
+
+        first = not bucket.throttled
+        bucket.throttled = True
+        return False, first
+
+    def retry_after(self, sid: str, event: str) -> float:
+        """Olayın bir sonraki jetonuna kalan süre (sn)"""
+        bucket = self._buckets.get(sid, {}).get(event)
+        if bucket is None or bucket.tokens >= 1:
+            return 0.0
+        return (1 - bucket.tokens) / bucket.rate
+
+    def remove(self, sid: str):
+        """Bağlantı kapandı"""
+        self._buckets.pop(sid, None)
@@ -0,0 +1,69 @@
+"""
+Oda süre takibi - disconnect yolunda tarama yapmadan eski odaları temizlemek için
+
+Her oda için bir son kullanma zamanı tutulur ve zamanlar bir heap'te
+saklanır. Arka plan görevi periyodik olarak sadece süresi dolan kayıtları
+heap'ten alır; oda sayısından bağımsız olarak disconnect başına iş yapılmaz.
+Bir odanın süresi yeniden planlandığında eski heap kaydı silinmez, sadece
+geçersiz sayılır (lazy deletion).
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+ROOM_TTL = 3600          # Hareketsiz odanın yaşam süresi (sn)
+EMPTY_ROOM_TTL = 10      # Boşalan odanın silinmeden önce beklediği süre (sn)
+RESUME_TTL = 120         # Oyuncuları kopan oyunun yeniden bağlanmayı beklediği süre (sn)
+REAP_INTERVAL = 5        # Arka plan temizliğinin çalışma aralığı (sn)
+
+
+class RoomReaper:
+    """Oda son kullanma zamanlarını tutan heap (thread-safe)"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def schedule(self, room_id: str, deadline: float):
+        """Odanın son kullanma zamanını ayarla (öncekinin yerine geçer)"""
+        with self._lock:
+            self._deadlines[room_id] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._counter), room_id))
+
+            # Geçersiz kayıtlar birikirse heap'i yeniden kur
+            if len(self._heap) > 2 * len(self._deadlines) + 64:
+                self._heap = [(d, next(self._counter), r) for r, d in self._deadlines.items()]
+                heapq.heapify(self._heap)
+
+    def cancel(self, room_id: str):
+        """Odayı takipten çıkar"""
+        with self._lock:
+            self._deadlines.pop(room_id, None)
+
+    def deadline_of(self, room_id: str) -> Optional[float]:
+        """Odanın planlanmış son kullanma zamanı"""
+        return self._deadlines.get(room_id)
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Süresi dolan odaları döndür ve takipten çıkar"""
+        if now is None:
+            now = time.time()
+
+        due = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                deadline, _, room_id = heapq.heappop(heap)
+                # Yeniden planlanmış veya iptal edilmiş kayıtları atla
+                if self._deadlines.get(room_id) != deadline:
+                    continue
+                del self._deadlines[room_id]
+                due.append(room_id)
+        return due
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
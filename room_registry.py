@@ -0,0 +1,75 @@
+"""
+Oda kayıt defteri - çok işlemli (sharded) sunucuda oda ve bağlantı yerlerini paylaşmak için
+
+Odalar room_id'nin crc32 değerine göre shard'lara (işçi işlemlere) dağıtılır.
+Kayıt defteri hangi socket'in hangi odada olduğunu ve shard'ların yayınladığı
+oda özetlerini tutar. Ağ geçidi olayları kendi yerel eşlemesine göre odanın
+sahibi olan shard'a yönlendirir ve eşlemeyi buraya da yazar.
+
+Uygulama: ManagerRoomRegistry - multiprocessing.Manager ile işlemler arası
+paylaşılan. Başka bir depo (ör. Redis) RoomRegistry'den türetilir.
+"""
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+def shard_for(room_id: str, shard_count: int) -> int:
+    """Odanın sahibi olan shard (room_id'ye göre sabit)"""
+    return zlib.crc32(room_id.encode('utf-8')) % shard_count
+
+
+class RoomRegistry(ABC):
+    """Socket -> oda eşlemesi ve shard oda özetleri"""
+
+    @abstractmethod
+    def bind(self, sid: str, room_id: str):
+        """Socket'i odaya bağla"""
+        pass
+
+    @abstractmethod
+    def unbind(self, sid: str):
+        """Socket'in oda bağlantısını kaldır"""
+        pass
+
+    @abstractmethod
+    def room_of(self, sid: str) -> Optional[str]:
+        """Socket'in bağlı olduğu oda (yoksa None)"""
+        pass
+
+    @abstractmethod
+    def publish_rooms(self, shard_id: int, summary: dict):
+        """Shard'ın oda listesini ve istatistiklerini yayınla"""
+        pass
+
+    @abstractmethod
+    def shard_summaries(self) -> List[dict]:
+        """Tüm shard'ların son yayınladığı özetler"""
+        pass
+
+
+class ManagerRoomRegistry(RoomRegistry):
+    """multiprocessing.Manager sözlükleriyle işlemler arası kayıt defteri
+
+    Nesne pickle edilip shard işlemlerine aktarılabilir; tüm işlemler aynı
+    manager sürecindeki sözlükleri görür.
+    """
+
+    def __init__(self, manager):
+        self._rooms_by_sid = manager.dict()
+        self._summaries = manager.dict()
+
+    def bind(self, sid: str, room_id: str):
+        self._rooms_by_sid[sid] = room_id
+
+    def unbind(self, sid: str):
+        self._rooms_by_sid.pop(sid, None)
+
+    def room_of(self, sid: str) -> Optional[str]:
+        return self._rooms_by_sid.get(sid)
+
+    def publish_rooms(self, shard_id: int, summary: dict):
+        self._summaries[shard_id] = summary
+
+    def shard_summaries(self) -> List[dict]:
+        return list(self._summaries.values())
@@ -0,0 +1,382 @@
+"""
+Tavla kural çekirdeği - durumsuz (pure) fonksiyonlar
+
+Pozisyonlar değiştirilemez (immutable) `Position` nesneleridir; hiçbir
+fonksiyon girdisini değiştirmez. Bu sayede arama (AI) oyun ekranda
+gösterilirken veya birden fazla thread'den güvenle yapılabilir.
+
+Modül mypyc ile derlenebilir (bkz. setup_rules.py). Derlenmiş .so dosyası
+aynı klasörde varsa Python onu .py dosyasından önce yükler; yoksa bu saf
+Python sürümü kullanılır. API iki durumda da aynıdır.
+"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, NamedTuple, Optional, Tuple
+
+# Derlenmiş (mypyc) sürüm mü yüklendi?
+COMPILED = not __file__.endswith('.py')
+
+# Hane indeksleri (Board ile aynı düzen)
+BAR_WHITE = 24
+BAR_BLACK = 25
+HOME_WHITE = 26
+HOME_BLACK = 27
+FROM_BAR = -2
+BEAR_OFF = -1
+OVERSHOOT = -3  # Hedef tablosunda: zar tam çıkıştan büyük
+
+# Çekirdek içinde oyuncular Enum yerine tamsayı renk koduyla temsil edilir;
+# renk koduna göre aşağıdaki tablolar dallanmasız erişim sağlar
+COLOR_WHITE = 0
+COLOR_BLACK = 1
+
+SIGN: Tuple[int, ...] = (1, -1)                  # Pul işareti ve hareket yönü
+BAR_INDEX: Tuple[int, ...] = (BAR_WHITE, BAR_BLACK)
+HOME_INDEX: Tuple[int, ...] = (HOME_WHITE, HOME_BLACK)
+ENTRY_POINT: Tuple[Tuple[int, ...], ...] = (     # [renk][zar] -> giriş hanesi
+    (-1, 0, 1, 2, 3, 4, 5),
+    (-1, 23, 22, 21, 20, 19, 18),
+)
+HOME_SCAN: Tuple[Tuple[int, ...], ...] = (       # Ev bölgesi, en yüksek puldan başlayarak
+    (23, 22, 21, 20, 19, 18),
+    (0, 1, 2, 3, 4, 5),
+)
+IN_HOME: Tuple[Tuple[bool, ...], ...] = (
+    tuple(18 <= i <= 23 for i in range(24)),
+    tuple(0 <= i <= 5 for i in range(24)),
+)
+PROGRESS: Tuple[Tuple[float, ...], ...] = (      # Değerlendirmedeki ilerleme puanı
+    tuple(i * 0.5 for i in range(24)),
+    tuple((23 - i) * 0.5 for i in range(24)),
+)
+
+
+class Player(Enum):
+    WHITE = "beyaz"
+    BLACK = "siyah"
+
+
+@dataclass
+class Move:
+    """Bir hamleyi temsil eden sınıf"""
+    from_point: int  # -2: bar, -1: bear_off, 0-23: normal haneler
+    to_point: int    # -2: bar, -1: bear_off, 0-23: normal haneler
+    dice_value: int
+    
+    def __str__(self):
+        from_str = "Bar" if self.from_point == -2 else f"P{self.from_point + 1}"
+        to_str = "Home" if self.to_point == -1 else f"P{self.to_point + 1}"
+        return f"{from_str} -> {to_str} ({self.dice_value})"
+    
+    def __eq__(self, other):
+        """Hamleleri karşılaştır"""
+        if not isinstance(other, Move):
+            return False
+        return (self.from_point == other.from_point and 
+                self.to_point == other.to_point and 
+                self.dice_value == other.dice_value)
+
+
+class Position(NamedTuple):
+    """Değiştirilemez kompakt pozisyon
+
+    points: 28 elemanlı tuple; pozitif değer beyaz, negatif değer siyah pul sayısı
+    color: sırası gelen oyuncunun renk kodu (COLOR_WHITE / COLOR_BLACK)
+    """
+    points: Tuple[int, ...]
+    color: int
+
+
+PLAYERS: Tuple[Player, ...] = (Player.WHITE, Player.BLACK)
+
+
+def _build_destinations(color: int) -> Tuple[Tuple[int, ...], ...]:
+    """[kaynak][zar] -> hedef tablosu (kaynak 0-23 haneler, 24/25 bar)
+
+    Değerler: 0-23 hedef hane, BEAR_OFF tam çıkış, OVERSHOOT aşırı çıkış.
+    Zar indeksi 0 ve rakibin bar satırı kullanılmaz (OVERSHOOT).
+    """
+    rows = []
+    for source in range(26):
+        row = [OVERSHOOT]
+        for die in range(1, 7):
+            if source == BAR_INDEX[color]:
+                row.append(ENTRY_POINT[color][die])
+            elif source >= 24:
+                row.append(OVERSHOOT)
+            else:
+                target = source + die * SIGN[color]
+                if 0 <= target <= 23:
+                    row.append(target)
+                elif target == (24 if color == COLOR_WHITE else -1):
+                    row.append(BEAR_OFF)
+                else:
+                    row.append(OVERSHOOT)
+        rows.append(tuple(row))
+    return tuple(rows)
+
+
+# [renk][kaynak][zar] -> hedef; import sırasında bir kez hesaplanır
+DESTINATION: Tuple[Tuple[Tuple[int, ...], ...], ...] = (
+    _build_destinations(COLOR_WHITE),
+    _build_destinations(COLOR_BLACK),
+)
+
+
+def color_of(player: Player) -> int:
+    """Player enum'unu renk koduna çevir"""
+    return COLOR_WHITE if player is Player.WHITE else COLOR_BLACK
+
+
+def player_of(color: int) -> Player:
+    """Renk kodunu Player enum'una çevir"""
+    return PLAYERS[color]
+
+
+def initial_position(color: int = COLOR_WHITE) -> Position:
+    """Standart tavla başlangıç pozisyonu"""
+    points = [0] * 28
+    points[0] = 2     # Beyaz
+    points[11] = 5
+    points[16] = 3
+    points[18] = 5
+    points[23] = -2   # Siyah
+    points[12] = -5
+    points[7] = -3
+    points[5] = -5
+    return Position(tuple(points), color)
+
+
+def opponent_of(color: int) -> int:
+    """Rakibin renk kodu"""
+    return 1 - color
+
+
+def piece_count(position: Position, point_index: int, color: int) -> int:
+    """Belirtilen hanedeki oyuncu pullarının sayısı"""
+    value = position.points[point_index] * SIGN[color]
+    return value if value > 0 else 0
+
+
+def bar_count(position: Position, color: int) -> int:
+    """Bar'daki pul sayısı"""
+    return piece_count(position, BAR_INDEX[color], color)
+
+
+def home_count(position: Position, color: int) -> int:
+    """Toplanan pul sayısı"""
+    return piece_count(position, HOME_INDEX[color], color)
+
+
+def can_land(position: Position, point_index: int, color: int) -> bool:
+    """Oyuncu bu haneye inebilir mi? (boş, kendi pulu veya rakibin tek pulu)"""
+    if point_index < 0 or point_index > 23:
+        return False
+    return position.points[point_index] * SIGN[color] >= -1
+
+
+def can_bear_off(position: Position, color: int) -> bool:
+    """Pul toplayabilir mi?"""
+    points = position.points
+    sign = SIGN[color]
+    if points[BAR_INDEX[color]] * sign > 0:
+        return False
+
+    in_home = IN_HOME[color]
+    total_pieces = 0
+    for i in range(24):
+        count = points[i] * sign
+        if count > 0:
+            if not in_home[i]:
+                return False
+            total_pieces += count
+
+    total_pieces += points[HOME_INDEX[color]] * sign
+    return total_pieces == 15
+
+
+def highest_piece_in_home(position: Position, color: int) -> int:
+    """Ev bölgesindeki en yüksek pulun hanesi (yoksa -1)"""
+    points = position.points
+    sign = SIGN[color]
+    for i in HOME_SCAN[color]:
+        if points[i] * sign > 0:
+            return i
+    return -1
+
+
+def _unique_dice(dice: List[int]) -> List[int]:
+    return sorted(set(dice), reverse=True)
+
+
+def bar_entry_moves(position: Position, dice: List[int]) -> List[Move]:
+    """Bar'dan giriş hamleleri"""
+    color = position.color
+    points = position.points
+    sign = SIGN[color]
+    entry = DESTINATION[color][BAR_INDEX[color]]
+    moves: List[Move] = []
+    for dice_val in _unique_dice(dice):
+        entry_point = entry[dice_val]
+        if points[entry_point] * sign >= -1:
+            moves.append(Move(FROM_BAR, entry_point, dice_val))
+    return moves
+
+
+def moves_from_point(position: Position, dice: List[int], from_point: int) -> List[Move]:
+    """Belirli bir haneden geçerli hamleler"""
+    color = position.color
+    points = position.points
+    sign = SIGN[color]
+    moves: List[Move] = []
+    if from_point < 0 or from_point > 23 or points[from_point] * sign <= 0:
+        return moves
+
+    destinations = DESTINATION[color][from_point]
+    for dice_val in _unique_dice(dice):
+        to_point = destinations[dice_val]
+
+        if to_point >= 0:
+            if points[to_point] * sign >= -1:
+                moves.append(Move(from_point, to_point, dice_val))
+        elif can_bear_off(position, color):
+            # Tam çıkış
+            if to_point == BEAR_OFF:
+                moves.append(Move(from_point, BEAR_OFF, dice_val))
+            # Aşırı çıkış (en yüksek puldan)
+            elif from_point == highest_piece_in_home(position, color):
+                moves.append(Move(from_point, BEAR_OFF, dice_val))
+
+    return moves
+
+
+def legal_moves(position: Position, dice: List[int], from_point: Optional[int] = None) -> List[Move]:
+    """Sırası gelen oyuncunun kalan zarlarla yapabileceği hamleler"""
+    if not dice:
+        return []
+
+    color = position.color
+    sign = SIGN[color]
+    points = position.points
+
+    # Bar'da pul varsa sadece giriş hamleleri
+    if points[BAR_INDEX[color]] * sign > 0:
+        return bar_entry_moves(position, dice)
+
+    if from_point is not None:
+        return moves_from_point(position, dice, from_point)
+
+    moves: List[Move] = []
+    for point in range(24):
+        if points[point] * sign > 0:
+            moves.extend(moves_from_point(position, dice, point))
+    return moves
+
+
+def apply(position: Position, move: Move) -> Position:
+    """Hamleyi uygula ve yeni pozisyonu döndür (girdi değişmez)
+
+    Hamlenin geçerliliği legal_moves ile kontrol edilmelidir; kaynakta pul
+    yoksa veya hedef kapalıysa ValueError fırlatır.
+    """
+    color = position.color
+    sign = SIGN[color]
+    points = list(position.points)
+
+    source = BAR_INDEX[color] if move.from_point == FROM_BAR else move.from_point
+    if points[source] * sign <= 0:
+        raise ValueError(f"Kaynak hanede pul yok: {move}")
+    points[source] -= sign
+
+    if move.to_point == BEAR_OFF:
+        points[HOME_INDEX[color]] += sign
+    else:
+        target = points[move.to_point]
+        if target * sign < 0:
+            if target != -sign:
+                raise ValueError(f"Hedef hane kapalı: {move}")
+            # Rakip tek pulu vur
+            points[BAR_INDEX[1 - color]] -= sign
+            target = 0
+        points[move.to_point] = target + sign
+
+    return Position(tuple(points), color)
+
+
+def apply_play(position: Position, dice: List[int], play: List[Move]) -> Tuple[Position, List[int]]:
+    """Bir turun tüm hamlelerini bütün olarak doğrula ve uygula
+
+    Her hamle sırası geldiğinde legal_moves içinde olmalı ve dizi turu
+    bitirmelidir: zarlar tükenmeli veya kalan zarlarla oynanabilecek hamle
+    kalmamalıdır. Geçersizse ValueError fırlatır; girdiler değişmez.
+
+    Dönüş: (yeni pozisyon, kullanılmayan zarlar)
+    """
+    remaining = list(dice)
+    for move in play:
+        if move.dice_value not in remaining:
+            raise ValueError(f"Zar kullanılamaz: {move}")
+        if move not in legal_moves(position, remaining, move.from_point if move.from_point >= 0 else None):
+            raise ValueError(f"Geçersiz hamle: {move}")
+        position = apply(position, move)
+        remaining.remove(move.dice_value)
+
+    if remaining and winner(position) is None and legal_moves(position, remaining):
+        raise ValueError("Hamle dizisi turu bitirmiyor")
+    return position, remaining
+
+
+def winner(position: Position) -> Optional[int]:
+    """Kazananın renk kodu (oyun bitmediyse None)"""
+    if home_count(position, COLOR_WHITE) >= 15:
+        return COLOR_WHITE
+    if home_count(position, COLOR_BLACK) >= 15:
+        return COLOR_BLACK
+    return None
+
+
+def with_color(position: Position, color: int) -> Position:
+    """Aynı tahta, farklı oyuncu sırası"""
+    return Position(position.points, color)
+
+
+def evaluate(position: Position) -> float:
+    """Sezgisel pozisyon değerlendirmesi (sırası gelen oyuncu açısından)"""
+    points = position.points
+    color = position.color
+    opponent = 1 - color
+    sign = SIGN[color]
+    progress = PROGRESS[color]
+    score = 0.0
+
+    # Evdeki pul sayısı
+    score += home_count(position, color) * 10
+    score -= home_count(position, opponent) * 10
+
+    # Bar'daki pul sayısı (negatif)
+    score -= bar_count(position, color) * 20
+    score += bar_count(position, opponent) * 20
+
+    # Pul dağılımı ve güvenlik
+    for point in range(24):
+        count = points[point] * sign
+        if count > 0:
+            # Güvenli haneler (2+ pul)
+            if count >= 2:
+                score += 5
+            # Tek pul (risk)
+            else:
+                score -= 2
+
+            # İlerleme puanı
+            score += progress[point]
+        elif count == -1:  # Vurulabilir rakip pul
+            score += 3
+
+    # Pul toplama yeteneği
+    if can_bear_off(position, color):
+        score += 15
+    if can_bear_off(position, opponent):
+        score -= 15
+
+    return score
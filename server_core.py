@@ -0,0 +1,1440 @@
+"""
+Tavla Multiplayer Sunucu Çekirdeği - transport'tan bağımsız oda/oyun yönetimi
+
+Oda yönetimi ve Socket.IO event mantığı burada bulunur. Olayların nasıl
+gönderileceği Transport arayüzü ile soyutlanır; böylece aynı çekirdek hem
+Flask-SocketIO (threading) hem de asyncio (python-socketio AsyncServer)
+üzerinde çalışır. Oyunun kuralları da aynı şekilde game_backend.GameBackend
+ile soyutlanır (tam tavla veya basit mod).
+"""
+import functools
+import itertools
+import json
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from game_backend import GameBackend, default_backend
+from journal import (
+    Journal, JournalRecord, SNAPSHOT_INTERVAL, CHECKPOINT, CHECKPOINT_END, CHECKPOINT_ID, recover
+)
+from lobby import LobbyIndex, CachedJSON, LOBBY_PAGE_SIZE, parse_lobby_query
+from matchmaking import Matchmaker, DEFAULT_BUCKET
+from metrics import MetricsRegistry, render as render_metrics
+from rate_limit import RateLimiter, TURN_EVENTS
+from room_reaper import RoomReaper, ROOM_TTL, EMPTY_ROOM_TTL, RESUME_TTL, REAP_INTERVAL
+from room_registry import shard_for
+from state_delta import diff_state
+from wire_format import WIRE_JSON, WIRE_FORMATS, format_room, encode_payload
+from spectators import (
+    SPECTATOR_INTERVAL, SpectatorBroadcaster, TransportBroadcaster, DirtyRooms, spectator_room
+)
+
+# Sunucu tarafı AI rakipler (oyun mantığı gerektirir)
+try:
+    from ai_service import AIService, AI_LEVELS, AI_POLL_INTERVAL, greedy_turn
+    AI_AVAILABLE = True
+except ImportError:
+    AI_AVAILABLE = False
+
+HTTP_FORMAT = 'http'  # HTTP yoklaması için önbelleğe alınan JSON metni
+SLOW_CONSUMER_BACKLOG = 32  # Bekleyen mesajı bunu aşan socket'e durum çerçevesi gönderilmez
+CATCHUP_BACKLOG = 4         # Kuyruğu buna inince tek bir tam durum gönderilir
+CATCHUP_INTERVAL = 0.5      # Yavaş socket'lerin kontrol aralığı (sn)
+BYTE_SAMPLE_EVERY = 16  # JSON gönderimlerinin boyutu bu kadarda bir ölçülür (0: ölçülmez)
+DELTA_HISTORY = 64  # Yeniden bağlanan oyuncuya gönderilebilecek en fazla geçmiş fark
+
+
+class RoomState(Enum):
+    WAITING = "waiting"
+    PLAYING = "playing"
+    FINISHED = "finished"
+
+@dataclass
+class PlayerInfo:
+    id: str
+    username: str
+    socket_id: str
+    ready: bool = False
+    connected: bool = True
+    role: Optional[Any] = None  # Arka ucun rolü (Player.WHITE / 'beyaz' ...)
+    ai_level: Optional[str] = None  # Bot oyuncular için AI seviyesi
+
+@dataclass
+class GameRoom:
+    room_id: str
+    players: List[PlayerInfo]
+    game: Optional[object]  # Arka ucun oyun nesnesi (TavlaGame veya dict)
+    state: RoomState
+    created_at: float
+    spectators: Set[str]  # Sadece izleyici socket_id'leri
+    match_bucket: Hashable = DEFAULT_BUCKET  # Eşleştirme kovası (rating aralığı)
+    last_activity: float = 0.0  # Son oyun olayının zamanı (süre takibi için)
+    state_seq: int = 0  # Yayınlanan son durumun sıra numarası
+    last_state: Optional[dict] = None  # Yayınlanan son durum (farklar buna göre)
+    # Son yayınlanan farklar; yeniden bağlanan oyuncu kaçırdıklarını buradan alır
+    delta_history: Deque[dict] = field(default_factory=lambda: deque(maxlen=DELTA_HISTORY),
+                                       repr=False, compare=False)
+    # Biçim -> (state_seq, kodlanmış tam durum); her sürüm bir kez kodlanır
+    snapshot_cache: Dict[str, Tuple[int, Any]] = field(default_factory=dict, repr=False, compare=False)
+    # Oda başına kilit: aynı odanın olayları sırayla işlenir, farklı odalar
+    # birbirini beklemeden paralel çalışır
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    def add_player(self, player: PlayerInfo) -> bool:
+        """Oyuncu ekle"""
+        if len(self.players) >= 2:
+            return False
+        self.players.append(player)
+        return True
+
+    def remove_player(self, socket_id: str) -> bool:
+        """Oyuncu çıkar"""
+        for player in self.players:
+            if player.socket_id == socket_id:
+                self.players.remove(player)
+                return True
+        return False
+
+    def get_player_by_socket(self, socket_id: str) -> Optional[PlayerInfo]:
+        """Socket ID'ye göre oyuncu bul"""
+        for player in self.players:
+            if player.socket_id == socket_id:
+                return player
+        return None
+
+    def get_player_by_id(self, player_id: str) -> Optional[PlayerInfo]:
+        """Oturum kimliğine (PlayerInfo.id) göre oyuncu bul"""
+        for player in self.players:
+            if player.id == player_id:
+                return player
+        return None
+
+    def is_full(self) -> bool:
+        """Oda dolu mu?"""
+        return len(self.players) >= 2
+
+    def both_ready(self) -> bool:
+        """Her iki oyuncu da hazır mı?"""
+        return len(self.players) == 2 and all(p.ready for p in self.players)
+
+    def is_empty(self) -> bool:
+        """Odada bağlı (bot dışında) oyuncu veya izleyici kalmadı mı?"""
+        return all(p.ai_level or not p.connected for p in self.players) and len(self.spectators) == 0
+
+    def deltas_since(self, seq: Optional[int]) -> Optional[List[dict]]:
+        """seq'ten sonraki farklar; geçmişte yoksa None (tam durum gerekir)"""
+        if seq is None or seq > self.state_seq:
+            return None
+        if seq == self.state_seq:
+            return []
+        if not self.delta_history or self.delta_history[0]['seq'] > seq + 1:
+            return None
+        return [delta for delta in self.delta_history if delta['seq'] > seq]
+
+    def ai_player(self) -> Optional[PlayerInfo]:
+        """Odadaki bot oyuncu (yoksa None)"""
+        for player in self.players:
+            if player.ai_level:
+                return player
+        return None
+
+    def touch(self):
+        """Oda aktivitesini kaydet"""
+        self.last_activity = time.time()
+
+    def summary(self) -> dict:
+        """Lobi listesinde gösterilen özet"""
+        return {
+            'room_id': self.room_id,
+            'player_count': len(self.players),
+            'state': self.state.value,
+            'spectator_count': len(self.spectators),
+            'players': [p.username for p in self.players]
+        }
+
+
+class Transport(ABC):
+    """Socket.IO olaylarını gönderen katman (threading veya asyncio)"""
+
+    name = "transport"
+
+    @abstractmethod
+    def emit(self, event: str, data=None, to: Optional[str] = None,
+             skip_sid: Optional[str] = None):
+        """Olayı bir socket'e veya odaya gönder"""
+        pass
+
+    @abstractmethod
+    def enter_room(self, sid: str, room: str):
+        """Socket'i Socket.IO odasına ekle"""
+        pass
+
+    @abstractmethod
+    def leave_room(self, sid: str, room: str):
+        """Socket'i Socket.IO odasından çıkar"""
+        pass
+
+    @abstractmethod
+    def call_periodically(self, interval: float, callback: Callable[[], None]):
+        """Arka planda callback'i her interval saniyede bir çalıştır"""
+        pass
+
+    def backlog(self, sid: str) -> int:
+        """Socket'e henüz gönderilemeyen mesaj sayısı (bilinmiyorsa 0)"""
+        return 0
+
+
+def payload_size(data) -> int:
+    """Olay verisinin yaklaşık tel boyutu (bayt; JSON metni veya ikili ek)"""
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if isinstance(data, str):
+        return len(data) + 2
+    if isinstance(data, dict):
+        return 2 + sum(len(str(k)) + 4 + payload_size(v) for k, v in data.items())
+    if isinstance(data, (list, tuple)):
+        return 2 + sum(payload_size(v) + 1 for v in data)
+    return len(str(data))
+
+
+class MeteredTransport(Transport):
+    """Gönderilen mesaj ve bayt sayısını ölçen transport sarmalayıcısı
+
+    Odaya yapılan gönderim bir kez sayılır (alıcılara çoğaltılmadan önce).
+    İkili yüklerin boyutu doğrudan alınır; JSON yüklerini dolaşmak pahalı
+    olduğundan her byte_sample_every gönderimde bir ölçülüp o sayıyla
+    çarpılır (tahmin).
+    """
+
+    def __init__(self, transport: Transport, metrics: MetricsRegistry,
+                 byte_sample_every: int = BYTE_SAMPLE_EVERY):
+        self.inner = transport
+        self.name = transport.name
+        self.byte_sample_every = byte_sample_every
+        self._emits = itertools.count()
+        self.emitted_messages = metrics.counter(
+            'tavla_emitted_messages_total', 'Gönderilen olay sayısı', ('event',))
+        self.emitted_bytes = metrics.counter(
+            'tavla_emitted_bytes_total',
+            'Gönderilen olayların yaklaşık boyutu (bayt; JSON örneklemeyle tahmin)', ('event',))
+
+    def emit(self, event, data=None, to=None, skip_sid=None):
+        labels = (event,)
+        self.emitted_messages.inc(labels)
+        if isinstance(data, (bytes, bytearray)):
+            self.emitted_bytes.inc(labels, len(data))
+        elif self.byte_sample_every and next(self._emits) % self.byte_sample_every == 0:
+            self.emitted_bytes.inc(labels, payload_size(data) * self.byte_sample_every)
+        self.inner.emit(event, data, to=to, skip_sid=skip_sid)
+
+    def enter_room(self, sid, room):
+        self.inner.enter_room(sid, room)
+
+    def leave_room(self, sid, room):
+        self.inner.leave_room(sid, room)
+
+    def call_periodically(self, interval, callback):
+        self.inner.call_periodically(interval, callback)
+
+    def backlog(self, sid):
+        return self.inner.backlog(sid)
+
+
+def rate_limited(event: str):
+    """Bağlantı başına hız sınırı; sınırı aşan olay işlenmeden düşürülür
+
+    Sunucu (veya küme ağ geçidi) rate_limiter, throttled_events ve
+    transport özniteliklerini sağlar; rate_limiter None ise sınır yoktur.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, sid, *args, **kwargs):
+            if self.rate_limiter is not None:
+                allowed, first = self.rate_limiter.allow(sid, event)
+                if not allowed:
+                    self.throttled_events.inc((event,))
+                    # Sıra olayları her seferinde yanıtlanır (istemci yeniden dener);
+                    # diğerleri için seri boyunca tek bildirim, seli büyütmemek için
+                    if first or event in TURN_EVENTS:
+                        self.transport.emit('rate_limited', {
+                            'event': event,
+                            'message': 'Çok fazla istek, lütfen yavaşlayın!',
+                            'retry_after': round(self.rate_limiter.retry_after(sid, event), 3)
+                        }, to=sid)
+                    return None
+            return handler(self, sid, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timed(event: str):
+    """Olay işleyicisinin süresini tavla_event_duration_seconds'a kaydet"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return handler(self, *args, **kwargs)
+            finally:
+                self.event_duration.observe(time.perf_counter() - start, (event,))
+        return wrapper
+    return decorator
+
+
+class GameServer:
+    """Odaları ve oyun akışını yöneten sunucu çekirdeği"""
+
+    def __init__(self, transport: Transport,
+                 spectator_broadcaster: Optional[SpectatorBroadcaster] = None,
+                 shard_id: int = 0, shard_count: int = 1,
+                 journal_dir: Optional[str] = None,
+                 backend: Optional[GameBackend] = None):
+        self.metrics = MetricsRegistry()
+        # Oyun kuralları (verilmezse oyun mantığı yüklüyse tam tavla, değilse basit mod)
+        self.backend = backend or default_backend()
+        self.transport = MeteredTransport(transport, self.metrics)
+        self.shard_id = shard_id  # Küme modunda bu işlemin sahip olduğu shard
+        self.shard_count = shard_count
+        self.spectator_broadcaster = spectator_broadcaster or TransportBroadcaster(self.transport)
+        self.dirty_spectator_rooms = DirtyRooms()
+        self.game_rooms: Dict[str, GameRoom] = {}
+        self.player_to_room: Dict[str, str] = {}  # socket_id -> room_id
+        self.matchmaker = Matchmaker()
+        self.reaper = RoomReaper()
+        self.wire_formats: Dict[str, str] = {}  # socket_id -> tel biçimi (json varsayılan)
+        # Küme modunda hız sınırı ağ geçidinde uygulanır
+        self.rate_limiter = RateLimiter() if shard_count == 1 else None
+        self.lagging: Dict[str, str] = {}  # Durum çerçeveleri atlanan yavaş socket -> room_id
+        # Bot turları sunucu tarafı kurallar gerektirir
+        self.ai_service = AIService() if AI_AVAILABLE and self.backend.full_rules else None
+        self.lobby = LobbyIndex()  # Oda değiştikçe güncellenen oda listesi
+        self.stats_cache = CachedJSON(self.get_stats)
+        # Oda olaylarının disk kaydı (journal_dir verilmezse kapalı);
+        # start_background_tasks ile açılır, sunucuyu kurmak diske dokunmaz
+        self.journal_dir = journal_dir
+        self.journal: Optional[Journal] = None
+        self.start_time = time.time()
+        self._register_metrics()
+
+    def _register_metrics(self):
+        metrics = self.metrics
+        self.event_duration = metrics.histogram(
+            'tavla_event_duration_seconds', 'Socket.IO olay işleme süresi', ('event',))
+        # Küme modunda bağlantılar ağ geçidinde sayılır (shard her bağlantıyı görmez)
+        self.connections = metrics.gauge('tavla_connections', 'Açık Socket.IO bağlantıları') \
+            if self.shard_count == 1 else None
+        metrics.gauge('tavla_players', 'Odadaki oyuncular',
+                      fn=lambda: len(self.player_to_room))
+        metrics.gauge('tavla_rooms', 'Durumlarına göre odalar', ('state',),
+                      fn=self._room_state_counts)
+        if self.ai_service is not None:
+            metrics.gauge('tavla_ai_queue_depth', 'Hesaplanmayı bekleyen bot turları',
+                          fn=lambda: self.ai_service.queue_depth)
+        self.throttled_events = metrics.counter(
+            'tavla_throttled_events_total', 'Hız sınırı nedeniyle düşürülen olaylar', ('event',))
+        self.skipped_frames = metrics.counter(
+            'tavla_skipped_state_frames_total', 'Yavaş socket\'lere gönderilmeyen durum çerçeveleri')
+        metrics.gauge('tavla_lagging_sockets', 'Durum çerçeveleri birleştirilen yavaş socket\'ler',
+                      fn=lambda: len(self.lagging))
+
+    # --- Oda yönetimi ---
+
+    def create_room(self, bucket: Hashable = DEFAULT_BUCKET, room_id: Optional[str] = None) -> str:
+        """Yeni oda oluştur (room_id verilmezse bu shard'a düşen bir kimlik üretilir)"""
+        while room_id is None:
+            room_id = str(uuid.uuid4())[:8].upper()
+            if shard_for(room_id, self.shard_count) != self.shard_id:
+                room_id = None
+        now = time.time()
+        self.game_rooms[room_id] = GameRoom(
+            room_id=room_id,
+            players=[],
+            game=None,
+            state=RoomState.WAITING,
+            created_at=now,
+            spectators=set(),
+            match_bucket=bucket,
+            last_activity=now
+        )
+        self.reaper.schedule(room_id, now + ROOM_TTL)
+        self.update_lobby(self.game_rooms[room_id])
+        return room_id
+
+    def update_lobby(self, room: GameRoom):
+        """Odanın lobi özetini güncelle (oyuncu, durum veya izleyici değiştiğinde)"""
+        self.lobby.update(room.summary())
+
+    def find_available_room(self, bucket: Hashable = DEFAULT_BUCKET) -> Optional[str]:
+        """Eşleştirme kuyruğundan bekleyen bir oda al (O(1))"""
+        while True:
+            room_id = self.matchmaker.pop(bucket)
+            if room_id is None:
+                return None
+            # Kuyruktayken silinen odaları atla
+            if room_id in self.game_rooms:
+                return room_id
+
+    def remove_room(self, room_id: str):
+        """Odayı sil; eşleştirme kuyruğundan ve süre takibinden çıkar"""
+        self.matchmaker.discard(room_id)
+        self.reaper.cancel(room_id)
+        self.lobby.remove(room_id)
+        room = self.game_rooms.pop(room_id, None)
+        if room is None:
+            return
+
+        if room.state == RoomState.PLAYING:
+            self.record(room, 'close')  # Sonuçlanmadan kapanan oyun
+
+        for sid in [p.socket_id for p in room.players]:
+            if self.player_to_room.get(sid) == room_id:
+                del self.player_to_room[sid]
+                self.leave_game_room(sid, room_id)
+        for sid in list(room.spectators):
+            if self.player_to_room.get(sid) == room_id:
+                del self.player_to_room[sid]
+                self.leave_game_room(sid, room_id, spectator=True)
+        print(f"🗑️ Oda temizlendi: {room_id}")
+
+    def record(self, room: GameRoom, kind: str, data: Any = None):
+        """Oda olayını oyun kaydına ekle (disk erişimi arka planda)
+
+        Kayıtlar yayından hemen önce yazılır; kayda yazılan seq, olayın
+        ardından yayınlanacak durumun sıra numarasıdır. Kurtarmada oda bu
+        numaranın ötesinden devam eder.
+        """
+        if self.journal is not None:
+            self.journal.append(room.room_id, kind, data, room.state_seq + 1)
+
+    def _recorded_players(self, room: GameRoom) -> List[list]:
+        """Kayıtta tutulan oyuncu bilgisi: [id, kullanıcı adı, renk, AI seviyesi]"""
+        return [[p.id, p.username, self.backend.role_value(p.role), p.ai_level]
+                for p in room.players]
+
+    def checkpoint(self):
+        """Sürmekte olan oyunların anlık görüntüsünü kayda yaz (arka plan görevi)
+
+        Kurtarma son kontrol noktasından başlar; tekrar oynatılacak kayıt
+        SNAPSHOT_INTERVAL ile sınırlı kalır. Her oda kendi kilidi altında
+        yazılır, böylece snapshot odanın kayıt sırasındaki yerini korur.
+        """
+        self.journal.append(CHECKPOINT_ID, CHECKPOINT)
+        for room in list(self.game_rooms.values()):
+            with room.lock:
+                if room.state == RoomState.PLAYING and room.last_state is not None:
+                    self.record(room, 'snapshot', {
+                        'seq': room.state_seq,
+                        'players': self._recorded_players(room),
+                        'state': room.last_state
+                    })
+        self.journal.append(CHECKPOINT_ID, CHECKPOINT_END)
+
+    def restore_rooms(self):
+        """Yarım kalan oyunları kayıttan geri yükle (başlangıçta, bağlantılardan önce)
+
+        Oyuncular bağlı değil olarak gelir ve resume ile geri döner; kimse
+        dönmezse oda RESUME_TTL sonunda silinir.
+        """
+        started = time.time()
+        restored = 0
+        for room_id, records in recover(self.journal.directory).items():
+            try:
+                room = self._restore_room(room_id, records)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"⚠️ {room_id} odası kayıttan kurulamadı: {e}")
+                continue
+
+            with room.lock:
+                self.game_rooms[room_id] = room
+                self.publish_state(room)
+                room.delta_history.clear()  # Eski istemcilerin sıra numaraları geçersiz; tam durum alırlar
+                self.update_lobby(room)
+                self.reaper.schedule(room_id, room.last_activity + RESUME_TTL)
+
+                if self.backend.winner(room.game) is not None:
+                    self._finish_game(room)  # Sonuç kaydedilmeden kapanmıştı
+                else:
+                    self._resume_ai_turn(room)
+            restored += 1
+
+        if restored:
+            print(f"♻️ {restored} oyun kayıttan geri yüklendi ({time.time() - started:.2f} sn)")
+        # Sonraki kurtarma bu noktadan başlasın
+        self.checkpoint()
+
+    def _restore_room(self, room_id: str, records: List[JournalRecord]) -> GameRoom:
+        base = records[0]
+        players = [
+            PlayerInfo(
+                id=player_id,
+                username=username,
+                socket_id=f'ai:{room_id}' if ai_level else f'restored:{player_id}',
+                ready=True,
+                connected=bool(ai_level),
+                role=self.backend.role_from_value(color),
+                ai_level=ai_level
+            )
+            for player_id, username, color, ai_level in base.data['players']
+        ]
+
+        if base.kind == 'snapshot':
+            game = self.backend.deserialize(base.data['state'])
+            seq = base.data['seq']
+        else:
+            game = self.backend.new_game()
+            seq = 0
+        for record in records[1:]:
+            self.backend.replay(game, record.kind, record.data)
+            # Çökmeden önce istemcilere gönderilmiş en büyük sıra numarası
+            seq = max(seq, record.seq or 0)
+
+        room = GameRoom(room_id, players, game, RoomState.PLAYING, base.timestamp, set(),
+                        state_seq=seq)
+        room.touch()
+        return room
+
+    def get_room_for(self, sid: str) -> Optional[GameRoom]:
+        """Socket'in bulunduğu oda (yoksa None)"""
+        room_id = self.player_to_room.get(sid)
+        if room_id is None:
+            return None
+        return self.game_rooms.get(room_id)
+
+    def reap_rooms(self, now: Optional[float] = None):
+        """Süresi dolan odaları temizle (arka plan görevi çağırır)"""
+        if now is None:
+            now = time.time()
+
+        for room_id in self.reaper.pop_due(now):
+            room = self.game_rooms.get(room_id)
+            if room is None:
+                continue
+
+            with room.lock:
+                # Oyuncuları kopan oyun RESUME_TTL boyunca geri dönüşleri için bekler
+                ttl = RESUME_TTL if room.state == RoomState.PLAYING else 0
+                if room.is_empty() and now - room.last_activity >= ttl:
+                    self.remove_room(room_id)
+                elif now - room.last_activity >= ROOM_TTL:
+                    self.remove_room(room_id)
+                elif room.is_empty():
+                    self.reaper.schedule(room_id, room.last_activity + ttl)
+                else:
+                    # Oda hâlâ aktif; son aktiviteye göre yeniden planla
+                    self.reaper.schedule(room_id, room.last_activity + ROOM_TTL)
+
+    def start_background_tasks(self):
+        """Oda temizliği ve izleyici yayını gibi periyodik görevleri başlat
+
+        Kayıt açıksa önce kayıt açılır ve yarım kalan oyunlar geri yüklenir.
+        """
+        if self.journal_dir and self.journal is None:
+            self.journal = Journal(self.journal_dir, metrics=self.metrics)
+            self.restore_rooms()
+            self.transport.call_periodically(SNAPSHOT_INTERVAL, self.checkpoint)
+        self.transport.call_periodically(REAP_INTERVAL, self.reap_rooms)
+        self.transport.call_periodically(SPECTATOR_INTERVAL, self.flush_spectators)
+        self.transport.call_periodically(CATCHUP_INTERVAL, self.catch_up_lagging)
+        if self.ai_service is not None:
+            self.transport.call_periodically(AI_POLL_INTERVAL, self.poll_ai_moves)
+
+    # --- Durum yayını ---
+
+    def publish_state(self, room: GameRoom) -> dict:
+        """Oda durumunu kaydet; bir önceki yayına göre farkı döndür"""
+        state = self.backend.serialize(room.game)
+        delta = diff_state(room.last_state, state)
+        room.state_seq += 1
+        room.last_state = state
+        delta['seq'] = room.state_seq
+        room.delta_history.append(delta)
+
+        # İzleyiciler değişikliği bir sonraki birleşik çerçevede alır
+        if room.spectators:
+            self.dirty_spectator_rooms.mark(room.room_id)
+        return delta
+
+    def state_snapshot(self, room: GameRoom) -> dict:
+        """Odanın son yayınlanan tam durumu"""
+        return {'seq': room.state_seq, 'game_state': room.last_state}
+
+    def wire_format_of(self, sid: str) -> str:
+        """Socket'in seçtiği tel biçimi"""
+        return self.wire_formats.get(sid, WIRE_JSON)
+
+    def state_room(self, sid: str, room_id: str, spectator: bool = False) -> str:
+        """Socket'in durum yayınlarını aldığı kanal (oyuncu veya izleyici, biçime göre)"""
+        channel = spectator_room(room_id) if spectator else room_id
+        return format_room(channel, self.wire_format_of(sid))
+
+    def enter_game_room(self, sid: str, room_id: str, spectator: bool = False):
+        """Socket'i oda yayınına ve biçimine ait durum yayınına ekle"""
+        self.transport.enter_room(sid, room_id)
+        self.transport.enter_room(sid, self.state_room(sid, room_id, spectator))
+
+    def leave_game_room(self, sid: str, room_id: str, spectator: bool = False):
+        """Socket'i oda yayınlarından çıkar"""
+        self.transport.leave_room(sid, room_id)
+        self.transport.leave_room(sid, self.state_room(sid, room_id, spectator))
+
+    def encoded_snapshot(self, room: GameRoom, wire_format: str) -> Any:
+        """Tam durumu biçime göre kodlanmış olarak döndür (sürüm başına bir kez kodlanır)"""
+        cached = room.snapshot_cache.get(wire_format)
+        if cached is None or cached[0] != room.state_seq:
+            if wire_format == HTTP_FORMAT:
+                encoded = json.dumps({'room_id': room.room_id, **self.state_snapshot(room)})
+            else:
+                encoded = encode_payload(self.state_snapshot(room), wire_format, room.last_state)
+            cached = (room.state_seq, encoded)
+            room.snapshot_cache[wire_format] = cached
+        return cached[1]
+
+    def broadcast_state(self, room: GameRoom, event: str, data: dict, delta: Optional[dict] = None):
+        """Durum taşıyan olayı odada kullanılan her biçim için bir kez kodlayıp yayınla
+
+        delta verilmezse tam durum (önbellekten) gönderilir.
+        """
+        # Gönderim kuyruğu dolan socket'ler bu çerçeveyi atlar; kuyrukları
+        # boşalınca catch_up_lagging tek bir tam durum gönderir
+        skip = [p.socket_id for p in room.players
+                if not p.ai_level and p.connected and self._is_lagging(p.socket_id, room.room_id)]
+        if skip:
+            self.skipped_frames.inc(amount=len(skip))
+
+        # İzleyiciler bu yayına katılmaz; onlara flush_spectators gönderir
+        for wire_format in {self.wire_format_of(p.socket_id) for p in room.players}:
+            if delta is None:
+                payload = self.encoded_snapshot(room, wire_format)
+            else:
+                payload = encode_payload({'state_delta': delta}, wire_format, room.last_state)
+            self.transport.emit(event, {**data, **payload},
+                                to=format_room(room.room_id, wire_format), skip_sid=skip or None)
+
+    def _is_lagging(self, sid: str, room_id: str) -> bool:
+        if sid in self.lagging:
+            return True
+        if self.transport.backlog(sid) > SLOW_CONSUMER_BACKLOG:
+            self.lagging[sid] = room_id
+            return True
+        return False
+
+    def catch_up_lagging(self):
+        """Kuyruğu boşalan yavaş socket'lere atlanan çerçeveler yerine tam durumu gönder"""
+        for sid, room_id in list(self.lagging.items()):
+            if self.transport.backlog(sid) > CATCHUP_BACKLOG:
+                continue
+            self.lagging.pop(sid, None)
+
+            room = self.game_rooms.get(room_id)
+            if room is None or self.player_to_room.get(sid) != room_id:
+                continue
+            with room.lock:
+                self.send_state(sid, room, 'state_snapshot', {'room_id': room_id})
+
+    def flush_spectators(self):
+        """Son çerçeveden beri değişen odaların durumunu izleyicilere gönder"""
+        for room_id in self.dirty_spectator_rooms.drain():
+            room = self.game_rooms.get(room_id)
+            if room is None:
+                continue
+
+            with room.lock:
+                frames = {
+                    wire_format: {'room_id': room_id, **self.encoded_snapshot(room, wire_format)}
+                    for wire_format in {self.wire_format_of(sid) for sid in room.spectators}
+                }
+            if frames:
+                self.spectator_broadcaster.publish(room_id, frames)
+
+    def send_state(self, sid: str, room: GameRoom, event: str, data: dict):
+        """Tam durumu tek bir socket'e kendi biçiminde gönder"""
+        payload = self.encoded_snapshot(room, self.wire_format_of(sid))
+        self.transport.emit(event, {**data, **payload}, to=sid)
+
+    # --- HTTP verileri ---
+
+    def get_stats(self) -> dict:
+        """Sunucu istatistikleri"""
+        return {
+            'players': len(self.player_to_room),
+            'rooms': len(self.game_rooms),
+            'uptime': time.time() - self.start_time,
+            'game_logic_available': self.backend.full_rules,
+            'game_backend': self.backend.name,
+            'backend': self.transport.name,
+            'ai': self.ai_service.get_stats() if self.ai_service else None,
+            'timestamp': time.time()
+        }
+
+    def _room_state_counts(self) -> dict:
+        return {(state.value,): self.lobby.count(state.value) for state in RoomState}
+
+    def get_metrics(self) -> str:
+        """Prometheus metin biçiminde metrikler (/metrics)"""
+        return render_metrics([self.metrics.snapshot()])
+
+    def get_stats_json(self) -> Tuple[str, str]:
+        """/stats yanıtı (JSON metni, ETag); STATS_TTL boyunca önbellekten"""
+        return self.stats_cache.get()
+
+    def get_rooms_info(self) -> dict:
+        """Oda listesi (lobi dizininden, tarama yapmadan)"""
+        rooms_data = self.lobby.rooms()
+        return {'rooms': rooms_data, 'total': len(rooms_data)}
+
+    def get_lobby_page(self, state: Optional[str] = None, offset: int = 0,
+                       limit: int = LOBBY_PAGE_SIZE) -> Tuple[str, str]:
+        """/rooms sayfası (JSON metni, ETag)"""
+        return self.lobby.page_json(state, offset, limit)
+
+    def get_room_state(self, room_id: str) -> Optional[str]:
+        """Odanın son durumu (JSON metni; yoklama yapan istemciler için önbellekten)"""
+        room = self.game_rooms.get(room_id)
+        if room is None:
+            return None
+
+        with room.lock:
+            return self.encoded_snapshot(room, HTTP_FORMAT)
+
+    # --- Socket.IO olayları ---
+
+    def on_connect(self, sid: str):
+        print(f"🔗 Yeni bağlantı: {sid}")
+        if self.connections is not None:
+            self.connections.inc()
+        self.transport.emit('connected', {
+            'message': 'Tavla Multiplayer Sunucusuna bağlandınız!',
+            'server_info': {
+                'game_logic': self.backend.full_rules,
+                'game_backend': self.backend.name,
+                'backend': self.transport.name,
+                'version': '2.0',
+                'wire_formats': list(WIRE_FORMATS)
+            }
+        }, to=sid)
+
+    def on_disconnect(self, sid: str):
+        print(f"🔌 Bağlantı koptu: {sid}")
+        if self.connections is not None:
+            self.connections.dec()
+
+        # Oyuncuyu odasından çıkar
+        if sid in self.player_to_room:
+            room_id = self.player_to_room[sid]
+            if room_id in self.game_rooms:
+                room = self.game_rooms[room_id]
+
+                with room.lock:
+                    # Oyuncu mu yoksa izleyici mi?
+                    player = room.get_player_by_socket(sid)
+                    if player:
+                        player.connected = False
+                        print(f"👋 {player.username} {room_id} odasından ayrıldı")
+
+                        # Oyun devam ediyorsa diğer oyuncuya bildir; oyuncu
+                        # RESUME_TTL içinde resume ile yerine dönebilir
+                        if room.state == RoomState.PLAYING:
+                            room.touch()
+                            self.transport.emit('opponent_disconnected',
+                                 {'message': f'{player.username} bağlantısını kaybetti',
+                                  'username': player.username,
+                                  'resume_timeout': RESUME_TTL},
+                                 to=room_id)
+                        else:
+                            room.remove_player(sid)
+                            # Boşalan yer tekrar eşleştirmeye açılır
+                            if room.players and room.ai_player() is None:
+                                self.matchmaker.add(room_id, room.match_bucket)
+                            else:
+                                self.matchmaker.discard(room_id)
+
+                            # Odadaki diğer oyunculara bildir
+                            self.transport.emit('player_left', {
+                                'username': player.username,
+                                'remaining_players': len(room.players)
+                            }, to=room_id)
+                    else:
+                        # İzleyici çıkarma
+                        room.spectators.discard(sid)
+
+                    self.leave_game_room(sid, room_id, spectator=player is None)
+                    self.update_lobby(room)
+
+                    # Boşalan oda kısa bir süre sonra arka planda silinir; oyun
+                    # sürüyorsa oyuncuların geri dönmesi beklenir
+                    if room.is_empty():
+                        ttl = RESUME_TTL if room.state == RoomState.PLAYING else EMPTY_ROOM_TTL
+                        self.reaper.schedule(room_id, time.time() + ttl)
+
+            self.player_to_room.pop(sid, None)
+
+        self.wire_formats.pop(sid, None)
+        self.lagging.pop(sid, None)
+        if self.rate_limiter is not None:
+            self.rate_limiter.remove(sid)
+
+    @rate_limited('find_game')
+    @timed('find_game')
+    def on_find_game(self, sid: str, data: dict, preferred_room: Optional[str] = None):
+        """Oyun ara
+
+        preferred_room: küme ağ geçidinin eşleştirmede seçtiği oda (yoksa bu
+        kimlikle oluşturulur). İstemciden gelen veriyle belirlenemez.
+        """
+        username = data.get('username', f'Player_{sid[:6]}')
+
+        # Önce mevcut odayı kontrol et
+        if sid in self.player_to_room:
+            self.transport.emit('error', {'message': 'Zaten bir oyundasınız!'}, to=sid)
+            return
+
+        print(f"🔍 {username} oyun arıyor...")
+
+        player = PlayerInfo(
+            id=str(uuid.uuid4()),
+            username=username,
+            socket_id=sid
+        )
+
+        # AI rakip istendiyse eşleştirme yerine bot ile özel oda
+        if data.get('ai_level') is not None:
+            self._create_ai_room(sid, player, data['ai_level'], preferred_room)
+            return
+
+        bucket = self.matchmaker.bucket_for(data.get('rating'))
+
+        # Kuyruktan bekleyen oda al; oda bu arada dolduysa tekrar dene
+        while True:
+            if preferred_room is not None:
+                room_id, preferred_room = preferred_room, None
+                if room_id not in self.game_rooms:
+                    self.create_room(bucket, room_id)
+                    print(f"🏠 Yeni oda oluşturuldu: {room_id}")
+            else:
+                room_id = self.find_available_room(bucket)
+                if not room_id:
+                    room_id = self.create_room(bucket)
+                    print(f"🏠 Yeni oda oluşturuldu: {room_id}")
+
+            room = self.game_rooms.get(room_id)
+            if room is None:
+                continue
+
+            with room.lock:
+                if room.state != RoomState.WAITING or not room.add_player(player):
+                    continue
+
+                # Hâlâ yer varsa oda kuyrukta beklemeye devam eder
+                if not room.is_full():
+                    self.matchmaker.add(room_id, bucket)
+                room.touch()
+                self.update_lobby(room)
+
+                self.enter_game_room(sid, room_id)
+                self.player_to_room[sid] = room_id
+
+                self.transport.emit('joined_room', {
+                    'room_id': room_id,
+                    'player_id': player.id,
+                    'player_count': len(room.players),
+                    'players': [{'username': p.username, 'ready': p.ready} for p in room.players]
+                }, to=sid)
+
+                # Odadaki diğer oyunculara bildir
+                self.transport.emit('player_joined', {
+                    'username': username,
+                    'player_count': len(room.players)
+                }, to=room_id, skip_sid=sid)
+
+                print(f"👤 {username} {room_id} odasına katıldı ({len(room.players)}/2)")
+                return
+
+    def reject_join(self, sid: str, event: str, message: str):
+        """Odası olmayan socket'in katılma isteği reddedildi
+
+        Hata olayı isteği adlandırır; küme ağ geçidi buna bakarak socket'in
+        katılmadan önce yaptığı oda bağını geri alır.
+        """
+        self.transport.emit('error', {'message': message, 'event': event}, to=sid)
+
+    def _create_ai_room(self, sid: str, player: PlayerInfo, ai_level: str,
+                        room_id: Optional[str] = None):
+        """İnsan oyuncu ve bottan oluşan oda (eşleştirme kuyruğuna girmez)"""
+        if self.ai_service is None or ai_level not in AI_LEVELS:
+            self.reject_join(sid, 'find_game', 'Geçersiz AI seviyesi!')
+            return
+
+        room_id = self.create_room(room_id=room_id)
+        room = self.game_rooms[room_id]
+        bot = PlayerInfo(
+            id=str(uuid.uuid4()),
+            username=f'AI ({ai_level})',
+            socket_id=f'ai:{room_id}',
+            ready=True,
+            ai_level=ai_level
+        )
+
+        with room.lock:
+            room.add_player(player)
+            room.add_player(bot)
+            room.touch()
+            self.update_lobby(room)
+
+            self.enter_game_room(sid, room_id)
+            self.player_to_room[sid] = room_id
+
+            self.transport.emit('joined_room', {
+                'room_id': room_id,
+                'player_id': player.id,
+                'player_count': len(room.players),
+                'players': [{'username': p.username, 'ready': p.ready} for p in room.players]
+            }, to=sid)
+
+        print(f"🤖 {player.username} {room_id} odasında {ai_level} AI ile oynuyor")
+
+    @rate_limited('ready')
+    @timed('ready')
+    def on_ready(self, sid: str):
+        """Oyuncu hazır"""
+        room = self.get_room_for(sid)
+        if room is None:
+            self.transport.emit('error', {'message': 'Önce bir odaya katılın!'}, to=sid)
+            return
+
+        with room.lock:
+            room.touch()
+            self._ready(room, sid)
+
+    def _ready(self, room: GameRoom, sid: str):
+        room_id = room.room_id
+        player = room.get_player_by_socket(sid)
+
+        if player:
+            player.ready = True
+            print(f"✅ {player.username} hazır!")
+
+            self.transport.emit('player_ready', {
+                'username': player.username,
+                'players': [{'username': p.username, 'ready': p.ready} for p in room.players]
+            }, to=room_id)
+
+            # Her iki oyuncu da hazırsa oyunu başlat
+            if room.both_ready() and room.state == RoomState.WAITING:
+                self.start_game(room)
+
+    def start_game(self, room: GameRoom):
+        """Oyunu başlat"""
+        room.game = self.backend.new_game()
+        room.state = RoomState.PLAYING
+        self.update_lobby(room)
+
+        # Oyuncu rollerini ata (rastgele); ilk oyuncu beyaz, ikinci siyah
+        random.shuffle(room.players)
+        for player, role in zip(room.players, self.backend.roles()):
+            player.role = role
+
+        game_data = {
+            'game_started': True,
+            'players': [
+                {'username': p.username, 'color': self.backend.role_value(p.role)}
+                for p in room.players
+            ]
+        }
+
+        self.record(room, 'start', {'players': self._recorded_players(room)})
+
+        # Başlangıçta tam durum gönderilir; sonraki olaylar sadece fark taşır
+        self.publish_state(room)
+        self.broadcast_state(room, 'game_started', game_data)
+        print(f"🎮 Oyun başladı: {room.room_id}")
+
+        # Bot beyaz düştüyse ilk turu o oynar
+        self._schedule_ai_turn(room)
+
+    def _finish_game(self, room: GameRoom):
+        """Oyunu bitir ve kazananı duyur"""
+        room.state = RoomState.FINISHED
+        self.update_lobby(room)
+        winner = self.backend.winner(room.game)
+        self.record(room, 'end', {'winner': self.backend.role_value(winner)})
+        winner_name = next(p.username for p in room.players if p.role == winner)
+        self.transport.emit('game_over', {
+            'winner': winner_name,
+            'winner_color': self.backend.role_value(winner)
+        }, to=room.room_id)
+        print(f"🏆 Oyun bitti: {winner_name} kazandı!")
+
+    def _advance_turn(self, room: GameRoom, force: bool = False) -> dict:
+        """Oynanacak hamle kalmadıysa sırayı karşı tarafa geçir
+
+        Tur yönetimi sunucudadır: zar veya hamle olayı turu bitirdiyse sıra
+        aynı olayda geçer (istemci ayrıca tur bitirmez). Hiç oynanamayan
+        zarlar pas sayılır.
+
+        Dönüş: olay verisine eklenecek sıra bilgisi (next_player tur
+        sürüyorsa None)
+        """
+        passed = self.backend.end_turn(room.game, force)
+        if passed is None:
+            return {'next_player': None, 'passed': False}
+
+        self.record(room, 'turn', {'passed': passed})
+        current = self.backend.current_role(room.game)
+        next_player = next(p for p in room.players if p.role == current)
+        return {'next_player': next_player.username, 'passed': passed}
+
+    # --- Bot turları ---
+
+    def _schedule_ai_turn(self, room: GameRoom):
+        """Sıra bottaysa zarı at ve hamleleri işlem havuzunda hesaplat"""
+        bot = room.ai_player()
+        if (bot is None or room.state != RoomState.PLAYING
+                or self.backend.current_role(room.game) != bot.role):
+            return
+
+        dice = self.backend.roll_dice(room.game, bot.role)
+        self.record(room, 'dice', list(dice))
+        turn = self._advance_turn(room)
+        self.broadcast_state(room, 'dice_rolled', {
+            'player': bot.username,
+            'dice': dice,
+            **turn
+        }, self.publish_state(room))
+
+        if turn['next_player'] is not None:
+            return  # Zarlar oynanamadı, sıra insanda
+
+        self.ai_service.submit(room.room_id, bot.ai_level, room.game.get_position(),
+                               room.game.moves_left, room.state_seq)
+
+    def _resume_ai_turn(self, room: GameRoom):
+        """Geri yüklenen odada sıra bottaysa turu kaldığı yerden sürdür"""
+        bot = room.ai_player()
+        if (bot is None or self.ai_service is None
+                or self.backend.current_role(room.game) != bot.role):
+            return
+        if self.backend.awaiting_dice(room.game):
+            self._schedule_ai_turn(room)
+        else:
+            self.ai_service.submit(room.room_id, bot.ai_level, room.game.get_position(),
+                                   room.game.moves_left, room.state_seq)
+
+    def poll_ai_moves(self):
+        """Hesaplanan bot turlarını oyna (arka plan görevi çağırır)"""
+        for job in self.ai_service.poll():
+            room = self.game_rooms.get(job.room_id)
+            if room is None:
+                continue
+
+            with room.lock:
+                # Bu arada oda değiştiyse sonuç eskidir
+                if room.state_seq != job.state_seq or room.state != RoomState.PLAYING:
+                    continue
+                self._play_ai_moves(room, job.moves)
+
+    def _play_ai_moves(self, room: GameRoom, moves: List[Any]):
+        bot = room.ai_player()
+        room.touch()
+
+        # Bot turu tek hamle dizisi olarak uygulanır; sonuç geçersizse
+        # kalan tur açgözlü AI ile oynanır
+        if not self._apply_play(room, moves):
+            moves = greedy_turn(room.game.get_position(), room.game.moves_left)
+            if not self._apply_play(room, moves):
+                # Yine de hamle kaldıysa tur zorla geçirilir
+                turn = self._advance_turn(room, force=True)
+                self.broadcast_state(room, 'turn_changed', turn, self.publish_state(room))
+                return
+
+        self._play_made(room, bot, moves)
+
+    def _apply_play(self, room: GameRoom, moves: List[Any]) -> bool:
+        """Turun hamle dizisini bütün olarak doğrula ve uygula (geçersizse oyun değişmez)"""
+        return self.backend.apply_play(room.game, moves)
+
+    def _move_made(self, room: GameRoom, player: PlayerInfo, move: Any) -> bool:
+        """Yapılan hamleyi (ve bitirdiyse tur geçişini) tek olayla yayınla
+
+        Dönüş: tur veya oyun bittiyse True
+        """
+        print(f"♟️ {player.username} hamle yaptı: {move}")
+        self.record(room, 'move', self.backend.record_move(move))
+        return self._publish_moves(room, 'move_made', {
+            'player': player.username,
+            'move': self.backend.serialize_move(move)
+        })
+
+    def _play_made(self, room: GameRoom, player: PlayerInfo, moves: List[Any]) -> bool:
+        """Bütün olarak uygulanan turu tek olayla yayınla (ara durumlar gönderilmez)"""
+        print(f"♟️ {player.username} turunu oynadı: {', '.join(str(m) for m in moves)}")
+        self.record(room, 'play', [self.backend.record_move(m) for m in moves])
+        return self._publish_moves(room, 'play_made', {
+            'player': player.username,
+            'moves': [self.backend.serialize_move(move) for move in moves]
+        })
+
+    def _publish_moves(self, room: GameRoom, event: str, data: dict) -> bool:
+        game_over = self.backend.is_over(room.game)
+        turn = self._advance_turn(room)
+        self.broadcast_state(room, event, {
+            **data,
+            'game_over': game_over,
+            **turn
+        }, self.publish_state(room))
+
+        if game_over:
+            self._finish_game(room)
+            return True
+        if turn['next_player'] is not None:
+            self._schedule_ai_turn(room)
+            return True
+        return False
+
+    @rate_limited('roll_dice')
+    @timed('roll_dice')
+    def on_roll_dice(self, sid: str):
+        """Zar at"""
+        room = self.get_room_for(sid)
+        if room is None:
+            self.transport.emit('error', {'message': 'Oyunda değilsiniz!'}, to=sid)
+            return
+
+        with room.lock:
+            room.touch()
+            self._roll_dice(room, sid)
+
+    def _roll_dice(self, room: GameRoom, sid: str):
+        if not room.game or room.state != RoomState.PLAYING:
+            self.transport.emit('error', {'message': 'Oyun başlamamış!'}, to=sid)
+            return
+
+        player = room.get_player_by_socket(sid)
+        if not player:
+            self.transport.emit('error', {'message': 'Oyuncu bulunamadı!'}, to=sid)
+            return
+
+        # Sıra kontrolü ve zar (arka uç reddederse mesajı istemciye gider)
+        try:
+            dice_result = self.backend.roll_dice(room.game, player.role)
+        except ValueError as e:
+            self.transport.emit('error', {'message': str(e)}, to=sid)
+            return
+
+        self.record(room, 'dice', list(dice_result))
+        # Oynanabilecek hamle yoksa sıra aynı olayda geçer
+        turn = self._advance_turn(room)
+
+        # Tüm oyunculara gönder
+        self.broadcast_state(room, 'dice_rolled', {
+            'player': player.username,
+            'dice': dice_result,
+            **turn
+        }, self.publish_state(room))
+
+        print(f"🎲 {player.username} zar attı: {dice_result}")
+
+        if turn['passed']:
+            print(f"⏭️ {player.username} oynayamadı, sıra {turn['next_player']}'da")
+            self._schedule_ai_turn(room)
+
+    @rate_limited('make_move')
+    @timed('make_move')
+    def on_make_move(self, sid: str, data: dict):
+        """Hamle yap"""
+        room = self.get_room_for(sid)
+        if room is None:
+            self.transport.emit('error', {'message': 'Oyunda değilsiniz!'}, to=sid)
+            return
+
+        with room.lock:
+            room.touch()
+            self._make_move(room, sid, data)
+
+    def _make_move(self, room: GameRoom, sid: str, data: dict):
+        if not room.game or room.state != RoomState.PLAYING:
+            self.transport.emit('error', {'message': 'Oyun başlamamış!'}, to=sid)
+            return
+
+        player = room.get_player_by_socket(sid)
+        if not player:
+            self.transport.emit('error', {'message': 'Oyuncu bulunamadı!'}, to=sid)
+            return
+
+        # Sıra kontrolü
+        try:
+            self.backend.check_turn(room.game, player.role)
+        except ValueError as e:
+            self.transport.emit('error', {'message': str(e)}, to=sid)
+            return
+
+        # Hamleyi parse et
+        try:
+            move = self.backend.parse_move(data)
+        except (KeyError, TypeError, ValueError):
+            self.transport.emit('error', {'message': 'Geçersiz hamle formatı!'}, to=sid)
+            return
+
+        try:
+            # Hamleyi yap; tur bittiyse sıra aynı olayda geçer
+            if self.backend.make_move(room.game, move):
+                self._move_made(room, player, move)
+            else:
+                self.transport.emit('error', {'message': 'Geçersiz hamle!'}, to=sid)
+        except Exception as e:
+            self.transport.emit('error', {'message': f'Hamle hatası: {str(e)}'}, to=sid)
+
+    @rate_limited('submit_play')
+    @timed('submit_play')
+    def on_submit_play(self, sid: str, data: dict):
+        """Turun tüm hamlelerini tek mesajda oyna
+
+        data['moves'] turun hamle dizisidir; dizi bütün olarak doğrulanır
+        (arka ucun apply_play'i), geçerliyse tek seferde uygulanıp tek güncelleme
+        olarak yayınlanır. Geçersizse hiçbir hamle uygulanmaz.
+        """
+        room = self.get_room_for(sid)
+        if room is None:
+            self.transport.emit('error', {'message': 'Oyunda değilsiniz!'}, to=sid)
+            return
+
+        with room.lock:
+            room.touch()
+            self._submit_play(room, sid, data)
+
+    def _submit_play(self, room: GameRoom, sid: str, data: dict):
+        if not room.game or room.state != RoomState.PLAYING:
+            self.transport.emit('error', {'message': 'Oyun başlamamış!'}, to=sid)
+            return
+
+        player = room.get_player_by_socket(sid)
+        if not player:
+            self.transport.emit('error', {'message': 'Oyuncu bulunamadı!'}, to=sid)
+            return
+
+        try:
+            self.backend.check_turn(room.game, player.role)
+        except ValueError as e:
+            self.transport.emit('error', {'message': str(e)}, to=sid)
+            return
+
+        try:
+            moves = [self.backend.parse_move(m) for m in data['moves']]
+        except (KeyError, TypeError, ValueError):
+            self.transport.emit('error', {'message': 'Geçersiz hamle formatı!'}, to=sid)
+            return
+
+        if not self._apply_play(room, moves):
+            self.transport.emit('error', {'message': 'Geçersiz hamle dizisi!'}, to=sid)
+            return
+
+        self._play_made(room, player, moves)
+
+    @rate_limited('spectate')
+    @timed('spectate')
+    def on_spectate(self, sid: str, data: dict):
+        """Oyunu izle"""
+        room_id = data.get('room_id')
+
+        if sid in self.player_to_room:
+            self.transport.emit('error', {'message': 'Zaten bir oyundasınız!'}, to=sid)
+            return
+        if room_id not in self.game_rooms:
+            self.reject_join(sid, 'spectate', 'Oda bulunamadı!')
+            return
+
+        room = self.game_rooms[room_id]
+        with room.lock:
+            room.touch()
+            self.enter_game_room(sid, room_id, spectator=True)
+            room.spectators.add(sid)
+            self.update_lobby(room)
+            self.player_to_room[sid] = room_id
+
+            self.send_state(sid, room, 'spectating', {
+                'room_id': room_id,
+                'players': [{'username': p.username} for p in room.players]
+            })
+
+        print(f"👁️ İzleyici {room_id} odasına katıldı")
+
+    @rate_limited('resync')
+    @timed('resync')
+    def on_resync(self, sid: str):
+        """Tam durumu tekrar gönder (istemci sıra numarası atladığında)"""
+        room = self.get_room_for(sid)
+        if room is None:
+            self.transport.emit('error', {'message': 'Oyunda değilsiniz!'}, to=sid)
+            return
+
+        with room.lock:
+            self.send_state(sid, room, 'state_snapshot', {
+                'room_id': room.room_id
+            })
+
+    @rate_limited('resume')
+    @timed('resume')
+    def on_resume(self, sid: str, data: dict):
+        """Kopan oturuma dön (data: player_id, room_id, last_seq)
+
+        player_id, joined_room ile verilen oturum anahtarıdır. Oyuncu yeni
+        socket'e bağlanır ve last_seq'ten sonra kaçırdığı farkları alır;
+        farklar geçmişten düştüyse tam durum gönderilir.
+        """
+        room_id = data.get('room_id')
+        player_id = data.get('player_id')
+        last_seq = data.get('last_seq')
+        if not isinstance(last_seq, int):
+            last_seq = None
+
+        room = self.game_rooms.get(room_id) if isinstance(room_id, str) else None
+        if room is None or not player_id or sid in self.player_to_room:
+            self.transport.emit('resume_failed', {'message': 'Oturum bulunamadı!'}, to=sid)
+            return
+
+        with room.lock:
+            player = room.get_player_by_id(player_id)
+            if player is None or player.ai_level or room.state == RoomState.WAITING:
+                self.transport.emit('resume_failed', {'message': 'Oturum bulunamadı!'}, to=sid)
+                return
+
+            # Eski socket henüz kopmadıysa (ağ değişimi) oturumu ondan devral
+            old_sid = player.socket_id
+            if self.player_to_room.pop(old_sid, None) is not None:
+                self.leave_game_room(old_sid, room.room_id)
+
+            player.socket_id = sid
+            player.connected = True
+            room.touch()
+            self.enter_game_room(sid, room.room_id)
+            self.player_to_room[sid] = room.room_id
+            self.update_lobby(room)
+
+            resumed = {
+                'room_id': room.room_id,
+                'player_id': player.id,
+                'room_state': room.state.value,
+                'players': [
+                    {'username': p.username, 'color': getattr(p.role, 'value', p.role)}
+                    for p in room.players
+                ]
+            }
+            deltas = room.deltas_since(last_seq)
+            if deltas is None:
+                self.send_state(sid, room, 'resumed', resumed)
+            else:
+                # Farklar JSON olarak gider; istemci sırayla uygular
+                self.transport.emit('resumed', {**resumed, 'seq': room.state_seq,
+                                                'state_deltas': deltas}, to=sid)
+
+            self.transport.emit('opponent_reconnected', {
+                'username': player.username
+            }, to=room.room_id, skip_sid=sid)
+
+        print(f"🔁 {player.username} {room.room_id} odasına geri döndü")
+
+    @rate_limited('set_wire_format')
+    @timed('set_wire_format')
+    def on_set_wire_format(self, sid: str, data: dict):
+        """Tel biçimini seç ('json' veya 'binary')"""
+        wire_format = data.get('format', WIRE_JSON)
+        if wire_format not in WIRE_FORMATS:
+            self.transport.emit('error', {'message': 'Desteklenmeyen tel biçimi!'}, to=sid)
+            return
+
+        room = self.get_room_for(sid)
+        if room is None:
+            self.wire_formats[sid] = wire_format
+        else:
+            # Odadaysa durum yayınını yeni biçime taşı
+            with room.lock:
+                spectator = sid in room.spectators
+                self.transport.leave_room(sid, self.state_room(sid, room.room_id, spectator))
+                self.wire_formats[sid] = wire_format
+                self.transport.enter_room(sid, self.state_room(sid, room.room_id, spectator))
+
+        self.transport.emit('wire_format_set', {'format': wire_format}, to=sid)
+
+    @rate_limited('get_rooms')
+    @timed('get_rooms')
+    def on_get_rooms(self, sid: str, data: Optional[dict] = None):
+        """Mevcut odaları listele (sayfalı; data: state, offset, limit)"""
+        state, offset, limit = parse_lobby_query(data or {})
+        self.transport.emit('rooms_list', self.lobby.page(state, offset, limit), to=sid)
+
+
+def render_index_page(server: GameServer, backend_label: str) -> str:
+    """Sunucu ana sayfası (HTML)"""
+    stats = server.get_stats()
+    player_count = stats['players']
+    room_count = stats['rooms']
+
+    return f"""
+    <html>
+    <head>
+        <title>Tavla Multiplayer Sunucu</title>
+        <meta charset="UTF-8">
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 40px; background: #f0f0f0; }}
+            .container {{ max-width: 800px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; }}
+            .status {{ background: #e8f5e8; padding: 15px; border-radius: 5px; margin: 20px 0; }}
+            .command {{ background: #f5f5f5; padding: 10px; border-radius: 3px; font-family: monospace; }}
+            h1 {{ color: #2c3e50; }}
+            .stats {{ background: #f8f9fa; padding: 10px; border-left: 4px solid #007bff; }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>🎲 Tavla Multiplayer Sunucu</h1>
+
+            <div class="status">
+                <h3>✅ Sunucu Aktif</h3>
+                <div class="stats">
+                    <p><strong>Bağlı Oyuncu:</strong> {player_count}</p>
+                    <p><strong>Aktif Oda:</strong> {room_count}</p>
+                    <p><strong>Backend:</strong> {backend_label}</p>
+                    <p><strong>Oyun Mantığı:</strong> {'✅ Tam' if server.backend.full_rules else '⚠️ Basit'}</p>
+                    <p><strong>Sunucu Zamanı:</strong> {time.strftime('%H:%M:%S')}</p>
+                </div>
+            </div>
+
+            <h3>🚀 Client Bağlantısı</h3>
+            <div class="command">python multiplayer_client.py</div>
+
+            <h3>📊 API Endpoints</h3>
+            <ul>
+                <li><a href="/stats">İstatistikler</a> - JSON formatında</li>
+                <li><a href="/rooms">Aktif Odalar</a> - Oda listesi</li>
+            </ul>
+
+            <div id="live-stats">
+                <h3>🔴 Canlı İstatistikler</h3>
+                <div id="stats-content">Yükleniyor...</div>
+            </div>
+        </div>
+
+        <script>
+            function updateStats() {{
+                fetch('/stats')
+                    .then(r => r.json())
+                    .then(data => {{
+                        document.getElementById('stats-content').innerHTML =
+                            `<p>Oyuncu: ${{data.players}} | Oda: ${{data.rooms}} | Uptime: ${{Math.floor(data.uptime/60)}}dk</p>`;
+                    }})
+                    .catch(e => {{
+                        document.getElementById('stats-content').innerHTML = '<p style="color:red;">Bağlantı hatası</p>';
+                    }});
+            }}
+
+            updateStats();
+            setInterval(updateStats, 5000);
+        </script>
+    </body>
+    </html>
+    """
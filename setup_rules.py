@@ -0,0 +1,22 @@
+"""
+Kural çekirdeğini (rules.py) mypyc ile derler
+
+Kullanım:
+    pip install mypy
+    python setup_rules.py build_ext --inplace
+
+Derleme sonrası oluşan .so dosyası rules.py'nin yanına yerleşir ve import
+sırasında otomatik olarak tercih edilir. Silindiğinde saf Python sürümüne
+geri dönülür; çağrı yerlerinde değişiklik gerekmez.
+"""
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    raise SystemExit("mypyc bulunamadı. Lütfen şu komutu çalıştırın: pip install mypy")
+
+setup(
+    name='tavla-rules',
+    ext_modules=mypycify(['rules.py'], opt_level='3'),
+)
@@ -0,0 +1,65 @@
+"""
+İzleyici yayını - oyuncuların hamlelerini izleyici sayısından bağımsız tutmak için
+
+İzleyiciler oyuncuların durum yayınına katılmaz. Her durum değişikliğinde oda
+sadece "kirli" olarak işaretlenir; arka plan görevi en fazla
+SPECTATOR_INTERVAL saniyede bir, kirli odaların son durumunu izleyici
+kanalına tek bir çerçeve olarak gönderir. Arada oluşan hamleler tek
+çerçevede birleşir.
+
+Çerçevelerin nasıl iletileceği SpectatorBroadcaster ile değiştirilebilir;
+varsayılan olarak sunucunun kendi transport'u kullanılır. Çok izleyicili
+kurulumlarda çerçeveler ayrı bir yayın işlemine (ör. Socket.IO mesaj kuyruğu
+ile emit eden bir süreç) devredilebilir.
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Set
+
+from wire_format import format_room
+
+SPECTATOR_INTERVAL = 0.25  # İzleyici çerçeveleri arası en kısa süre (sn)
+
+
+def spectator_room(room_id: str) -> str:
+    """Odanın izleyici kanalı"""
+    return f"{room_id}:spec"
+
+
+class SpectatorBroadcaster(ABC):
+    """İzleyici çerçevelerini ileten katman"""
+
+    @abstractmethod
+    def publish(self, room_id: str, frames: Dict[str, dict]):
+        """Odanın çerçevelerini gönder (tel biçimi -> olay verisi)"""
+        pass
+
+
+class TransportBroadcaster(SpectatorBroadcaster):
+    """Çerçeveleri sunucunun kendi transport'u ile gönderir"""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def publish(self, room_id: str, frames: Dict[str, dict]):
+        for wire_format, frame in frames.items():
+            self.transport.emit('state_snapshot', frame,
+                                to=format_room(spectator_room(room_id), wire_format))
+
+
+class DirtyRooms:
+    """Son çerçeveden beri durumu değişen odalar (thread-safe)"""
+
+    def __init__(self):
+        self._rooms: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def mark(self, room_id: str):
+        with self._lock:
+            self._rooms.add(room_id)
+
+    def drain(self) -> Set[str]:
+        """Kirli odaları al ve listeyi sıfırla"""
+        with self._lock:
+            rooms, self._rooms = self._rooms, set()
+        return rooms
@@ -0,0 +1,48 @@
+"""
+Oyun durumu farkları - her olayda tüm tahtayı göndermek yerine sadece değişenleri yaymak için
+
+Sunucu her zar/hamle olayında GameBackend.serialize çıktısını bir önceki
+yayınla karşılaştırır ve sadece değişen noktaları ve alanları gönderir.
+Farklar sıra numarasıyla (seq) birlikte yayınlanır; istemci bir numara
+atlandığını görürse tam durumu (snapshot) yeniden ister.
+
+Fark biçimi:
+    {
+        'seq': 12,
+        'points': [[nokta_index, count, owner], ...],   # sadece değişen noktalar
+        'fields': {'dice_values': [3, 5], ...}          # sadece değişen alanlar
+    }
+"""
+from typing import Optional
+
+BOARD_KEY = 'board'
+
+
+def diff_state(old: Optional[dict], new: dict) -> dict:
+    """İki serialize edilmiş durum arasındaki farkı hesapla"""
+    if old is None:
+        # Önceki durum yoksa fark tam durumdur
+        old = {BOARD_KEY: [None] * len(new[BOARD_KEY])}
+
+    points = [
+        [i, point['count'], point['owner']]
+        for i, (old_point, point) in enumerate(zip(old[BOARD_KEY], new[BOARD_KEY]))
+        if old_point != point
+    ]
+    fields = {
+        key: value for key, value in new.items()
+        if key != BOARD_KEY and (key not in old or old[key] != value)
+    }
+    return {'points': points, 'fields': fields}
+
+
+def apply_delta(state: dict, delta: dict) -> dict:
+    """Farkı duruma uygula (yeni durum döner, eskisi değişmez)"""
+    board = list(state[BOARD_KEY])
+    for index, count, owner in delta['points']:
+        board[index] = {'count': count, 'owner': owner}
+
+    new_state = dict(state)
+    new_state.update(delta['fields'])
+    new_state[BOARD_KEY] = board
+    return new_state
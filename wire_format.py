@@ -0,0 +1,134 @@
+"""
+İkili (binary) tel biçimi - oyun durumunu JSON yerine sıkıştırılmış baytlarla göndermek için
+
+GameBackend.serialize çıktısı 28 nokta için {'count', 'owner'} sözlükleri
+taşır. İkili biçimde tahta 28 işaretli bayttır (+ beyaz, - siyah), kalan
+alanlar sabit bir başlığa paketlenir. Baytlar Socket.IO ikili eki olarak
+gönderilir; istemci biçimi bağlantıda 'set_wire_format' ile seçer.
+
+Durum:  board (28b) + başlık + moves_left (n bayt)
+Fark:   seq (I) + nokta sayısı (B) + (index B, count b) * n + başlık + moves_left
+Başlık: current_player, game_state, winner, zar sayısı, zar1, zar2, move_count (I), hamle sayısı
+"""
+import struct
+from typing import List, Optional
+
+WIRE_JSON = 'json'
+WIRE_BINARY = 'binary'
+WIRE_FORMATS = (WIRE_JSON, WIRE_BINARY)
+
+OWNERS = ('beyaz', 'siyah')
+GAME_STATES = ('waiting_dice', 'selecting_piece', 'selecting_target', 'game_over')
+NO_WINNER = 255
+
+BOARD = struct.Struct('<28b')
+HEADER = struct.Struct('<BBBBBBIB')
+SEQ = struct.Struct('<IB')
+POINT = struct.Struct('<Bb')
+
+
+def format_room(room_id: str, wire_format: str) -> str:
+    """Belirli biçimi kullanan oda üyelerinin socket odası"""
+    return f"{room_id}:{wire_format}"
+
+
+def _signed_count(count: int, owner: Optional[str]) -> int:
+    return -count if owner == OWNERS[1] else count
+
+
+def _point(signed: int) -> List:
+    if signed > 0:
+        return [signed, OWNERS[0]]
+    if signed < 0:
+        return [-signed, OWNERS[1]]
+    return [0, None]
+
+
+def _pack_fields(state: dict) -> bytes:
+    dice = state['dice_values']
+    moves = state['moves_left']
+    winner = state['winner']
+    header = HEADER.pack(
+        OWNERS.index(state['current_player']),
+        GAME_STATES.index(state['game_state']),
+        NO_WINNER if winner is None else OWNERS.index(winner),
+        len(dice),
+        dice[0] if len(dice) > 0 else 0,
+        dice[1] if len(dice) > 1 else 0,
+        state['move_count'],
+        len(moves)
+    )
+    return header + bytes(moves)
+
+
+def _unpack_fields(data: bytes, offset: int) -> dict:
+    player, game_state, winner, dice_count, die1, die2, move_count, move_total = HEADER.unpack_from(data, offset)
+    offset += HEADER.size
+    return {
+        'current_player': OWNERS[player],
+        'game_state': GAME_STATES[game_state],
+        'dice_values': [die1, die2][:dice_count],
+        'moves_left': list(data[offset:offset + move_total]),
+        'move_count': move_count,
+        'winner': None if winner == NO_WINNER else OWNERS[winner]
+    }
+
+
+def encode_state(state: dict) -> bytes:
+    """GameBackend.serialize çıktısını baytlara çevir"""
+    board = BOARD.pack(*[_signed_count(p['count'], p['owner']) for p in state['board']])
+    return board + _pack_fields(state)
+
+
+def decode_state(data: bytes) -> dict:
+    """encode_state çıktısını GameBackend.serialize biçimine geri çevir"""
+    state = _unpack_fields(data, BOARD.size)
+    state['board'] = [
+        {'count': count, 'owner': owner}
+        for count, owner in map(_point, BOARD.unpack_from(data, 0))
+    ]
+    return state
+
+
+def encode_delta(delta: dict, state: dict) -> bytes:
+    """state_delta'yı baytlara çevir (alanlar her zaman tam gönderilir)"""
+    points = delta['points']
+    parts = [SEQ.pack(delta['seq'], len(points))]
+    for index, count, owner in points:
+        parts.append(POINT.pack(index, _signed_count(count, owner)))
+    parts.append(_pack_fields(state))
+    return b''.join(parts)
+
+
+def decode_delta(data: bytes) -> dict:
+    """encode_delta çıktısını state_delta biçimine geri çevir"""
+    seq, point_total = SEQ.unpack_from(data, 0)
+    offset = SEQ.size
+    points = []
+    for _ in range(point_total):
+        index, signed = POINT.unpack_from(data, offset)
+        offset += POINT.size
+        points.append([index] + _point(signed))
+    return {'seq': seq, 'points': points, 'fields': _unpack_fields(data, offset)}
+
+
+def encode_payload(state_fields: dict, wire_format: str, state: Optional[dict]) -> dict:
+    """Olaydaki durum alanlarını ('game_state' veya 'state_delta') biçime göre kodla"""
+    if wire_format != WIRE_BINARY:
+        return state_fields
+
+    encoded = dict(state_fields)
+    if encoded.get('game_state') is not None:
+        encoded['game_state'] = encode_state(encoded['game_state'])
+    if 'state_delta' in encoded:
+        encoded['state_delta'] = encode_delta(encoded['state_delta'], state)
+    return encoded
+
+
+def decode_payload(data: dict) -> dict:
+    """encode_payload ile kodlanmış olay verisini JSON biçimine çevir"""
+    if isinstance(data.get('game_state'), bytes):
+        data = dict(data, game_state=decode_state(data['game_state']))
+    if isinstance(data.get('state_delta'), bytes):
+        data = dict(data, state_delta=decode_delta(data['state_delta']))
+    return data